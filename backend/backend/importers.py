@@ -0,0 +1,116 @@
+# backend/importers.py
+"""
+Importaciones masivas: lectura de archivos CSV o JSON Lines fila a fila, sin
+cargarlos en memoria, y la base común de los importadores por lotes.
+"""
+import codecs
+import csv
+import io
+import json
+
+
+def iter_csv_rows(binary_file):
+    """Lee un CSV fila a fila sin cargar el archivo completo en memoria. Produce (línea, fila)."""
+    text = io.TextIOWrapper(binary_file, encoding='utf-8-sig', newline='')
+    try:
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+    finally:
+        text.detach()  # No cerrar el archivo subyacente (lo gestiona Django)
+
+
+def iter_jsonl_rows(binary_file):
+    """Lee un archivo JSON Lines (un objeto por línea). Produce (línea, objeto)."""
+    decoder = codecs.getreader('utf-8-sig')(binary_file)
+    for number, line in enumerate(decoder, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError as e:
+            yield number, ValueError(f"JSON inválido: {e}")
+
+
+def iter_rows(binary_file, file_format):
+    if file_format == 'jsonl':
+        return iter_jsonl_rows(binary_file)
+    if file_format == 'csv':
+        return iter_csv_rows(binary_file)
+    raise ValueError("Formato no soportado. Use 'csv' o 'jsonl'.")
+
+
+def guess_format(filename):
+    return 'jsonl' if filename.lower().endswith(('.jsonl', '.ndjson')) else 'csv'
+
+
+class BatchImporter:
+    """
+    Base de los importadores por lotes (store.importers.ProductImporter,
+    users.importers.UserImporter): valida cada fila con `row_serializer_class`,
+    acumula los objetos en un lote y lo escribe con `_flush()` cada `chunk_size` filas.
+    Los errores se reportan por número de línea, hasta `max_errors`.
+
+    Las subclases implementan `_build(line, data)`, que devuelve (clave, objeto) o None
+    tras registrar el error, y `_flush(chunk)`, que recibe {clave: objeto}, escribe el
+    lote, suma a `self.imported` y lo vacía. Una clave repetida en el lote reemplaza a la anterior.
+    """
+    row_serializer_class = None
+
+    def __init__(self, chunk_size, max_errors):
+        self.chunk_size = chunk_size
+        self.max_errors = max_errors
+        self.processed = 0
+        self.imported = 0
+        self.error_count = 0
+        self.errors = []
+
+    def _add_error(self, line, errors):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'row': line, 'errors': errors})
+
+    def _validate(self, line, row):
+        if isinstance(row, Exception):
+            self._add_error(line, {'non_field_errors': [str(row)]})
+            return None
+        if not isinstance(row, dict):
+            self._add_error(line, {'non_field_errors': ["Se esperaba un objeto."]})
+            return None
+        serializer = self.row_serializer_class(data=row)
+        if not serializer.is_valid():
+            self._add_error(line, serializer.errors)
+            return None
+        return serializer.validated_data
+
+    def _build(self, line, data):
+        raise NotImplementedError
+
+    def _flush(self, chunk):
+        raise NotImplementedError
+
+    def run(self, rows):
+        """`rows` es un iterable de (número de línea, fila), p. ej. el de iter_rows()."""
+        chunk = {}
+        for line, row in rows:
+            self.processed += 1
+            data = self._validate(line, row)
+            built = self._build(line, data) if data is not None else None
+            if built is not None:
+                key, obj = built
+                chunk[key] = obj
+            if len(chunk) >= self.chunk_size:
+                self._flush(chunk)
+        if chunk:
+            self._flush(chunk)
+        return self.report()
+
+    def report(self):
+        return {
+            'processed': self.processed,
+            'imported': self.imported,
+            'failed': self.error_count,
+            'errors': self.errors,
+            'errors_truncated': self.error_count > len(self.errors),
+        }
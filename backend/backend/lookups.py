@@ -0,0 +1,113 @@
+# backend/lookups.py
+"""
+Caché en proceso para tablas de referencia pequeñas (estados, tipos, roles...).
+
+Cada proceso guarda la tabla completa en memoria, indexada por id y por nombre,
+y la carga en el primer uso. Un contador de versión en la caché compartida
+(Redis en producción) se incrementa en cada save/delete, así que el resto de
+workers recargan la tabla como mucho LOOKUP_CACHE_CHECK_INTERVAL segundos
+después. Los cambios hechos con QuerySet.update() no disparan señales: después
+de uno hay que llamar a `Modelo.lookups.invalidate()`.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+
+from backend.versioning import bump_version, get_version
+
+_tables = {}
+_lock = threading.Lock()
+
+
+class _Table:
+    __slots__ = ('version', 'checked_at', 'by_id', 'by_name')
+
+    def __init__(self, version, rows):
+        self.version = version
+        self.checked_at = time.monotonic()
+        self.by_id = {row.pk: row for row in rows}
+        self.by_name = {}
+        for row in rows:
+            self.by_name.setdefault(row.name, row)
+
+
+class LookupManager(models.Manager):
+    """
+    Se declara junto a `objects` en modelos con campo `name`:
+
+        objects = models.Manager()
+        lookups = LookupManager()
+
+    y se consulta con `Modelo.lookups.by_name('Pending')` o `.by_id(pk)`, que lanzan
+    Modelo.DoesNotExist igual que .get(). Las instancias son compartidas entre
+    peticiones: se pueden asignar a una FK, pero no se deben modificar.
+    """
+
+    def contribute_to_class(self, cls, name):
+        super().contribute_to_class(cls, name)
+        if not cls._meta.abstract:
+            uid = f'lookups:{cls._meta.label}'
+            post_save.connect(self._changed, sender=cls, weak=False, dispatch_uid=uid)
+            post_delete.connect(self._changed, sender=cls, weak=False, dispatch_uid=uid)
+
+    @property
+    def _version_key(self):
+        return f'lookups:{self.model._meta.label_lower}:version'
+
+    def _shared_version(self):
+        return get_version(self._version_key)
+
+    def _changed(self, sender, **kwargs):
+        self.invalidate()
+        # Los demás workers se enteran al confirmar la transacción, no antes
+        transaction.on_commit(self._bump_version)
+
+    def _bump_version(self):
+        bump_version(self._version_key)
+
+    def invalidate(self):
+        _tables.pop(self.model._meta.label, None)
+
+    def _table(self):
+        label = self.model._meta.label
+        table = _tables.get(label)
+        if table is not None and time.monotonic() - table.checked_at < settings.LOOKUP_CACHE_CHECK_INTERVAL:
+            return table
+
+        version = self._shared_version()
+        if table is not None and table.version == version:
+            table.checked_at = time.monotonic()
+            return table
+
+        with _lock:
+            # Otro hilo pudo haberla recargado mientras esperábamos
+            current = _tables.get(label)
+            if current is not None and current.version == version and current is not table:
+                return current
+            table = _Table(version, list(self.get_queryset()))
+            _tables[label] = table
+        return table
+
+    def by_id(self, pk):
+        try:
+            pk = self.model._meta.pk.to_python(pk)
+        except ValidationError:
+            raise self.model.DoesNotExist(f'{self.model.__name__} con id {pk!r} no existe.')
+        try:
+            return self._table().by_id[pk]
+        except KeyError:
+            raise self.model.DoesNotExist(f'{self.model.__name__} con id {pk!r} no existe.')
+
+    def by_name(self, name):
+        try:
+            return self._table().by_name[name]
+        except KeyError:
+            raise self.model.DoesNotExist(f'{self.model.__name__} {name!r} no existe.')
+
+    def id_map(self):
+        """{pk: instancia} de toda la tabla (no modificar)."""
+        return self._table().by_id
@@ -0,0 +1,150 @@
+# backend/pagination.py
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor (keyset) sobre una tupla de columnas, p. ej. (created_at, id).
+
+    A diferencia de OFFSET, cada página filtra con `WHERE (a, b) > (x, y)` sobre un
+    índice compuesto, así que la página 1000 cuesta lo mismo que la primera.
+    El cursor es opaco (base64) y solo permite avanzar ('next').
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Cursor inválido.'
+    # Campos de orden; prefijo '-' para descendente. El último debe ser único (p. ej. 'id').
+    ordering = ('-created_at', '-id')
+
+    def get_ordering(self, request, queryset, view):
+        # Una vista puede sobreescribir el orden (p. ej. por relevancia en búsquedas)
+        return getattr(view, 'keyset_ordering', None) or self.ordering
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                size = int(request.query_params[self.page_size_query_param])
+                if size > 0:
+                    return min(size, self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering_fields = tuple(self.get_ordering(request, queryset, view))
+        self.base_url = request.build_absolute_uri()
+
+        queryset = queryset.order_by(*self.ordering_fields)
+        position = self.decode_cursor(request, queryset)
+        if position is not None:
+            queryset = queryset.filter(self._keyset_filter(position))
+
+        # Pedimos una fila extra para saber si existe una página siguiente
+        results = list(queryset[:self.page_size + 1])
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def _keyset_filter(self, position):
+        # (a, b, c) > (x, y, z)  ==  a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+        condition = Q()
+        for index, field in enumerate(self.ordering_fields):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            clause = Q(**{f'{name}__{lookup}': position[index]})
+            for previous_field, previous_value in zip(self.ordering_fields[:index], position):
+                clause &= Q(**{previous_field.lstrip('-'): previous_value})
+            condition |= clause
+        return condition
+
+    def _field_values(self, instance):
+        # Las filas de .values() (p. ej. agregados) son diccionarios
+        if isinstance(instance, dict):
+            return [instance[field.lstrip('-')] for field in self.ordering_fields]
+        return [getattr(instance, field.lstrip('-')) for field in self.ordering_fields]
+
+    def encode_cursor(self, values):
+        # isoformat() conserva los microsegundos (DjangoJSONEncoder los trunca a ms)
+        payload = json.dumps(values, default=self._json_default, separators=(',', ':'))
+        cursor = base64.urlsafe_b64encode(payload.encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    @staticmethod
+    def _json_default(value):
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+        return str(value)  # UUID, Decimal
+
+    def decode_cursor(self, request, queryset):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('ascii'))
+            if not isinstance(values, list) or len(values) != len(self.ordering_fields):
+                raise ValueError
+            return [
+                self._to_python(queryset.model, field.lstrip('-'), value)
+                for field, value in zip(self.ordering_fields, values)
+            ]
+        except (TypeError, ValueError, UnicodeError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def _to_python(model, name, value):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Anotaciones (p. ej. un ranking de búsqueda) viajan tal cual
+            return value
+        return field.to_python(value)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self._field_values(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'schema': {'type': 'integer'},
+            },
+        ]
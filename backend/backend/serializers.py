@@ -0,0 +1,126 @@
+# backend/serializers.py
+from rest_framework import serializers
+
+
+def _split(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def requested_expand(request):
+    """Lista de ?expand= de la petición, o None si no se envió (se usa default_expand)."""
+    if request is None or 'expand' not in request.query_params:
+        return None
+    return _split(request.query_params['expand'])
+
+
+def _group_expand(expand):
+    # ['pet', 'pet.pet_type', 'status'] -> {'pet': ['pet_type'], 'status': []}
+    groups = {}
+    for path in expand:
+        name, _, rest = path.partition('.')
+        groups.setdefault(name, [])
+        if rest:
+            groups[name].append(rest)
+    return groups
+
+
+class DynamicFieldsMixin:
+    """
+    Sparse fieldsets y anidado opcional para ModelSerializers.
+
+    - `?fields=id,start_date` devuelve solo esos campos (los write_only siempre se conservan).
+    - `?expand=pet,status` anida las relaciones de `expandable_fields`; las que no se
+      expanden salen como id. Con puntos se expande más profundo: `?expand=pet.pet_type`.
+
+    Sin ?expand= se usa `default_expand`. Solo el serializer raíz lee la query (y
+    responde 400 si nombra campos o relaciones que no existen); los anidados reciben
+    `expand=` del padre. Las vistas pueden usar
+    `select_related_for()` para unir solo las tablas que se van a expandir.
+    """
+    # {'nombre': (SerializerAnidado, {kwargs extra, p. ej. 'source'})}
+    expandable_fields = {}
+    default_expand = ()
+
+    def __init__(self, *args, **kwargs):
+        self._requested_fields = kwargs.pop('fields', None)
+        self._requested_expand = kwargs.pop('expand', None)
+        super().__init__(*args, **kwargs)
+
+    def _is_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def _dynamic_params(self):
+        fields, expand = self._requested_fields, self._requested_expand
+        request = self.context.get('request')
+        if request is not None and self._is_root():
+            if fields is None and 'fields' in request.query_params:
+                fields = _split(request.query_params['fields'])
+            if expand is None:
+                expand = requested_expand(request)
+        return fields, self.default_expand if expand is None else expand
+
+    @classmethod
+    def unknown_expand(cls, expand):
+        """Rutas de `expand` que no corresponden a ninguna relación expandible."""
+        unknown = []
+        for name, nested in _group_expand(expand).items():
+            serializer_class = cls.expandable_fields.get(name, (None,))[0]
+            if serializer_class is None:
+                unknown.append(name)
+            elif nested and not issubclass(serializer_class, DynamicFieldsMixin):
+                unknown += [f'{name}.{path}' for path in nested]
+            elif nested:
+                unknown += [f'{name}.{path}' for path in serializer_class.unknown_expand(nested)]
+        return unknown
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested_fields, expand = self._dynamic_params()
+        groups = _group_expand(expand)
+
+        if self._is_root():
+            errors = {}
+            unknown = [name for name in requested_fields or () if name not in fields]
+            if unknown:
+                errors['fields'] = [f"Campos desconocidos: {', '.join(unknown)}."]
+            unknown = self.unknown_expand(expand)
+            if unknown:
+                errors['expand'] = [f"Relaciones desconocidas: {', '.join(unknown)}."]
+            if errors:
+                raise serializers.ValidationError(errors)
+
+        for name, (serializer_class, options) in self.expandable_fields.items():
+            if name not in fields:
+                continue
+            if name in groups:
+                if issubclass(serializer_class, DynamicFieldsMixin):
+                    options = {**options, 'expand': groups[name] or None}
+                fields[name] = serializer_class(read_only=True, **options)
+            else:
+                # Sin expandir: solo el id, leído de la columna <campo>_id sin consultar la relación
+                fields[name] = serializers.PrimaryKeyRelatedField(read_only=True, source=options.get('source'))
+
+        if requested_fields is not None:
+            fields = {
+                name: field for name, field in fields.items()
+                if name in requested_fields or field.write_only
+            }
+        return fields
+
+    @classmethod
+    def select_related_for(cls, expand=None):
+        """Rutas para select_related() según las relaciones que se van a expandir."""
+        groups = _group_expand(cls.default_expand if expand is None else expand)
+        paths = []
+        for name, nested in groups.items():
+            if name not in cls.expandable_fields:
+                continue
+            serializer_class, options = cls.expandable_fields[name]
+            source = options.get('source', name).replace('.', '__')
+            paths.append(source)
+            if issubclass(serializer_class, DynamicFieldsMixin):
+                paths += [f'{source}__{path}' for path in serializer_class.select_related_for(nested or None)]
+        return paths
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 from pathlib import Path
+from datetime import timedelta
 import os
 import dj_database_url
 
@@ -46,6 +47,7 @@ INSTALLED_APPS = [
     'store',
     'payments',
     'orders',
+    'images',
     'rest_framework',
     'rest_framework.authtoken',
 ]
@@ -93,9 +95,54 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # BEGIN IMMEDIATE: cada transacción toma el lock de escritura al empezar, así
+            # las escrituras concurrentes (checkout, reservas) se serializan en lugar de
+            # fallar con "database is locked" al intentar promover un lock de lectura.
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
+# Caché compartida entre workers (Redis en producción). Sin REDIS_URL se usa
+# memoria local, que solo es válida con un único proceso.
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'petlovers',
+        }
+    }
+
+# Tablas de referencia cacheadas en cada proceso (backend/lookups.py): cada cuántos
+# segundos se compara la versión local con la compartida
+LOOKUP_CACHE_CHECK_INTERVAL = 5
+
+# Caché de token -> usuario (users/authentication.py): entradas por proceso y segundos de vida
+AUTH_TOKEN_CACHE_SIZE = int(os.environ.get('AUTH_TOKEN_CACHE_SIZE', 10000))
+AUTH_TOKEN_CACHE_TTL = 5 * 60
+# Vida de los tokens de login desde su creación (None = no vencen); ver users/authentication.py.
+# AUTH_TOKEN_TTL_DAYS vacío o 0 desactiva el vencimiento
+_token_ttl_days = int(os.environ.get('AUTH_TOKEN_TTL_DAYS', 14) or 0)
+AUTH_TOKEN_TTL = timedelta(days=_token_ttl_days) if _token_ttl_days else None
+# manage.py purge_tokens: filas borradas por lote
+AUTH_TOKEN_PURGE_BATCH_SIZE = 1000
+# Alta masiva de usuarios (users/importers.py): filas por lote, máximo de errores en el
+# reporte y rol de las filas que no indican uno
+USER_IMPORT_CHUNK_SIZE = 1000
+USER_IMPORT_MAX_REPORTED_ERRORS = 1000
+USER_IMPORT_DEFAULT_ROLE = 'Cliente Regular'
+
 # DATABASE_URL = os.environ.get('DATABASE_URL')
 
 # if DATABASE_URL:
@@ -111,14 +158,33 @@ DATABASES = {
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        # TokenAuthentication con caché e invalidación inmediata (users/authentication.py)
+        'users.authentication.CachedTokenAuthentication',
         # 'rest_framework.authentication.SessionAuthentication', # Puedes tener este también, pero TokenAuthentication es clave.
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
-    ]
+    ],
+    # Intentos de login (users/throttling.py): por IP y por cuenta, antes de calcular ningún hash
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': os.environ.get('LOGIN_THROTTLE_IP_RATE', '20/min'),
+        'login_account': os.environ.get('LOGIN_THROTTLE_ACCOUNT_RATE', '10/min'),
+    },
 }
 
+# Catálogo de la tienda: tamaño de página por defecto y máximo (?page_size=)
+STORE_PRODUCT_PAGE_SIZE = int(os.environ.get('STORE_PRODUCT_PAGE_SIZE', 24))
+STORE_PRODUCT_MAX_PAGE_SIZE = 100
+# Máximo de resultados rankeados que devuelve la búsqueda ?q=
+STORE_SEARCH_MAX_RESULTS = 200
+# Duración de las respuestas cacheadas del catálogo; se invalidan antes por versión
+STORE_CATALOG_CACHE_TIMEOUT = 60 * 60
+# Rangos de precio de la faceta de precios: (mínimo, máximo exclusivo); None = sin tope
+STORE_PRICE_FACETS = [(0, 10), (10, 25), (25, 50), (50, 100), (100, None)]
+# Importación masiva de productos: filas por upsert y máximo de errores en el reporte
+STORE_IMPORT_CHUNK_SIZE = 1000
+STORE_IMPORT_MAX_REPORTED_ERRORS = 1000
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -158,6 +224,31 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Hotel de mascotas: reservas activas simultáneas por día (reservations/occupancy.py)
+KENNEL_CAPACITY = int(os.environ.get('KENNEL_CAPACITY', 20))
+# Estados que no ocupan cupo
+RESERVATION_INACTIVE_STATUSES = ('Cancelled',)
+# Cambios de estado permitidos en /api/reservations/bulk-status/ (estado actual -> destinos)
+RESERVATION_STATUS_TRANSITIONS = {
+    'Pending': ('Confirmed', 'Cancelled'),
+    'Confirmed': ('Completed', 'Cancelled'),
+}
+RESERVATION_BULK_MAX_SIZE = 500
+# Máximo de días por consulta de /api/reservations/availability/
+RESERVATION_AVAILABILITY_MAX_DAYS = 366
+
+# Exportación de mascotas (?format=ndjson|csv): filas leídas por bloque
+PETS_EXPORT_CHUNK_SIZE = 2000
+# Máximo de mascotas por petición en POST /api/pets/batch/
+PETS_BATCH_MAX_SIZE = 50
+
+# Cola de optimización de imágenes (manage.py process_image_jobs)
+IMAGE_JOB_MAX_ATTEMPTS = 3
+IMAGE_JOB_RETRY_DELAY = 30  # segundos; se duplica en cada reintento
+IMAGE_JOB_LOCK_TIMEOUT = 10 * 60  # un trabajo 'processing' más viejo se considera abandonado
+# Anchos (px) de las miniaturas WebP que se generan para cada imagen subida
+IMAGE_VARIANT_SIZES = (128, 320, 800)
+
 CORS_ALLOW_ALL_ORIGINS = True
 CORS_ALLOW_CREDENTIALS = True
 CORS_ALLOW_METHODS = [
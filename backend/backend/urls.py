@@ -24,6 +24,8 @@ urlpatterns = [
     path('api/', include('pets.urls')),
     path('api/', include('store.urls')),
     path('api/', include('reservations.urls')),
+    path('api/', include('orders.urls')),
+    path('api/', include('payments.urls')),
 ]
 
 # if settings.DEBUG:
@@ -0,0 +1,26 @@
+# backend/versioning.py
+"""
+Contadores de versión en la caché compartida (catálogo, tablas de referencia,
+generación de usuarios). Quien lee guarda o compara la versión; quien escribe la
+incrementa, y todo lo cacheado con la versión anterior deja de ser válido.
+"""
+import time
+
+from django.core.cache import cache
+
+
+def get_version(key):
+    version = cache.get(key)
+    if version is None:
+        # Si la clave se perdió (reinicio, desalojo) arrancamos desde un valor nuevo
+        # para no volver a aceptar datos de una versión anterior con el mismo número.
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        get_version(key)
@@ -0,0 +1,16 @@
+from django.contrib import admin
+from .models import ImageBlob, ImageJob
+
+
+@admin.register(ImageJob)
+class ImageJobAdmin(admin.ModelAdmin):
+    list_display = ('source_name', 'content_type', 'status', 'attempts', 'run_after', 'updated_at')
+    list_filter = ('status', 'content_type')
+    readonly_fields = ('last_error',)
+
+
+@admin.register(ImageBlob)
+class ImageBlobAdmin(admin.ModelAdmin):
+    list_display = ('sha256', 'name', 'ref_count', 'phash', 'created_at')
+    search_fields = ('sha256', 'phash')
+    readonly_fields = ('sha256', 'name', 'variants', 'phash', 'ref_count')
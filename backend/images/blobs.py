@@ -0,0 +1,116 @@
+# images/blobs.py
+"""
+Almacenamiento direccionado por contenido de las imágenes optimizadas.
+
+Al subir una imagen se calcula el sha256 de sus bytes. Si ya existe un ImageBlob
+con ese hash, el registro apunta a él (mismo WebP y mismas variantes) y no se
+encola ningún trabajo. Si no, el worker codifica el original y crea el blob en
+`blobs/<ab>/<sha256>.webp`. Cada modelo guarda la referencia en `<campo>_blob`
+y `ImageBlob.ref_count` cuenta cuántos registros lo usan.
+"""
+import hashlib
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+from .models import ImageBlob
+
+BLOB_PREFIX = 'blobs'
+
+
+def content_hash(file):
+    digest = hashlib.sha256()
+    for chunk in file.chunks():
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def blob_path(digest, suffix=''):
+    return f'{BLOB_PREFIX}/{digest[:2]}/{digest}{suffix}.webp'
+
+
+def acquire_blob(digest):
+    """Suma una referencia al blob con ese hash y lo devuelve; None si no existe."""
+    with transaction.atomic():
+        if not ImageBlob.objects.filter(sha256=digest).update(ref_count=F('ref_count') + 1):
+            return None
+        return ImageBlob.objects.get(sha256=digest)
+
+
+def attach_upload(instance, field_name):
+    """
+    Llamar desde Model.save cuando `<campo>` trae un archivo nuevo. Si su contenido
+    ya tiene blob, el campo pasa a apuntar al blob y se devuelve True (no hace falta
+    encolar nada). Si no, se limpian las variantes y se devuelve False.
+    """
+    digest = content_hash(getattr(instance, field_name))
+    blob = acquire_blob(digest)
+    if blob is None:
+        setattr(instance, f'{field_name}_variants', {})
+        setattr(instance, f'{field_name}_blob', None)
+        return False
+    # Asignar el nombre (str) descarta el archivo subido: nunca llega al storage
+    setattr(instance, field_name, blob.name)
+    setattr(instance, f'{field_name}_variants', blob.variants)
+    setattr(instance, f'{field_name}_blob', blob)
+    return True
+
+
+def stored_blob_id(instance, field_name):
+    """Blob al que apunta la fila en la base de datos (no el de la instancia en memoria)."""
+    if instance._state.adding:
+        return None
+    return (
+        type(instance)._default_manager
+        .filter(pk=instance.pk)
+        .values_list(f'{field_name}_blob_id', flat=True)
+        .first()
+    )
+
+
+def _delete_files(names):
+    for name in names:
+        default_storage.delete(name)
+
+
+def _discard(blob_id):
+    # Borrado condicional: si alguien sumó una referencia entretanto, el blob sigue vivo
+    blob = ImageBlob.objects.filter(id=blob_id, ref_count=0).first()
+    if blob is not None and ImageBlob.objects.filter(id=blob_id, ref_count=0).delete()[0]:
+        names = [blob.name, *blob.variants.values()]
+        transaction.on_commit(lambda: _delete_files(names))
+
+
+def release_blob(blob_id):
+    """Resta una referencia; al llegar a cero se borran la fila y sus archivos."""
+    if blob_id is None:
+        return
+    with transaction.atomic():
+        ImageBlob.objects.filter(id=blob_id, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+        _discard(blob_id)
+
+
+def discard_if_unused(blob):
+    with transaction.atomic():
+        _discard(blob.id)
+
+
+def store_blob(digest, optimized, variants, phash):
+    """
+    Guarda el resultado del worker como blob nuevo (con 0 referencias). Si otro
+    worker creó el mismo blob entretanto, se borran nuestros archivos y se usa el suyo.
+    """
+    names = {'name': default_storage.save(blob_path(digest), ContentFile(optimized))}
+    names['variants'] = {
+        str(size): default_storage.save(blob_path(digest, f'_{size}'), ContentFile(data))
+        for size, data in variants.items()
+    }
+    try:
+        with transaction.atomic():
+            return ImageBlob.objects.create(sha256=digest, phash=phash, **names)
+    except IntegrityError:
+        _delete_files([names['name'], *names['variants'].values()])
+        return ImageBlob.objects.get(sha256=digest)
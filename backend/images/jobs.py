@@ -0,0 +1,162 @@
+# images/jobs.py
+import hashlib
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .blobs import discard_if_unused, store_blob
+from .models import ImageBlob, ImageJob
+from .processing import optimize_image
+from .signals import image_optimized
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_image(instance, field_name, quality=80):
+    """
+    Encola la optimización del archivo actual de `instance.<field_name>` (WebP y
+    variantes de tamaño). Se llama desde Model.save después de guardar el original,
+    así la petición HTTP no espera a Pillow.
+    """
+    jobs = enqueue_images([instance], field_name, quality)
+    return jobs[0] if jobs else None
+
+
+def enqueue_images(instances, field_name, quality=80):
+    """Igual que enqueue_image pero para varios registros del mismo modelo, con un solo INSERT."""
+    instances = [instance for instance in instances if getattr(instance, field_name)]
+    if not instances:
+        return []
+    content_type = ContentType.objects.get_for_model(instances[0])
+    return ImageJob.objects.bulk_create([
+        ImageJob(
+            content_type=content_type,
+            object_id=instance.pk,
+            field_name=field_name,
+            source_name=getattr(instance, field_name).name,
+            quality=quality,
+        )
+        for instance in instances
+    ])
+
+
+def claim_jobs(limit):
+    """
+    Reserva hasta `limit` trabajos listos para ejecutarse. La reserva es un UPDATE
+    condicional sobre el estado, así que varios workers pueden convivir sin tomar
+    el mismo trabajo. Los trabajos 'processing' abandonados (worker caído) se
+    recuperan pasado IMAGE_JOB_LOCK_TIMEOUT.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.IMAGE_JOB_LOCK_TIMEOUT)
+    candidates = (
+        ImageJob.objects
+        .filter(Q(status=ImageJob.PENDING, run_after__lte=now) | Q(status=ImageJob.PROCESSING, locked_at__lt=stale))
+        .order_by('run_after')
+        .values_list('id', 'status', 'locked_at')[:limit]
+    )
+    claimed = []
+    for job_id, job_status, locked_at in candidates:
+        updated = ImageJob.objects.filter(id=job_id, status=job_status, locked_at=locked_at).update(
+            status=ImageJob.PROCESSING,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if updated:
+            claimed.append(job_id)
+    return list(ImageJob.objects.filter(id__in=claimed).select_related('content_type'))
+
+
+def read_source(job):
+    model = job.content_type.model_class()
+    storage = model._meta.get_field(job.field_name).storage
+    with storage.open(job.source_name, 'rb') as source:
+        return source.read()
+
+
+def complete_job(job, blob):
+    """
+    Hace que el registro apunte al blob optimizado (y a sus variantes en
+    `<campo>_variants`) solo si el campo no cambió mientras tanto. El original
+    subido se borra; el contenido queda en el blob compartido.
+    """
+    model = job.content_type.model_class()
+    storage = model._meta.get_field(job.field_name).storage
+
+    changes = {job.field_name: blob.name, f"{job.field_name}_blob": blob}
+    variants_field = f"{job.field_name}_variants"
+    if any(field.name == variants_field for field in model._meta.get_fields()):
+        changes[variants_field] = blob.variants
+
+    with transaction.atomic():
+        swapped = model._default_manager.filter(
+            pk=job.object_id, **{job.field_name: job.source_name}
+        ).update(**changes)
+        if swapped:
+            ImageBlob.objects.filter(id=blob.id).update(ref_count=F('ref_count') + 1)
+
+    if swapped:
+        if storage.exists(job.source_name):
+            storage.delete(job.source_name)
+        image_optimized.send(sender=model, object_id=job.object_id, field_name=job.field_name, name=blob.name)
+    else:
+        # El registro se borró o recibió otra imagen: el blob solo se conserva si alguien más lo usa
+        discard_if_unused(blob)
+
+    ImageJob.objects.filter(id=job.id).update(status=ImageJob.DONE, locked_at=None, last_error='')
+
+
+def fail_job(job, error):
+    """Registra el error y reprograma con backoff exponencial hasta IMAGE_JOB_MAX_ATTEMPTS."""
+    job.refresh_from_db(fields=['attempts'])
+    if job.attempts >= settings.IMAGE_JOB_MAX_ATTEMPTS:
+        logger.error("Image job %s failed permanently after %s attempts: %s", job.id, job.attempts, error)
+        ImageJob.objects.filter(id=job.id).update(status=ImageJob.FAILED, locked_at=None, last_error=str(error))
+        return
+    delay = settings.IMAGE_JOB_RETRY_DELAY * (2 ** (job.attempts - 1))
+    logger.warning("Image job %s failed (attempt %s), retrying in %ss: %s", job.id, job.attempts, delay, error)
+    ImageJob.objects.filter(id=job.id).update(
+        status=ImageJob.PENDING,
+        locked_at=None,
+        last_error=str(error),
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def run_jobs(jobs, executor):
+    """
+    Lee cada original y, si su contenido ya tiene blob, lo reutiliza sin codificar.
+    El resto se delega al pool de procesos y se guarda como blob nuevo.
+    """
+    futures = []
+    completed = 0
+    for job in jobs:
+        try:
+            data = read_source(job)
+            digest = hashlib.sha256(data).hexdigest()
+            blob = ImageBlob.objects.filter(sha256=digest).first()
+            if blob is not None:
+                complete_job(job, blob)
+                completed += 1
+                continue
+        except Exception as e:
+            fail_job(job, e)
+            continue
+        futures.append((
+            job,
+            digest,
+            executor.submit(optimize_image, data, job.quality, settings.IMAGE_VARIANT_SIZES),
+        ))
+
+    for job, digest, future in futures:
+        try:
+            complete_job(job, store_blob(digest, *future.result()))
+            completed += 1
+        except Exception as e:
+            fail_job(job, e)
+    return completed
@@ -0,0 +1,37 @@
+# images/management/commands/process_image_jobs.py
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from images.jobs import claim_jobs, run_jobs
+
+
+class Command(BaseCommand):
+    help = "Worker de la cola de imágenes: convierte las imágenes subidas a WebP en un pool de procesos."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 2,
+                            help="Procesos de Pillow en paralelo.")
+        parser.add_argument('--batch-size', type=int, default=20,
+                            help="Trabajos reservados por iteración.")
+        parser.add_argument('--sleep', type=float, default=2.0,
+                            help="Segundos de espera cuando la cola está vacía.")
+        parser.add_argument('--once', action='store_true',
+                            help="Procesa lo pendiente y termina (útil en cron o tests).")
+
+    def handle(self, *args, **options):
+        processed = 0
+        with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+            while True:
+                close_old_connections()
+                jobs = claim_jobs(options['batch_size'])
+                if jobs:
+                    processed += run_jobs(jobs, executor)
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+        self.stdout.write(self.style.SUCCESS(f"{processed} imágenes procesadas."))
@@ -0,0 +1,73 @@
+# images/management/commands/report_duplicate_images.py
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+from images.models import ImageBlob
+
+HASH_BITS = 64
+
+
+def _bands(threshold):
+    """
+    Divide los 64 bits en threshold + 1 bandas. Si dos hashes difieren en como mucho
+    `threshold` bits, al menos una banda es idéntica (palomar), así que basta con
+    comparar los blobs que comparten alguna banda en lugar de todos contra todos.
+    """
+    count = threshold + 1
+    bounds = [round(i * HASH_BITS / count) for i in range(count + 1)]
+    return [(start, end - start) for start, end in zip(bounds, bounds[1:])]
+
+
+class Command(BaseCommand):
+    help = "Reporta grupos de imágenes casi duplicadas según la distancia de Hamming de su dHash."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threshold', type=int, default=6,
+            help="Máximo de bits distintos para considerar dos imágenes casi iguales (0-15).",
+        )
+
+    def handle(self, *args, **options):
+        threshold = options['threshold']
+        if not 0 <= threshold <= 15:
+            raise CommandError("--threshold debe estar entre 0 y 15.")
+
+        blobs = {
+            blob_id: (int(phash, 16), name, ref_count)
+            for blob_id, phash, name, ref_count in
+            ImageBlob.objects.exclude(phash='').values_list('id', 'phash', 'name', 'ref_count').iterator()
+        }
+
+        buckets = defaultdict(list)
+        for blob_id, (value, _, _) in blobs.items():
+            for index, (start, size) in enumerate(_bands(threshold)):
+                buckets[(index, (value >> start) & ((1 << size) - 1))].append(blob_id)
+
+        # Union-find sobre los pares candidatos que realmente están dentro del umbral
+        parent = {}
+
+        def find(blob_id):
+            parent.setdefault(blob_id, blob_id)
+            while parent[blob_id] != blob_id:
+                parent[blob_id] = parent[parent[blob_id]]
+                blob_id = parent[blob_id]
+            return blob_id
+
+        for members in buckets.values():
+            for i, first in enumerate(members):
+                for second in members[i + 1:]:
+                    if find(first) != find(second) and bin(blobs[first][0] ^ blobs[second][0]).count('1') <= threshold:
+                        parent[find(first)] = find(second)
+
+        groups = defaultdict(list)
+        for blob_id in parent:
+            groups[find(blob_id)].append(blob_id)
+        groups = [members for members in groups.values() if len(members) > 1]
+
+        for number, members in enumerate(groups, start=1):
+            self.stdout.write(f"Grupo {number}:")
+            for blob_id in members:
+                _, name, ref_count = blobs[blob_id]
+                self.stdout.write(f"  {name} ({ref_count} referencias)")
+        self.stdout.write(f"{len(groups)} grupos de imágenes casi duplicadas entre {len(blobs)} blobs.")
@@ -0,0 +1,68 @@
+import uuid
+from django.db import models
+from django.utils import timezone
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.contenttypes.fields import GenericForeignKey
+
+
+class ImageJob(models.Model):
+    """
+    Trabajo pendiente de optimización de una imagen subida (Pet.photo, Product.image...).
+    La cola vive en la base de datos y la consume `manage.py process_image_jobs`.
+    """
+    PENDING = 'pending'
+    PROCESSING = 'processing'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (PROCESSING, 'Processing'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.UUIDField()
+    content_object = GenericForeignKey('content_type', 'object_id')
+    field_name = models.CharField(max_length=50)
+    # Nombre del archivo original al encolar; si el campo cambia antes de procesar, el resultado se descarta
+    source_name = models.CharField(max_length=255)
+    quality = models.PositiveSmallIntegerField(default=80)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='images_job_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.content_type.model}.{self.field_name} ({self.status})"
+
+
+class ImageBlob(models.Model):
+    """
+    Imagen optimizada direccionada por contenido: el sha256 de los bytes subidos.
+    Varias filas (Pet.photo, Product.image...) pueden apuntar al mismo blob;
+    `ref_count` dice cuántas, y al llegar a cero se borran los archivos.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    sha256 = models.CharField(max_length=64, unique=True)
+    # Rutas en el storage: WebP principal y variantes {"128": "ruta.webp", ...}
+    name = models.CharField(max_length=255)
+    variants = models.JSONField(default=dict, blank=True)
+    # dHash de 64 bits en hexadecimal, para detectar imágenes casi iguales
+    phash = models.CharField(max_length=16, blank=True)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.sha256[:12]} ({self.ref_count} refs)"
@@ -0,0 +1,53 @@
+# images/processing.py
+"""
+Funciones puras de Pillow. Se ejecutan dentro del ProcessPoolExecutor del worker,
+así que solo reciben y devuelven bytes (nada de ORM ni de storage).
+"""
+from io import BytesIO
+
+from PIL import Image
+
+
+def _encode_webp(img, quality):
+    img_io = BytesIO()
+    img.save(img_io, format='WEBP', quality=quality)
+    return img_io.getvalue()
+
+
+def difference_hash(img, hash_size=8):
+    """
+    dHash: compara cada píxel con su vecino derecho en una miniatura en grises de
+    (hash_size + 1) x hash_size. Imágenes casi iguales (recortes leves, recompresión,
+    otro tamaño) dan hashes con pocos bits distintos. Devuelve 64 bits en hexadecimal.
+    """
+    small = img.convert('L').resize((hash_size + 1, hash_size), Image.LANCZOS)
+    pixels = list(small.getdata())
+    value = 0
+    for row in range(hash_size):
+        for col in range(hash_size):
+            left = pixels[row * (hash_size + 1) + col]
+            right = pixels[row * (hash_size + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return f'{value:0{hash_size * hash_size // 4}x}'
+
+
+def optimize_image(data, quality=80, sizes=()):
+    """
+    Convierte la imagen a WebP y genera una variante por cada ancho de `sizes`.
+    Devuelve (webp, {ancho: bytes}, dhash); si la imagen ya era WebP se devuelven
+    los bytes originales sin recodificar.
+    """
+    img = Image.open(BytesIO(data))
+    already_webp = img.format == 'WEBP'
+    if img.mode in ("RGBA", "P"):
+        img = img.convert("RGB")
+
+    optimized = data if already_webp else _encode_webp(img, quality)
+
+    variants = {}
+    for size in sizes:
+        variant = img.copy()
+        # thumbnail() conserva la proporción y nunca agranda la imagen
+        variant.thumbnail((size, size * 4), Image.LANCZOS)
+        variants[size] = _encode_webp(variant, quality)
+    return optimized, variants, difference_hash(img)
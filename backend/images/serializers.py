@@ -0,0 +1,40 @@
+# images/serializers.py
+from rest_framework import serializers
+
+
+class ImageVariantsMixin(serializers.Serializer):
+    """
+    Expone las miniaturas de `<image_field>_variants` como un mapa {ancho: url} en
+    el campo `variants` y, si la petición trae `?image_size=<px>`, sustituye la URL
+    de la imagen por la variante más pequeña que cubra ese ancho. Así las listas
+    descargan unos pocos KB por tarjeta en lugar de la imagen completa.
+    """
+    image_field = 'photo'
+    variants = serializers.SerializerMethodField()
+
+    def _variant_urls(self, instance):
+        names = getattr(instance, f'{self.image_field}_variants', None) or {}
+        if not names:
+            return {}
+        storage = instance._meta.get_field(self.image_field).storage
+        request = self.context.get('request')
+        urls = {}
+        for size, name in sorted(names.items(), key=lambda item: int(item[0])):
+            url = storage.url(name)
+            urls[size] = request.build_absolute_uri(url) if request is not None else url
+        return urls
+
+    def get_variants(self, instance):
+        return self._variant_urls(instance)
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        request = self.context.get('request')
+        image_size = request.query_params.get('image_size') if request is not None else None
+        if image_size and image_size.isdigit() and self.image_field in data:
+            urls = data.get('variants') or self._variant_urls(instance)
+            if urls:
+                fitting = [size for size in urls if int(size) >= int(image_size)]
+                chosen = min(fitting, key=int) if fitting else max(urls, key=int)
+                data[self.image_field] = urls[chosen]
+        return data
@@ -0,0 +1,6 @@
+# images/signals.py
+from django.dispatch import Signal
+
+# Se envía cuando el worker reemplaza el archivo original por la versión optimizada.
+# Argumentos: sender (modelo), object_id, field_name, name (nuevo nombre del archivo).
+image_optimized = Signal()
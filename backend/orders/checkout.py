@@ -0,0 +1,73 @@
+# orders/checkout.py
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from store.cache import bump_catalog_version
+from store.models import Product
+from .models import Order, OrderItem, OrderStatus
+
+
+class CheckoutError(Exception):
+    """Error de negocio del checkout; el mensaje es apto para el cliente."""
+
+
+class OutOfStock(CheckoutError):
+    def __init__(self, product_id, message):
+        super().__init__(message)
+        self.product_id = product_id
+
+
+def place_order(user, items):
+    """
+    Crea un pedido a partir de `items` ({product_id: cantidad}) en una sola transacción.
+
+    El stock se descuenta con un UPDATE condicional (`stock >= cantidad`), así que dos
+    compradores simultáneos nunca pueden dejarlo negativo: el segundo UPDATE afecta 0
+    filas y todo el pedido se revierte. Los productos se actualizan siempre en el mismo
+    orden (por id) para que dos carritos con los mismos productos no se bloqueen
+    mutuamente (deadlock).
+    """
+    with transaction.atomic():
+        try:
+            pending = OrderStatus.lookups.by_name('Pending')
+        except OrderStatus.DoesNotExist:
+            raise CheckoutError("El estado 'Pending' no está configurado. Contacte al administrador.")
+
+        now = timezone.now()
+        for product_id in sorted(items):
+            quantity = items[product_id]
+            updated = Product.objects.filter(id=product_id, stock__gte=quantity).update(
+                stock=F('stock') - quantity,
+                updated_at=now,
+            )
+            if not updated:
+                if Product.objects.filter(id=product_id).exists():
+                    raise OutOfStock(product_id, "Stock insuficiente para el producto solicitado.")
+                raise OutOfStock(product_id, "Producto no encontrado.")
+
+        # Foto del precio dentro de la misma transacción que el descuento de stock
+        prices = dict(Product.objects.filter(id__in=items.keys()).values_list('id', 'price'))
+        order_items = []
+        total = Decimal('0.00')
+        for product_id, quantity in items.items():
+            unit_price = prices[product_id]
+            subtotal = unit_price * quantity
+            total += subtotal
+            order_items.append(OrderItem(
+                product_id=product_id,
+                quantity=quantity,
+                unit_price=unit_price,
+                subtotal=subtotal,
+            ))
+
+        order = Order.objects.create(user=user, status=pending, total=total)
+        for item in order_items:
+            item.order = order
+        OrderItem.objects.bulk_create(order_items)
+
+        # El stock cambió (puede haber llegado a 0): invalidar el catálogo cacheado
+        transaction.on_commit(bump_catalog_version)
+    return order
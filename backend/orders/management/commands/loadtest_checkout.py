@@ -0,0 +1,91 @@
+# orders/management/commands/loadtest_checkout.py
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from orders.checkout import OutOfStock, place_order
+from orders.models import Order, OrderStatus
+from store.models import Product
+
+UserModel = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Prueba de carga del checkout: N compradores concurrentes compran el mismo producto. "
+        "Verifica que no haya sobreventa ni stock negativo y limpia los datos al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--buyers', type=int, default=300)
+        parser.add_argument('--stock', type=int, default=100)
+        parser.add_argument('--quantity', type=int, default=1)
+        parser.add_argument('--threads', type=int, default=50)
+
+    def handle(self, *args, **options):
+        run_id = uuid.uuid4().hex[:8]
+        OrderStatus.objects.get_or_create(name='Pending')
+        product = Product.objects.create(name=f'loadtest-{run_id}', price=10, stock=options['stock'])
+        users = UserModel.objects.bulk_create([
+            UserModel(username=f'loadtest-{run_id}-{i}', email=f'loadtest-{run_id}-{i}@example.com')
+            for i in range(options['buyers'])
+        ])
+        results = {'ok': 0, 'out_of_stock': 0, 'errors': []}
+        latencies = []
+        lock = threading.Lock()
+
+        def buy(user):
+            started = time.perf_counter()
+            try:
+                place_order(user, {product.id: options['quantity']})
+                outcome = 'ok'
+            except OutOfStock:
+                outcome = 'out_of_stock'
+            except Exception as e:  # deadlocks, "database is locked", etc.
+                outcome = e
+            finally:
+                connection.close()
+            with lock:
+                latencies.append((time.perf_counter() - started) * 1000)
+                if isinstance(outcome, Exception):
+                    results['errors'].append(repr(outcome))
+                else:
+                    results[outcome] += 1
+
+        try:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options['threads']) as executor:
+                list(executor.map(buy, users))
+            elapsed = time.perf_counter() - started
+
+            product.refresh_from_db()
+            orders = Order.objects.filter(items__product=product).count()
+            expected_sold = min(options['buyers'], options['stock'] // options['quantity'])
+
+            self.stdout.write(
+                f"{options['buyers']} compradores en {elapsed:.2f}s ({options['buyers'] / elapsed:.0f} checkouts/s), "
+                f"latencia p50 {statistics.median(latencies):.1f} ms, "
+                f"p95 {sorted(latencies)[int(len(latencies) * 0.95) - 1]:.1f} ms"
+            )
+            self.stdout.write(
+                f"Pedidos: {results['ok']}  Sin stock: {results['out_of_stock']}  "
+                f"Errores: {len(results['errors'])}  Stock final: {product.stock}"
+            )
+            for error in results['errors'][:5]:
+                self.stderr.write(error)
+
+            sold = options['stock'] - product.stock
+            if results['errors'] or orders != results['ok'] or sold != orders * options['quantity'] \
+                    or results['ok'] != expected_sold or product.stock < 0:
+                raise CommandError("La prueba de carga detectó inconsistencias.")
+            self.stdout.write(self.style.SUCCESS("Sin sobreventa, sin stock negativo y sin deadlocks."))
+        finally:
+            Order.objects.filter(items__product=product).delete()
+            UserModel.objects.filter(username__startswith=f'loadtest-{run_id}-').delete()
+            product.delete()
@@ -1,12 +1,17 @@
 import uuid
 from django.db import models
+from backend.lookups import LookupManager
 from users.models import User
 from store.models import Product
+from payments.fields import PaymentsRelation
 
 class OrderStatus(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=30)
 
+    objects = models.Manager()
+    lookups = LookupManager()
+
     def __str__(self):
         return self.name
 
@@ -16,6 +21,7 @@ class Order(models.Model):
     status = models.ForeignKey(OrderStatus, on_delete=models.SET_NULL, null=True)
     date_created = models.DateTimeField(auto_now_add=True)
     total = models.DecimalField(max_digits=10, decimal_places=2)
+    payments = PaymentsRelation() # Sin columna: pagos que apuntan a este pedido
 
 class OrderItem(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -0,0 +1,51 @@
+# orders/serializers.py
+from rest_framework import serializers
+from payments.serializers import PaymentStatusField
+from .models import Order, OrderItem
+from .checkout import CheckoutError, OutOfStock, place_order
+
+
+class OrderItemSerializer(serializers.ModelSerializer):
+    product_id = serializers.UUIDField(read_only=True)
+    product_name = serializers.CharField(source='product.name', read_only=True)
+
+    class Meta:
+        model = OrderItem
+        fields = ['id', 'product_id', 'product_name', 'quantity', 'unit_price', 'subtotal']
+        read_only_fields = fields
+
+
+class OrderSerializer(serializers.ModelSerializer):
+    status = serializers.StringRelatedField() # Muestra el nombre del estado
+    items = OrderItemSerializer(many=True, read_only=True)
+    payment_status = PaymentStatusField() # Estado del último pago, o None
+
+    class Meta:
+        model = Order
+        fields = ['id', 'user', 'status', 'date_created', 'total', 'items', 'payment_status']
+        read_only_fields = fields
+
+
+class CheckoutItemSerializer(serializers.Serializer):
+    product_id = serializers.UUIDField()
+    quantity = serializers.IntegerField(min_value=1)
+
+
+class CheckoutSerializer(serializers.Serializer):
+    items = CheckoutItemSerializer(many=True, allow_empty=False)
+
+    def validate_items(self, value):
+        # Agrupar líneas repetidas del mismo producto
+        quantities = {}
+        for item in value:
+            quantities[item['product_id']] = quantities.get(item['product_id'], 0) + item['quantity']
+        return quantities
+
+    def create(self, validated_data):
+        user = self.context['request'].user
+        try:
+            return place_order(user, validated_data['items'])
+        except OutOfStock as e:
+            raise serializers.ValidationError({"items": str(e), "product_id": str(e.product_id)})
+        except CheckoutError as e:
+            raise serializers.ValidationError(str(e))
@@ -1,3 +1,54 @@
+import uuid
+from decimal import Decimal
+
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from store.models import Product
+from users.models import User
+from .models import Order, OrderStatus
+
+
+class CheckoutTests(TestCase):
+    """POST /api/orders/checkout/ (orders/checkout.py)."""
+
+    def setUp(self):
+        # Crear el estado invalida la caché de OrderStatus.lookups (backend/lookups.py)
+        OrderStatus.objects.create(name='Pending')
+        self.user = User.objects.create_user(username='buyer', email='buyer@example.com', password='x')
+        self.ball = Product.objects.create(name='Pelota', price=Decimal('8.50'), stock=3)
+        self.rope = Product.objects.create(name='Cuerda', price=Decimal('15.00'), stock=1)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def checkout(self, *lines):
+        return self.client.post('/api/orders/checkout/', {
+            'items': [{'product_id': str(product_id), 'quantity': quantity} for product_id, quantity in lines],
+        }, format='json')
+
+    def stock(self, product):
+        product.refresh_from_db(fields=['stock'])
+        return product.stock
+
+    def test_creates_order_and_decrements_stock(self):
+        # Las líneas repetidas del mismo producto se suman
+        response = self.checkout((self.ball.pk, 1), (self.rope.pk, 1), (self.ball.pk, 1))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['status'], 'Pending')
+        self.assertEqual(Decimal(response.data['total']), Decimal('32.00'))
+        self.assertEqual(self.stock(self.ball), 1)
+        self.assertEqual(self.stock(self.rope), 0)
+
+    def test_out_of_stock_rolls_back_the_whole_order(self):
+        response = self.checkout((self.ball.pk, 1), (self.rope.pk, 2))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['product_id'], str(self.rope.pk))
+        self.assertEqual(self.stock(self.ball), 3)
+        self.assertFalse(Order.objects.exists())
 
-# Create your tests here.
+    def test_rejects_unknown_product_and_bad_quantities(self):
+        response = self.checkout((uuid.uuid4(), 1))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Producto no encontrado', str(response.data['items']))
+        self.assertEqual(self.checkout((self.ball.pk, 0)).status_code, 400)
+        self.assertEqual(self.checkout().status_code, 400)
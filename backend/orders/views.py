@@ -1,3 +1,34 @@
-from django.shortcuts import render
+# orders/views.py
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-# Create your views here.
+from .models import Order
+from .serializers import OrderSerializer, CheckoutSerializer
+
+
+class OrderViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint para consultar pedidos (los propios, o todos si es administrador)
+    y para hacer el checkout de un carrito.
+    """
+    serializer_class = OrderSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = Order.objects.all().select_related('status').prefetch_related('items__product', 'payments').order_by('-date_created')
+        if self.request.user.is_staff:
+            return queryset
+        return queryset.filter(user=self.request.user)
+
+    @action(detail=False, methods=['post'])
+    def checkout(self, request):
+        """
+        Recibe {"items": [{"product_id": ..., "quantity": ...}]} y crea el pedido descontando
+        el stock de forma atómica. Si algún producto no alcanza, no se crea nada.
+        """
+        serializer = CheckoutSerializer(data=request.data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        order = serializer.save()
+        return Response(OrderSerializer(order, context={'request': request}).data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,19 @@
+# payments/fields.py
+from django.contrib.contenttypes.fields import GenericRelation
+
+
+class PaymentsRelation(GenericRelation):
+    """
+    Relación inversa hacia payments.Payment (`order.payments`, `reservation.payments`)
+    para usar con prefetch_related('payments'): una consulta por listado sobre el índice
+    (content_type, object_id).
+
+    A diferencia de GenericRelation, borrar el pedido o la reserva no borra sus pagos:
+    son registros contables y se conservan, como hasta ahora.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__('payments.Payment', **kwargs)
+
+    def bulk_related_objects(self, objs, using=None):
+        return [] # El Collector no encadena el borrado hacia los pagos
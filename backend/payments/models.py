@@ -1,5 +1,6 @@
 import uuid
 from django.db import models
+from backend.lookups import LookupManager
 from orders.models import Order
 from reservations.models import Reservation
 from django.contrib.contenttypes.models import ContentType
@@ -9,10 +10,16 @@ class PaymentMethod(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=50)
 
+    objects = models.Manager()
+    lookups = LookupManager()
+
 class PaymentStatus(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=30)
 
+    objects = models.Manager()
+    lookups = LookupManager()
+
 
 class Payment(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -30,5 +37,13 @@ class Payment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Pagos de un pedido o reserva (prefetch_related('payments') y ?type=&object_id=)
+            models.Index(fields=['content_type', 'object_id'], name='payments_target_idx'),
+            # Paginación por cursor del listado (views.PaymentPagination)
+            models.Index(fields=['created_at', 'id'], name='payments_created_keyset_idx'),
+        ]
+
     def __str__(self):
         return f"{self.transaction_id} - {self.total}"
\ No newline at end of file
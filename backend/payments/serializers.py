@@ -0,0 +1,97 @@
+# payments/serializers.py
+from django.contrib.contenttypes.models import ContentType
+from rest_framework import serializers
+from orders.models import Order, OrderStatus
+from reservations.models import Reservation, ReservationStatus
+from .models import Payment, PaymentMethod, PaymentStatus
+
+
+def _lookup_name(model, pk):
+    """Nombre desde la caché de tablas de referencia (backend/lookups.py), sin JOIN."""
+    if pk is None:
+        return None
+    try:
+        return model.lookups.by_id(pk).name
+    except model.DoesNotExist:
+        return None
+
+
+class PaymentStatusField(serializers.Field):
+    """
+    Estado del último pago de un pedido o reserva (None si no tiene pagos). Lee
+    `obj.payments`: la vista debe hacer prefetch_related('payments') para no consultar por fila.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, obj):
+        payments = obj.payments.all()
+        if not payments:
+            return None
+        latest = max(payments, key=lambda payment: payment.created_at)
+        return _lookup_name(PaymentStatus, latest.status_id)
+
+
+class PaymentOrderSerializer(serializers.ModelSerializer):
+    status = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Order
+        fields = ['id', 'user', 'status', 'date_created', 'total']
+
+    def get_status(self, obj):
+        return _lookup_name(OrderStatus, obj.status_id)
+
+
+class PaymentReservationSerializer(serializers.ModelSerializer):
+    status = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Reservation
+        fields = ['id', 'pet', 'status', 'start_date', 'end_date']
+
+    def get_status(self, obj):
+        return _lookup_name(ReservationStatus, obj.status_id)
+
+
+# Tipo de objeto pagado -> serializer del resumen que se incluye en el pago
+TARGET_SERIALIZERS = {
+    Order: PaymentOrderSerializer,
+    Reservation: PaymentReservationSerializer,
+}
+
+
+class PaymentSerializer(serializers.ModelSerializer):
+    method = serializers.SerializerMethodField()
+    status = serializers.SerializerMethodField()
+    target_type = serializers.SerializerMethodField()
+    target = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Payment
+        fields = [
+            'id', 'transaction_id', 'total', 'method', 'status', 'payment_date',
+            'target_type', 'object_id', 'target', 'created_at', 'updated_at',
+        ]
+        read_only_fields = fields
+
+    def get_method(self, obj):
+        return _lookup_name(PaymentMethod, obj.method_id)
+
+    def get_status(self, obj):
+        return _lookup_name(PaymentStatus, obj.status_id)
+
+    def get_target_type(self, obj):
+        # get_for_id usa la caché de ContentType: sin consulta por fila
+        return ContentType.objects.get_for_id(obj.content_type_id).model
+
+    def get_target(self, obj):
+        # La vista hace prefetch_related('content_object'): una consulta por tipo, no por fila
+        target = obj.content_object
+        serializer_class = TARGET_SERIALIZERS.get(type(target))
+        if serializer_class is None:
+            return None # Objeto borrado (los pagos se conservan) o de otro tipo
+        return serializer_class(target, context=self.context).data
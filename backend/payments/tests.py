@@ -1,3 +1,120 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from orders.models import Order, OrderStatus
+from pets.models import Pet, PetType
+from reservations.models import Reservation, ReservationStatus
+from users.models import User
+from .models import Payment, PaymentMethod, PaymentStatus
+
+
+class PaymentTestCase(TestCase):
+    """Un pedido y una reserva del dueño, un pedido de otro usuario, y sus pagos."""
+
+    def setUp(self):
+        # Crear las filas invalida la caché de cada tabla de referencia (backend/lookups.py)
+        self.card = PaymentMethod.objects.create(name='Tarjeta')
+        self.approved = PaymentStatus.objects.create(name='Aprobado')
+        self.rejected = PaymentStatus.objects.create(name='Rechazado')
+        order_status = OrderStatus.objects.create(name='Pending')
+        reservation_status = ReservationStatus.objects.create(name='Pending')
+
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='x')
+        self.other = User.objects.create_user(username='other', email='other@example.com', password='x')
+        pet = Pet.objects.create(user=self.owner, name='Rex', age=1, pet_type=PetType.objects.create(name='Dog'),
+                                 animal_breed='mestizo')
+        start = date.today() + timedelta(days=7)
+        self.order = Order.objects.create(user=self.owner, status=order_status, total=Decimal('20.00'))
+        self.other_order = Order.objects.create(user=self.other, status=order_status, total=Decimal('5.00'))
+        self.reservation = Reservation.objects.create(pet=pet, status=reservation_status, start_date=start,
+                                                      end_date=start + timedelta(days=2))
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def pay(self, target, status=None):
+        return Payment.objects.create(
+            content_object=target, method=self.card, status=status or self.approved,
+            total=Decimal('20.00'), transaction_id=f'tx-{Payment.objects.count()}',
+        )
+
+
+class PaymentListTests(PaymentTestCase):
+    """GET /api/payments/ (payments/views.py)."""
+
+    def list(self, **params):
+        response = self.client.get('/api/payments/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def test_lists_own_payments_with_their_targets(self):
+        order_payment = self.pay(self.order)
+        reservation_payment = self.pay(self.reservation)
+        self.pay(self.other_order)
+        results = {item['id']: item for item in self.list()}
+        self.assertEqual(set(results), {str(order_payment.pk), str(reservation_payment.pk)})
+        order_item = results[str(order_payment.pk)]
+        self.assertEqual((order_item['target_type'], order_item['status'], order_item['method']),
+                         ('order', 'Aprobado', 'Tarjeta'))
+        self.assertEqual(order_item['target']['status'], 'Pending')
+        self.assertEqual(results[str(reservation_payment.pk)]['target']['id'], str(self.reservation.pk))
+
+    def test_targets_are_loaded_per_type_not_per_payment(self):
+        self.pay(self.order)
+        self.pay(self.reservation)
+        self.list() # Carga las cachés de ContentType y de tablas de referencia
+        with CaptureQueriesContext(connection) as few:
+            self.list()
+        for _ in range(5):
+            self.pay(self.order)
+            self.pay(self.reservation)
+        with CaptureQueriesContext(connection) as many:
+            self.assertEqual(len(self.list()), 12)
+        self.assertEqual(len(many.captured_queries), len(few.captured_queries))
+
+    def test_filters(self):
+        payment = self.pay(self.order, status=self.rejected)
+        self.pay(self.reservation)
+        self.assertEqual([item['id'] for item in self.list(type='order', object_id=str(self.order.pk))],
+                         [str(payment.pk)])
+        self.assertEqual([item['id'] for item in self.list(status='Rechazado')], [str(payment.pk)])
+
+    def test_deleted_target_keeps_its_payments(self):
+        payment = self.pay(self.reservation)
+        self.reservation.delete()
+        self.client.force_authenticate(User.objects.create_superuser(username='admin', email='admin@example.com',
+                                                                     password='x'))
+        [item] = self.list()
+        self.assertEqual((item['id'], item['target']), (str(payment.pk), None))
+
+    def test_rejects_bad_filters_and_foreign_payments(self):
+        for params in ({'type': 'invoice'}, {'object_id': str(self.order.pk)},
+                       {'type': 'order', 'object_id': 'abc'}, {'status': 'Nadie'}):
+            with self.subTest(**params):
+                self.assertEqual(self.client.get('/api/payments/', params).status_code, 400)
+        self.assertEqual(self.client.get('/api/payments/', {'cursor': 'bogus'}).status_code, 404)
+        foreign = self.pay(self.other_order)
+        self.assertEqual(self.client.get(f'/api/payments/{foreign.pk}/').status_code, 404)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/api/payments/').status_code, 401)
+
+
+class PaymentStatusFieldTests(PaymentTestCase):
+    """payment_status en pedidos y reservas: el estado del último pago (payments/fields.py)."""
+
+    def test_latest_payment_status(self):
+        self.pay(self.order, status=self.rejected)
+        self.pay(self.order)
+        self.pay(self.reservation, status=self.rejected)
+        [order] = self.client.get('/api/orders/').json()
+        self.assertEqual(order['payment_status'], 'Aprobado')
+        [reservation] = self.client.get('/api/reservations/').json()['results']
+        self.assertEqual(reservation['payment_status'], 'Rechazado')
 
-# Create your tests here.
+    def test_without_payments_is_none(self):
+        self.assertIsNone(self.client.get(f'/api/orders/{self.order.pk}/').json()['payment_status'])
+        self.assertEqual(self.client.get(f'/api/orders/{self.other_order.pk}/').status_code, 404)
@@ -1,3 +1,75 @@
-from django.shortcuts import render
+# payments/views.py
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from backend.pagination import KeysetPagination
+from orders.models import Order
+from reservations.models import Reservation
+from .models import Payment, PaymentStatus
+from .serializers import PaymentSerializer
 
-# Create your views here.
+# ?type= -> modelo del objeto pagado
+PAYMENT_TARGETS = {
+    'order': Order,
+    'reservation': Reservation,
+}
+
+
+class PaymentPagination(KeysetPagination):
+    """Pagos más recientes primero; el índice payments_created_keyset_idx cubre el orden."""
+    page_size = 50
+    max_page_size = 200
+    ordering = ('-created_at', '-id')
+
+
+class PaymentViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint para consultar pagos (los de pedidos y reservas propios, o todos si es
+    administrador), cada uno con un resumen del pedido o la reserva que paga.
+
+    Filtros: ?type=order|reservation, ?object_id=<uuid> (junto con ?type=) y ?status=<nombre>.
+    """
+    serializer_class = PaymentSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = PaymentPagination
+
+    def get_queryset(self):
+        # El objeto pagado se resuelve con una consulta por tipo (pedidos, reservas), no por pago
+        queryset = Payment.objects.all().prefetch_related('content_object')
+        params = self.request.query_params
+
+        target_type = params.get('type')
+        if target_type:
+            model = PAYMENT_TARGETS.get(target_type)
+            if model is None:
+                raise ValidationError({"type": "Use 'order' o 'reservation'."})
+            queryset = queryset.filter(content_type=ContentType.objects.get_for_model(model))
+            object_id = params.get('object_id')
+            if object_id:
+                try:
+                    queryset = queryset.filter(object_id=Payment._meta.get_field('object_id').to_python(object_id))
+                except DjangoValidationError:
+                    raise ValidationError({"object_id": "Id inválido."})
+        elif params.get('object_id'):
+            raise ValidationError({"object_id": "Debe indicar también ?type=."})
+
+        status_name = params.get('status')
+        if status_name:
+            try:
+                queryset = queryset.filter(status_id=PaymentStatus.lookups.by_name(status_name).pk)
+            except PaymentStatus.DoesNotExist:
+                raise ValidationError({"status": "El estado especificado no existe."})
+
+        user = self.request.user
+        if user.is_staff:
+            return queryset
+        # Cada rama usa el índice (content_type, object_id)
+        return queryset.filter(
+            Q(content_type=ContentType.objects.get_for_model(Order),
+              object_id__in=Order.objects.filter(user=user).values('id'))
+            | Q(content_type=ContentType.objects.get_for_model(Reservation),
+                object_id__in=Reservation.objects.filter(pet__user=user).values('id'))
+        )
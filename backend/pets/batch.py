@@ -0,0 +1,52 @@
+# pets/batch.py
+"""
+Batch pet registration (POST /api/pets/batch/).
+
+Every item is validated against the cached PetType table (backend/lookups.py),
+and the valid ones are inserted with a single bulk_create inside a transaction.
+Photos are queued for the image worker (images/jobs.py) instead of being
+encoded in the request.
+"""
+from django.db import transaction
+from django.db.models import F
+
+from images.blobs import attach_upload
+from images.jobs import enqueue_images
+from users.models import User
+from .models import Pet, PetType
+from .serializers import PetSerializer
+
+
+def create_pets(user, items, photos, context):
+    """
+    Creates the valid pets from `items` (PetSerializer input) for `user`.
+    `photos` maps an item index to its uploaded file. Returns one result per
+    item, in order, plus the number of pets created.
+    """
+    results = [None] * len(items)
+    pending = [] # (index, unsaved Pet)
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[index] = {'index': index, 'status': 'error', 'errors': {'non_field_errors': ["Expected an object."]}}
+            continue
+        data = {**item, 'photo': photos[index]} if index in photos else item
+        serializer = PetSerializer(data=data, context=context)
+        if not serializer.is_valid():
+            results[index] = {'index': index, 'status': 'error', 'errors': serializer.errors}
+            continue
+        values = dict(serializer.validated_data)
+        pet_type = PetType.lookups.by_id(values.pop('pet_type_id'))
+        pending.append((index, Pet(user=user, pet_type=pet_type, **values)))
+
+    pets = [pet for _, pet in pending]
+    if pets:
+        with transaction.atomic():
+            # bulk_create skips Pet.save(), so blob reuse, pet_count and the photo jobs are handled here
+            needs_job = [pet for pet in pets if pet.photo and not attach_upload(pet, 'photo')]
+            Pet.objects.bulk_create(pets)
+            User.objects.filter(pk=user.pk).update(pet_count=F('pet_count') + len(pets))
+            enqueue_images(needs_job, 'photo', quality=80)
+
+    for (index, _), pet_data in zip(pending, PetSerializer(pets, many=True, context=context).data):
+        results[index] = {'index': index, 'status': 'created', 'pet': pet_data}
+    return results, len(pets)
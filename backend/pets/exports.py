@@ -0,0 +1,70 @@
+# pets/exports.py
+import csv
+import json
+
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+CSV_COLUMNS = [
+    'id', 'name', 'age', 'pet_type', 'animal_breed', 'description', 'photo',
+    'user_id', 'username', 'email', 'created_at', 'updated_at',
+]
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Habilita ?format=ndjson. La exportación en sí se genera como StreamingHttpResponse
+    en la vista; este renderer solo se usa para respuestas normales (p. ej. errores).
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        items = data if isinstance(data, list) else [data]
+        return ''.join(json.dumps(item, cls=JSONEncoder) + '\n' for item in items).encode(self.charset)
+
+
+class CSVRenderer(BaseRenderer):
+    """Habilita ?format=csv (ver NDJSONRenderer)."""
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, dict):  # Errores: {"detail": "..."}
+            writer = csv.writer(_Echo())
+            return ''.join(writer.writerow([key, value]) for key, value in data.items()).encode(self.charset)
+        return b''
+
+
+class _Echo:
+    """Objeto tipo archivo para csv.writer que devuelve la línea en vez de guardarla."""
+
+    def write(self, value):
+        return value
+
+
+def iter_ndjson(pets, serializer_class, context):
+    for pet in pets:
+        yield json.dumps(serializer_class(pet, context=context).data, cls=JSONEncoder) + '\n'
+
+
+def iter_csv(pets, request):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for pet in pets:
+        yield writer.writerow([
+            pet.id,
+            pet.name,
+            pet.age,
+            pet.pet_type.name if pet.pet_type else '',
+            pet.animal_breed,
+            pet.description,
+            request.build_absolute_uri(pet.photo.url) if pet.photo else '',
+            pet.user_id,
+            pet.user.username,
+            pet.user.email,
+            pet.created_at.isoformat(),
+            pet.updated_at.isoformat(),
+        ])
@@ -0,0 +1,33 @@
+# pets/management/commands/reconcile_pet_counts.py
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from pets.models import Pet
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = "Recalcula User.pet_count desde la tabla de mascotas y corrige cualquier desviación."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Solo reporta los usuarios desviados.")
+
+    def handle(self, *args, **options):
+        actual = Coalesce(
+            Subquery(
+                Pet.objects.filter(user=OuterRef('pk')).order_by().values('user')
+                .annotate(total=Count('id')).values('total')
+            ),
+            Value(0),
+        )
+        drifted = User.objects.annotate(actual_count=actual).exclude(pet_count=actual)
+
+        if options['dry_run']:
+            for user in drifted.only('id', 'username', 'pet_count'):
+                self.stdout.write(f"{user.username}: guardado {user.pet_count}, real {user.actual_count}")
+            self.stdout.write(f"{drifted.count()} usuarios con contador desviado.")
+            return
+
+        fixed = User.objects.filter(pk__in=drifted.values('pk')).update(pet_count=actual)
+        self.stdout.write(self.style.SUCCESS(f"{fixed} contadores corregidos."))
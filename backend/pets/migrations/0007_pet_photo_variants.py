@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-17 17:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pets', '0006_alter_pet_photo'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pet',
+            name='photo_variants',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
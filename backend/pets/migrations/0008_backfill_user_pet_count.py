@@ -0,0 +1,22 @@
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_pet_counts(apps, schema_editor):
+    User = apps.get_model('users', 'User')
+    Pet = apps.get_model('pets', 'Pet')
+    counts = Pet.objects.filter(user=OuterRef('pk')).order_by().values('user').annotate(total=Count('id')).values('total')
+    User.objects.update(pet_count=Coalesce(Subquery(counts), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pets', '0007_pet_photo_variants'),
+        ('users', '0002_user_pet_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_pet_counts, migrations.RunPython.noop),
+    ]
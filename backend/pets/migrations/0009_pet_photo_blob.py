@@ -0,0 +1,20 @@
+# Generated by Django 5.2 on 2026-10-17 17:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('images', '0002_imageblob'),
+        ('pets', '0008_backfill_user_pet_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pet',
+            name='photo_blob',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='pet_photos', to='images.imageblob'),
+        ),
+    ]
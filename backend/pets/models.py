@@ -1,16 +1,20 @@
 import uuid
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from backend.lookups import LookupManager
 from users.models import User
-from io import BytesIO
-from django.core.files.base import ContentFile
-from PIL import Image
-import os
+from images.blobs import attach_upload, release_blob, stored_blob_id
+from images.jobs import enqueue_image
+from images.models import ImageBlob
 
 
 class PetType(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=50)
 
+    objects = models.Manager()
+    lookups = LookupManager()
+
     def __str__(self):
         return self.name
 
@@ -23,29 +27,56 @@ class Pet(models.Model):
     animal_breed = models.CharField(max_length=100)
     description = models.TextField(blank=True)
     photo = models.ImageField(upload_to='pets/', blank=True, null=True)
+    # Miniaturas generadas por el worker de imágenes: {"128": "ruta.webp", ...}
+    photo_variants = models.JSONField(default=dict, blank=True)
+    # Blob optimizado compartido (images/blobs.py); vacío mientras el original espera al worker
+    photo_blob = models.ForeignKey(
+        ImageBlob, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='pet_photos'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
 
-    def save(self, *args, **kwargs):
-        if self.photo:
-            try:
-                img = Image.open(self.photo)
-
-                if img.format != 'WEBP':
-                    if img.mode in ("RGBA", "P"):
-                        img = img.convert("RGB")
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Dueño al cargar, para detectar cambios de dueño en save()
+        instance._loaded_user_id = instance.__dict__.get('user_id')
+        return instance
 
-                    img_io = BytesIO()
-                    img.save(img_io, format='WEBP', quality=80)
+    def save(self, *args, **kwargs):
+        # Se guarda el original tal cual; la conversión a WebP la hace el worker
+        # (manage.py process_image_jobs) fuera de la petición.
+        new_photo = bool(self.photo) and not self.photo._committed
+        reused_blob = False
 
-                    base_name = os.path.splitext(self.photo.name)[0]
-                    new_image_name = f"{base_name}.webp"
+        adding = self._state.adding
+        previous_user_id = getattr(self, '_loaded_user_id', None)
+        with transaction.atomic():
+            previous_blob_id = None
+            if new_photo or not self.photo:
+                previous_blob_id = stored_blob_id(self, 'photo')
+            if new_photo:
+                # Si ya existe un blob con el mismo contenido se reutiliza sin volver a codificar
+                reused_blob = attach_upload(self, 'photo')
+            elif not self.photo:
+                self.photo_variants = {} # Las miniaturas anteriores ya no corresponden
+                self.photo_blob = None
 
-                    self.photo.save(new_image_name, ContentFile(img_io.getvalue()), save=False)
-            except Exception as e:
-                print(f"Error al optimizar la imagen: {e}")
+            super().save(*args, **kwargs)
+            # attach_upload sumó una referencia al blob reutilizado: si es el mismo que ya
+            # teníamos (se volvió a subir la misma imagen), la anterior sobra igual
+            if previous_blob_id and (reused_blob or previous_blob_id != self.photo_blob_id):
+                release_blob(previous_blob_id)
+            # Mantener User.pet_count en la misma transacción (el borrado está en pets/signals.py)
+            if adding:
+                User.objects.filter(pk=self.user_id).update(pet_count=F('pet_count') + 1)
+            elif previous_user_id is not None and previous_user_id != self.user_id:
+                User.objects.filter(pk=previous_user_id).update(pet_count=F('pet_count') - 1)
+                User.objects.filter(pk=self.user_id).update(pet_count=F('pet_count') + 1)
+        self._loaded_user_id = self.user_id
 
-        super().save(*args, **kwargs)
+        if new_photo and not reused_blob:
+            enqueue_image(self, 'photo', quality=80)
@@ -1,6 +1,9 @@
 # pets/serializers.py
 from rest_framework import serializers
 from .models import Pet, PetType
+from users.models import User
+from backend.serializers import DynamicFieldsMixin
+from images.serializers import ImageVariantsMixin
 
 # Serializer for PetType
 class PetTypeSerializer(serializers.ModelSerializer):
@@ -10,22 +13,33 @@ class PetTypeSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 # Serializer for Pet
-class PetSerializer(serializers.ModelSerializer):
-    pet_type = PetTypeSerializer(read_only=True) # Read-only, displays full PetType object
+class PetSerializer(DynamicFieldsMixin, ImageVariantsMixin, serializers.ModelSerializer):
+    # pet_type is nested by default; ?expand= without it returns just the id
+    expandable_fields = {'pet_type': (PetTypeSerializer, {})}
+    default_expand = ('pet_type',)
     pet_type_id = serializers.UUIDField(write_only=True, required=True) # For writing (creating/updating)
+    image_field = 'photo' # Thumbnails come from Pet.photo_variants (see ImageVariantsMixin)
 
     class Meta:
         model = Pet
         fields = [
             'id', 'user', 'name', 'age', 'pet_type', 'pet_type_id', 'animal_breed',
-            'description', 'photo', 'created_at', 'updated_at'
+            'description', 'photo', 'variants', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'user', 'created_at', 'updated_at'] # 'user' is assigned by view
 
+    def validate_pet_type_id(self, value):
+        # Served from the in-process lookup cache (backend/lookups.py), no query per pet
+        try:
+            PetType.lookups.by_id(value)
+        except PetType.DoesNotExist:
+            raise serializers.ValidationError("Invalid pet type ID.")
+        return value
+
     def create(self, validated_data):
         pet_type_id = validated_data.pop('pet_type_id')
         try:
-            pet_type = PetType.objects.get(id=pet_type_id)
+            pet_type = PetType.lookups.by_id(pet_type_id)
         except PetType.DoesNotExist:
             raise serializers.ValidationError({"pet_type_id": "Invalid pet type ID."})
 
@@ -38,7 +52,7 @@ class PetSerializer(serializers.ModelSerializer):
         pet_type_id = validated_data.pop('pet_type_id', None)
         if pet_type_id:
             try:
-                pet_type = PetType.objects.get(id=pet_type_id)
+                pet_type = PetType.lookups.by_id(pet_type_id)
                 instance.pet_type = pet_type
             except PetType.DoesNotExist:
                 raise serializers.ValidationError({"pet_type_id": "Invalid pet type ID."})
@@ -47,4 +61,13 @@ class PetSerializer(serializers.ModelSerializer):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
         instance.save() # The custom save method in Pet model will handle photo optimization
-        return instance
\ No newline at end of file
+        return instance
+
+# Serializer for the admin pet-count listing (reads the denormalized User.pet_count)
+class UserPetCountSerializer(serializers.ModelSerializer):
+    user_id = serializers.UUIDField(source='id', read_only=True)
+
+    class Meta:
+        model = User
+        fields = ['user_id', 'username', 'email', 'pet_count']
+        read_only_fields = fields
@@ -0,0 +1,20 @@
+# pets/signals.py
+from django.db.models import F
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from images.blobs import release_blob
+from users.models import User
+from .models import Pet
+
+
+@receiver(post_delete, sender=Pet)
+def decrement_user_pet_count(sender, instance, **kwargs):
+    # post_delete también se dispara en borrados en cascada y en QuerySet.delete(),
+    # y corre dentro de la transacción del borrado.
+    User.objects.filter(pk=instance.user_id, pet_count__gt=0).update(pet_count=F('pet_count') - 1)
+
+
+@receiver(post_delete, sender=Pet)
+def release_pet_photo_blob(sender, instance, **kwargs):
+    release_blob(instance.photo_blob_id)
@@ -1,3 +1,183 @@
-from django.test import TestCase
+import csv
+import hashlib
+import io
+import json
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from images.blobs import store_blob
+from images.models import ImageBlob
+from users.models import User
+from .models import Pet, PetType
+
+
+class PetCountTests(TestCase):
+    """User.pet_count is kept in step with the pets table (Pet.save and pets/signals.py)."""
+
+    def setUp(self):
+        self.pet_type = PetType.objects.create(name='Dog')
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='x')
+        self.other = User.objects.create_user(username='other', email='other@example.com', password='x')
+
+    def _create_pets(self, user, count):
+        return [
+            Pet.objects.create(user=user, name=f'pet{index}', age=1, pet_type=self.pet_type, animal_breed='mixed')
+            for index in range(count)
+        ]
+
+    def _pet_count(self, user):
+        user.refresh_from_db(fields=['pet_count'])
+        return user.pet_count
+
+    def test_create_increments(self):
+        self._create_pets(self.owner, 3)
+        self.assertEqual(self._pet_count(self.owner), 3)
+
+    def test_queryset_delete_decrements(self):
+        pets = self._create_pets(self.owner, 3)
+        Pet.objects.filter(pk__in=[pet.pk for pet in pets[:2]]).delete()
+        self.assertEqual(self._pet_count(self.owner), 1)
+
+    def test_owner_change_moves_count(self):
+        pet = self._create_pets(self.owner, 2)[0]
+        pet = Pet.objects.get(pk=pet.pk)
+        pet.user = self.other
+        pet.save()
+        self.assertEqual(self._pet_count(self.owner), 1)
+        self.assertEqual(self._pet_count(self.other), 1)
+
+    def test_count_never_goes_negative(self):
+        pet = self._create_pets(self.owner, 1)[0]
+        User.objects.filter(pk=self.owner.pk).update(pet_count=0) # Simulated drift
+        pet.delete()
+        self.assertEqual(self._pet_count(self.owner), 0)
+
+
+class PhotoBlobTests(TestCase):
+    """Pet photos share content-addressed blobs (images/blobs.py); ref_count tracks the pets using one."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='x')
+        self.content = b'same photo bytes'
+        # As if the image worker had already optimized this content
+        self.blob = store_blob(hashlib.sha256(self.content).hexdigest(), b'webp', {}, '')
+
+    def _upload(self):
+        return SimpleUploadedFile('photo.jpg', self.content, content_type='image/jpeg')
+
+    def test_reupload_same_photo_then_delete_frees_blob(self):
+        pet = Pet.objects.create(user=self.owner, name='Rex', age=1, animal_breed='mixed', photo=self._upload())
+        self.assertEqual(pet.photo_blob_id, self.blob.pk)
+        pet.photo = self._upload()
+        pet.save()
+        self.blob.refresh_from_db()
+        self.assertEqual(self.blob.ref_count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            pet.delete()
+        self.assertFalse(ImageBlob.objects.filter(pk=self.blob.pk).exists())
+        self.assertFalse(default_storage.exists(self.blob.name))
+
+    def test_blob_shared_by_two_pets_survives_one_delete(self):
+        first, second = [
+            Pet.objects.create(user=self.owner, name=name, age=1, animal_breed='mixed', photo=self._upload())
+            for name in ('Rex', 'Max')
+        ]
+        first.delete()
+        self.blob.refresh_from_db()
+        self.assertEqual(self.blob.ref_count, 1)
+        self.assertEqual(Pet.objects.get(pk=second.pk).photo.name, self.blob.name)
+
+
+class PetExportTests(TestCase):
+    """Streaming exports from GET /api/admin/all-pets/?format=ndjson|csv."""
+
+    def setUp(self):
+        pet_type = PetType.objects.create(name='Dog')
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='x')
+        self.pets = [
+            Pet.objects.create(user=self.owner, name=f'pet{index}', age=index, pet_type=pet_type, animal_breed='mixed')
+            for index in range(3)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_superuser(username='admin', email='admin@example.com', password='x')
+        )
+
+    def _body(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8')
+
+    def test_ndjson_streams_one_pet_per_line(self):
+        response = self.client.get('/api/admin/all-pets/', {'format': 'ndjson'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        rows = [json.loads(line) for line in self._body(response).splitlines()]
+        self.assertEqual([row['id'] for row in rows], [str(pet.pk) for pet in self.pets])
+        self.assertEqual(rows[0]['pet_type']['name'], 'Dog')
+
+    def test_csv_has_header_and_owner_columns(self):
+        response = self.client.get('/api/admin/all-pets/', {'format': 'csv'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('filename="pets.csv"', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(self._body(response))))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual((rows[0]['name'], rows[0]['pet_type'], rows[0]['username']), ('pet0', 'Dog', 'owner'))
+
+    def test_rejects_non_admins_and_unknown_formats(self):
+        self.assertEqual(self.client.get('/api/admin/all-pets/', {'format': 'xml'}).status_code, 404)
+        self.client.force_authenticate(self.owner)
+        response = self.client.get('/api/admin/all-pets/', {'format': 'csv'})
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(response.streaming)
+
+
+class BatchRegistrationTests(TestCase):
+    """POST /api/pets/batch/ (pets/batch.py)."""
+
+    def setUp(self):
+        self.pet_type = PetType.objects.create(name='Dog')
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def _item(self, name, **overrides):
+        return {'name': name, 'age': 2, 'pet_type_id': str(self.pet_type.pk), 'animal_breed': 'mixed', **overrides}
+
+    def _post(self, items):
+        return self.client.post('/api/pets/batch/', items, format='json')
+
+    def test_creates_all_and_updates_pet_count(self):
+        response = self._post([self._item('Rex'), self._item('Max')])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['created'], response.data['failed']), (2, 0))
+        self.assertEqual([result['pet']['name'] for result in response.data['results']], ['Rex', 'Max'])
+        self.owner.refresh_from_db(fields=['pet_count'])
+        self.assertEqual(self.owner.pet_count, 2)
+
+    def test_partial_success_reports_each_item(self):
+        unknown_type = '00000000-0000-0000-0000-000000000000'
+        response = self._post([self._item('Rex'), self._item('Max', pet_type_id=unknown_type), 'not a pet'])
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([result['status'] for result in response.data['results']], ['created', 'error', 'error'])
+        self.assertIn('pet_type_id', response.data['results'][1]['errors'])
+        self.assertEqual(Pet.objects.filter(user=self.owner).count(), 1)
+
+    def test_rejects_empty_oversized_and_all_invalid(self):
+        self.assertEqual(self._post([]).status_code, 400)
+        with self.settings(PETS_BATCH_MAX_SIZE=2):
+            self.assertEqual(self._post([self._item(f'pet{index}') for index in range(3)]).status_code, 400)
+        response = self._post([self._item('Rex', age='old')])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['created'], 0)
+        self.assertFalse(Pet.objects.exists())
+        self.owner.refresh_from_db(fields=['pet_count'])
+        self.assertEqual(self.owner.pet_count, 0)
@@ -1,11 +1,21 @@
 # pets/views.py
+import json
 from rest_framework import viewsets, status, generics
+from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser, MultiPartParser
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from .models import *
 from .serializers import *
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from django.db.models import Count
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from backend.pagination import KeysetPagination
+from backend.serializers import requested_expand
+from .batch import create_pets
+from .exports import NDJSONRenderer, CSVRenderer, iter_csv, iter_ndjson
 
 class PetTypeViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -25,7 +35,8 @@ class PetViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         # Ensure a user can only see, edit, or delete their own pets
-        return Pet.objects.filter(user=self.request.user).select_related('pet_type')
+        related = PetSerializer.select_related_for(requested_expand(self.request))
+        return Pet.objects.filter(user=self.request.user).select_related(*related)
 
     def perform_create(self, serializer):
         # Assign the authenticated user as the owner of the pet
@@ -49,36 +60,102 @@ class PetViewSet(viewsets.ModelViewSet):
         self.perform_destroy(instance)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser, MultiPartParser])
+    def batch(self, request):
+        """
+        Registers several pets at once. Accepts a JSON list of pets, or multipart with
+        a 'pets' field (JSON list) and optional files 'photo_<index>'. Valid items are
+        created even if others fail; the response has one result per item
+        (201 if all were created, 207 if only some, 400 if none).
+        """
+        if isinstance(request.data, list):
+            items, photos = request.data, {}
+        else:
+            try:
+                items = json.loads(request.data.get('pets', ''))
+            except ValueError:
+                return Response({"pets": ["Must be a JSON list of pets."]}, status=status.HTTP_400_BAD_REQUEST)
+            photos = {
+                int(key[len('photo_'):]): upload
+                for key, upload in request.FILES.items()
+                if key.startswith('photo_') and key[len('photo_'):].isdigit()
+            }
+
+        if not isinstance(items, list) or not items:
+            return Response({"pets": ["Must be a non-empty list of pets."]}, status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > settings.PETS_BATCH_MAX_SIZE:
+            return Response({"pets": [f"At most {settings.PETS_BATCH_MAX_SIZE} pets per request."]},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        results, created = create_pets(request.user, items, photos, self.get_serializer_context())
+        if created == len(items):
+            response_status = status.HTTP_201_CREATED
+        elif created:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        return Response({'created': created, 'failed': len(items) - created, 'results': results},
+                        status=response_status)
+
+class UserPetCountPagination(KeysetPagination):
+    page_size = 50
+    ordering = ('username', 'id')
+
+
 class UserPetCountView(generics.ListAPIView):
     """
     API endpoint para que los administradores vean cuántas mascotas tiene cada usuario.
+    Lee el contador desnormalizado User.pet_count, así que cuesta O(página) y no O(mascotas).
+    Paginado por cursor; ordenable con ?ordering=pet_count|-pet_count|username|-username.
     """
-    # Agrupa por usuario y cuenta las mascotas.
-    queryset = (
-        Pet.objects.values("user__id", "user__username", "user__email") # Incluimos email también
-        .annotate(pet_count=Count("id"))
-        .order_by("user__username")
-    )
+    serializer_class = UserPetCountSerializer
+    pagination_class = UserPetCountPagination
     permission_classes = [IsAdminUser] # Solo administradores pueden acceder
+    ordering_options = {
+        'username': ('username', 'id'),
+        '-username': ('-username', '-id'),
+        'pet_count': ('pet_count', 'id'),
+        '-pet_count': ('-pet_count', '-id'),
+    }
 
-    def list(self, request, *args, **kwargs):
-        # Formatea la respuesta para que sea más clara
-        data = [
-            {
-                "user_id": item["user__id"],
-                "username": item["user__username"],
-                "email": item["user__email"], # Añadimos email
-                "pet_count": item["pet_count"],
-            }
-            for item in self.get_queryset()
-        ]
-        return Response(data)
+    def get_queryset(self):
+        ordering = self.request.query_params.get('ordering', 'username')
+        if ordering not in self.ordering_options:
+            raise ValidationError({"ordering": f"Use uno de: {', '.join(self.ordering_options)}."})
+        self.keyset_ordering = self.ordering_options[ordering]
+        return User.objects.filter(pet_count__gt=0).only('id', 'username', 'email', 'pet_count')
 
 class AllPetsListView(generics.ListAPIView):
     """
     API endpoint para que los administradores vean una lista de todas las mascotas registradas.
+    Con ?format=ndjson o ?format=csv devuelve una exportación en streaming: las filas se leen
+    por bloques con .iterator(), así la memoria no crece con el tamaño de la tabla.
     """
-    # Incluye al usuario y el tipo de mascota relacionado para evitar N+1 queries.
-    queryset = Pet.objects.all().select_related("user", "pet_type")
     serializer_class = PetSerializer # Reutilizamos el PetSerializer para mostrar los detalles de la mascota
     permission_classes = [IsAdminUser] # Solo administradores pueden acceder
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer, CSVRenderer]
+
+    def get_queryset(self):
+        # Only join what gets serialized: the expanded relations, or owner and type for the CSV columns
+        if self.request.accepted_renderer.format == 'csv':
+            related = ['user', 'pet_type']
+        else:
+            related = PetSerializer.select_related_for(requested_expand(self.request))
+        return Pet.objects.all().select_related(*related)
+
+    def list(self, request, *args, **kwargs):
+        export_format = request.accepted_renderer.format
+        if export_format not in ('ndjson', 'csv'):
+            return super().list(request, *args, **kwargs)
+
+        pets = self.get_queryset().order_by('created_at', 'id').iterator(chunk_size=settings.PETS_EXPORT_CHUNK_SIZE)
+        if export_format == 'ndjson':
+            rows = iter_ndjson(pets, self.get_serializer_class(), self.get_serializer_context())
+            content_type = 'application/x-ndjson'
+        else:
+            rows = iter_csv(pets, request)
+            content_type = 'text/csv'
+
+        response = StreamingHttpResponse(rows, content_type=f'{content_type}; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="pets.{export_format}"'
+        return response
@@ -0,0 +1,12 @@
+# reservations/management/commands/backfill_reservation_rollups.py
+from django.core.management.base import BaseCommand
+
+from reservations.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = "Recalcula los agregados de analíticas (ReservationDailyRollup) desde la tabla de reservas."
+
+    def handle(self, *args, **options):
+        groups = rebuild_rollups()
+        self.stdout.write(self.style.SUCCESS(f"Agregados recalculados: {groups} grupos."))
@@ -0,0 +1,87 @@
+# reservations/management/commands/bench_reservation_overlap.py
+import random
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from pets.models import Pet
+from reservations.models import Reservation
+from reservations.overlaps import overlapping
+from users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide la comprobación de cruces de reservas (reservations/overlaps.py) sobre un historial "
+        "sintético. Los datos se crean dentro de una transacción que se revierte al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reservations', type=int, default=1_000_000)
+        parser.add_argument('--history', type=int, default=50, help="Reservas pasadas por mascota.")
+        parser.add_argument('--long-history', type=int, default=20_000, help="Reservas de una mascota muy antigua.")
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        with transaction.atomic():
+            pets, veteran = self._populate(rng, options['reservations'], options['history'], options['long_history'])
+            today = date.today()
+            queries = options['queries']
+
+            stays = [(rng.choice(pets), today + timedelta(days=rng.randint(1, 60))) for _ in range(queries)]
+            self._report('mascota típica, sin cruce', [(pet, start, start + timedelta(days=3)) for pet, start in stays])
+            self._report('mascota antigua, sin cruce', [
+                (veteran, start, start + timedelta(days=3)) for _, start in stays
+            ])
+            # Fechas dentro del historial: la consulta encuentra un cruce
+            self._report('mascota típica, con cruce', [
+                (pet, today - timedelta(days=rng.randint(10, 100)), today - timedelta(days=5)) for pet, _ in stays
+            ])
+
+            pet, start = stays[0]
+            self.stdout.write("\nPlan de la consulta:")
+            self.stdout.write(overlapping(pet, start, start + timedelta(days=3)).explain())
+            transaction.set_rollback(True)
+
+    def _populate(self, rng, count, history, long_history):
+        tag = uuid.uuid4().hex[:12]
+        owner = User.objects.create_user(username=f'bench-{tag}', email=f'bench-{tag}@example.com')
+        pet_count = max((count - long_history) // history, 1)
+        self.stdout.write(f"Creando {pet_count + 1} mascotas y ~{count} reservas pasadas...")
+        pets = Pet.objects.bulk_create(
+            [Pet(user=owner, name=f'bench{index}', age=1, animal_breed='mestizo') for index in range(pet_count + 1)],
+            batch_size=5000,
+        )
+        started = time.perf_counter()
+        batch = []
+        for index, pet in enumerate(pets):
+            # Estancias consecutivas hacia atrás desde ayer, sin cruces entre sí
+            end = date.today() - timedelta(days=1)
+            for _ in range(long_history if index == 0 else history):
+                start = end - timedelta(days=rng.randint(0, 6))
+                batch.append(Reservation(pet=pet, start_date=start, end_date=end))
+                end = start - timedelta(days=rng.randint(1, 10))
+                if len(batch) == 5000:
+                    Reservation.objects.bulk_create(batch)
+                    batch = []
+        Reservation.objects.bulk_create(batch)
+        self.stdout.write(f"Datos creados en {time.perf_counter() - started:.2f}s")
+        return [pet.pk for pet in pets[1:]], pets[0].pk
+
+    def _report(self, label, stays):
+        timings = []
+        for pet_id, start, end in stays:
+            started = time.perf_counter()
+            # La misma consulta que check_overlap()
+            list(overlapping(pet_id, start, end).values_list('id', 'start_date', 'end_date')[:5])
+            timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(
+            f"  {label:<28} mediana {statistics.median(timings):8.3f} ms   "
+            f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:8.3f} ms"
+        )
@@ -0,0 +1,25 @@
+# reservations/management/commands/check_reservation_rollups.py
+from django.core.management.base import BaseCommand, CommandError
+
+from reservations.rollups import find_mismatches
+
+
+class Command(BaseCommand):
+    help = "Compara los agregados de analíticas con un conteo directo sobre la tabla de reservas."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=50, help="Máximo de diferencias a listar.")
+
+    def handle(self, *args, **options):
+        mismatches = find_mismatches()
+        for (day, pet_id, user_id, status_id), stored, expected in mismatches[:options['limit']]:
+            self.stdout.write(
+                f"{day} mascota={pet_id} usuario={user_id} estado={status_id}: "
+                f"rollup {stored}, real {expected}"
+            )
+        if mismatches:
+            # Código de salida distinto de cero para poder usarlo en cron/CI
+            raise CommandError(
+                f"{len(mismatches)} grupos desviados. Ejecute 'manage.py backfill_reservation_rollups'."
+            )
+        self.stdout.write(self.style.SUCCESS("Los agregados coinciden con la tabla de reservas."))
@@ -0,0 +1,12 @@
+# reservations/management/commands/rebuild_occupancy.py
+from django.core.management.base import BaseCommand
+
+from reservations.occupancy import rebuild_occupancy
+
+
+class Command(BaseCommand):
+    help = "Recalcula la tabla de ocupación diaria (DailyOccupancy) desde las reservas."
+
+    def handle(self, *args, **options):
+        days = rebuild_occupancy()
+        self.stdout.write(self.style.SUCCESS(f"Ocupación recalculada: {days} días con reservas activas."))
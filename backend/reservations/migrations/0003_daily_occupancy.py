@@ -0,0 +1,42 @@
+# Generated by Django 5.2 on 2026-10-17 17:51
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_occupancy(apps, schema_editor):
+    Reservation = apps.get_model('reservations', 'Reservation')
+    DailyOccupancy = apps.get_model('reservations', 'DailyOccupancy')
+    counts = {}
+    reservations = Reservation.objects.exclude(status__name__in=settings.RESERVATION_INACTIVE_STATUSES)
+    for start, end in reservations.values_list('start_date', 'end_date').iterator(chunk_size=5000):
+        for offset in range((end - start).days + 1):
+            day = start + timedelta(days=offset)
+            counts[day] = counts.get(day, 0) + 1
+    DailyOccupancy.objects.bulk_create(
+        [DailyOccupancy(day=day, booked=booked) for day, booked in counts.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservations', '0002_alter_reservation_options_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyOccupancy',
+            fields=[
+                ('day', models.DateField(primary_key=True, serialize=False)),
+                ('booked', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Daily Occupancy',
+            },
+        ),
+        migrations.RunPython(backfill_occupancy, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2 on 2026-10-17 17:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F
+
+
+def backfill_rollups(apps, schema_editor):
+    Reservation = apps.get_model('reservations', 'Reservation')
+    ReservationDailyRollup = apps.get_model('reservations', 'ReservationDailyRollup')
+    groups = (
+        Reservation.objects.order_by()
+        .values('start_date', 'pet_id', 'status_id', user_id=F('pet__user_id'))
+        .annotate(total=Count('id'))
+    )
+    ReservationDailyRollup.objects.bulk_create(
+        [
+            ReservationDailyRollup(
+                day=row['start_date'], pet_id=row['pet_id'], user_id=row['user_id'],
+                status_id=row['status_id'], count=row['total'],
+            )
+            for row in groups.iterator(chunk_size=5000)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pets', '0009_pet_photo_blob'),
+        ('reservations', '0003_daily_occupancy'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReservationDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('count', models.IntegerField(default=0)),
+                ('pet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='pets.pet')),
+                ('status', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='reservations.reservationstatus')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'pet', 'user', 'status'), name='reservations_rollup_key')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
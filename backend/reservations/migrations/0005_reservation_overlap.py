@@ -0,0 +1,55 @@
+# Generated by Django 5.2 on 2026-10-17 17:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Ninguna mascota puede tener dos reservas activas que compartan un día (fechas inclusivas).
+# Falla si ya existen cruces: hay que cancelar o corregir esas reservas antes de migrar.
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    "ALTER TABLE reservations_reservation ADD CONSTRAINT reservations_no_overlap "
+    "EXCLUDE USING gist (pet_id WITH =, daterange(start_date, end_date, '[]') WITH &&) WHERE (is_active)",
+]
+POSTGRES_REVERSE = [
+    "ALTER TABLE reservations_reservation DROP CONSTRAINT IF EXISTS reservations_no_overlap",
+]
+
+
+def backfill_is_active(apps, schema_editor):
+    Reservation = apps.get_model('reservations', 'Reservation')
+    Reservation.objects.filter(status__name__in=settings.RESERVATION_INACTIVE_STATUSES).update(is_active=False)
+
+
+def create_overlap_constraint(apps, schema_editor):
+    # En SQLite la comprobación de reservations/overlaps.py corre con las escrituras serializadas
+    if schema_editor.connection.vendor == 'postgresql':
+        for sql in POSTGRES_FORWARD:
+            schema_editor.execute(sql)
+
+
+def drop_overlap_constraint(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for sql in POSTGRES_REVERSE:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pets', '0009_pet_photo_blob'),
+        ('reservations', '0004_reservation_daily_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reservation',
+            name='is_active',
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.RunPython(backfill_is_active, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['pet', 'end_date', 'start_date'], name='reservations_pet_dates_idx'),
+        ),
+        migrations.RunPython(create_overlap_constraint, drop_overlap_constraint),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-17 18:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pets', '0009_pet_photo_blob'),
+        ('reservations', '0005_reservation_overlap'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['start_date', 'created_at', 'id'], name='reservations_start_keyset_idx'),
+        ),
+    ]
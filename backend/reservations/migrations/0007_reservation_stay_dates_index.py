@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-17 18:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pets', '0009_pet_photo_blob'),
+        ('reservations', '0006_reservation_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['end_date', 'start_date'], name='reservations_stay_dates_idx'),
+        ),
+    ]
@@ -1,11 +1,17 @@
 import uuid
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from backend.lookups import LookupManager
 from pets.models import Pet
+from users.models import User
+from payments.fields import PaymentsRelation
 
 class ReservationStatus(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=30, unique=True)
 
+    objects = models.Manager()
+    lookups = LookupManager()
+
     class Meta:
         verbose_name_plural = "Reservation Statuses"
 
@@ -19,12 +25,98 @@ class Reservation(models.Model):
     start_date = models.DateField()
     end_date = models.DateField()
     observations = models.TextField(blank=True)
+    # Copia de "estado no en RESERVATION_INACTIVE_STATUSES", para el índice y la restricción de cruces
+    is_active = models.BooleanField(default=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    payments = PaymentsRelation() # Sin columna: pagos que apuntan a esta reserva
 
     class Meta:
         ordering = ['start_date', 'created_at'] 
+        indexes = [
+            # Cruces de fechas por mascota (overlaps.py): end_date primero para saltar el historial
+            models.Index(fields=['pet', 'end_date', 'start_date'], name='reservations_pet_dates_idx'),
+            # Paginación por cursor del listado (views.ReservationPagination)
+            models.Index(fields=['start_date', 'created_at', 'id'], name='reservations_start_keyset_idx'),
+            # ?active_on= y ?stays_from=: end_date primero, así el rango salta las estancias ya
+            # terminadas (con start_date primero se leería todo el historial anterior); ver
+            # views._ending_on_or_after
+            models.Index(fields=['end_date', 'start_date'], name='reservations_stay_dates_idx'),
+        ]
 
     def __str__(self):
         return f"Reserva para {self.pet.name} ({self.start_date} a {self.end_date}) - {self.status.name if self.status else 'Sin Estado'}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Estado al cargar, para aplicar solo la diferencia en save() (occupancy.py, rollups.py)
+        if all(name in instance.__dict__ for name in ('pet_id', 'status_id', 'start_date', 'end_date')):
+            instance._loaded_state = instance.tracked_state()
+        return instance
+
+    def tracked_state(self):
+        return {
+            'pet_id': self.pet_id,
+            'status_id': self.status_id,
+            'start_date': self.start_date,
+            'end_date': self.end_date,
+        }
+
+    def save(self, *args, **kwargs):
+        from .occupancy import apply_occupancy, is_active_status
+        from .overlaps import OVERLAP_CONSTRAINT, ReservationOverlap, check_overlap
+        from .rollups import apply_rollup
+
+        previous = None
+        if not self._state.adding:
+            previous = getattr(self, '_loaded_state', None)
+            if previous is None:
+                stored = Reservation.objects.filter(pk=self.pk).first()
+                previous = stored.tracked_state() if stored else None
+        self.is_active = is_active_status(self.status_id)
+        with transaction.atomic():
+            # Lanza ReservationOverlap si la mascota ya tiene otra reserva activa en esas fechas
+            check_overlap(self, previous)
+            try:
+                super().save(*args, **kwargs)
+            except IntegrityError as e:
+                if OVERLAP_CONSTRAINT in str(e):
+                    raise ReservationOverlap() from e
+                raise
+            # Lanza CapacityExceeded si algún día nuevo no tiene cupo; se revierte todo el save
+            apply_occupancy(previous, self.tracked_state())
+            apply_rollup(previous, self.tracked_state())
+        self._loaded_state = self.tracked_state()
+
+
+class DailyOccupancy(models.Model):
+    """Reservas activas por día (mantenida desde Reservation.save y reservations/signals.py)."""
+    day = models.DateField(primary_key=True)
+    booked = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "Daily Occupancy"
+
+    def __str__(self):
+        return f"{self.day}: {self.booked}"
+
+
+class ReservationDailyRollup(models.Model):
+    """
+    Reservas por (día de inicio, mascota, dueño, estado) para las analíticas
+    (reservations/rollups.py). Se actualiza de forma incremental.
+    """
+    day = models.DateField()
+    pet = models.ForeignKey(Pet, on_delete=models.CASCADE, related_name='+')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
+    status = models.ForeignKey(ReservationStatus, on_delete=models.SET_NULL, null=True, related_name='+')
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'pet', 'user', 'status'], name='reservations_rollup_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.pet_id}: {self.count}"
@@ -0,0 +1,137 @@
+# reservations/occupancy.py
+"""
+Ocupación diaria del hotel de mascotas.
+
+DailyOccupancy guarda cuántas reservas activas cubren cada día, así que saber
+el cupo libre de un rango cuesta O(días) y no O(reservas). La tabla se mantiene
+desde Reservation.save y la señal post_delete, y se puede recalcular con
+`manage.py rebuild_occupancy`. Una reserva ocupa todos los días de start_date a
+end_date (ambos incluidos) mientras su estado no esté en
+RESERVATION_INACTIVE_STATUSES.
+"""
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+
+from .models import DailyOccupancy, Reservation, ReservationStatus
+
+
+class CapacityExceeded(Exception):
+    def __init__(self, days):
+        self.days = sorted(days)
+        super().__init__(
+            "No hay cupo disponible para: " + ', '.join(day.isoformat() for day in self.days)
+        )
+
+
+def date_range(start, end):
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def is_active_status(status_id):
+    if status_id is None:
+        return True
+    try:
+        name = ReservationStatus.lookups.by_id(status_id).name
+    except ReservationStatus.DoesNotExist:
+        return True
+    return name not in settings.RESERVATION_INACTIVE_STATUSES
+
+
+def occupied_days(state):
+    """Días que ocupa una reserva según su estado (ver Reservation.tracked_state)."""
+    if state is None or not is_active_status(state['status_id']):
+        return set()
+    return set(date_range(state['start_date'], state['end_date']))
+
+
+def _by_count(counts):
+    """{día: n} -> {n: [días]}, para hacer un UPDATE por cada cantidad distinta."""
+    groups = defaultdict(list)
+    for day, count in counts.items():
+        if count > 0:
+            groups[count].append(day)
+    return sorted((count, sorted(days)) for count, days in groups.items())
+
+
+def book_days(days, capacity=None):
+    """
+    Suma reservas a cada día de `days` (días, o Counter {día: n}) con un UPDATE
+    condicional por cantidad (`booked + n <= capacidad`). Si algún día no tiene
+    cupo lanza CapacityExceeded; el llamador debe estar en una transacción para
+    que se revierta todo.
+    """
+    counts = Counter(days)
+    if not counts:
+        return
+    capacity = settings.KENNEL_CAPACITY if capacity is None else capacity
+    DailyOccupancy.objects.bulk_create([DailyOccupancy(day=day) for day in sorted(counts)], ignore_conflicts=True)
+    for count, group in _by_count(counts):
+        try:
+            # Savepoint: si falla, se deshace antes de consultar qué días están llenos
+            with transaction.atomic():
+                updated = DailyOccupancy.objects.filter(
+                    day__in=group, booked__lte=capacity - count
+                ).update(booked=F('booked') + count)
+                if updated != len(group):
+                    raise CapacityExceeded(group)
+        except CapacityExceeded:
+            full = DailyOccupancy.objects.filter(day__in=group, booked__gt=capacity - count)
+            raise CapacityExceeded(full.values_list('day', flat=True))
+
+
+def release_days(days):
+    for count, group in _by_count(Counter(days)):
+        DailyOccupancy.objects.filter(day__in=group, booked__gte=count).update(booked=F('booked') - count)
+
+
+def apply_occupancy_changes(changes):
+    """Aplica varios cambios (estado anterior, estado nuevo) de una vez; None si la reserva no existe."""
+    delta = Counter()
+    for previous, current in changes:
+        delta.subtract(occupied_days(previous))
+        delta.update(occupied_days(current))
+    release_days({day: -count for day, count in delta.items() if count < 0})
+    book_days({day: count for day, count in delta.items() if count > 0})
+
+
+def apply_occupancy(previous, current):
+    """Aplica el cambio de una reserva (estado anterior -> nuevo; None si no existe)."""
+    apply_occupancy_changes([(previous, current)])
+
+
+def get_availability(start, end, capacity=None):
+    capacity = settings.KENNEL_CAPACITY if capacity is None else capacity
+    booked = dict(
+        DailyOccupancy.objects.filter(day__gte=start, day__lte=end).values_list('day', 'booked')
+    )
+    return [
+        {
+            'date': day,
+            'booked': booked.get(day, 0),
+            'capacity': capacity,
+            'available': max(capacity - booked.get(day, 0), 0),
+        }
+        for day in date_range(start, end)
+    ]
+
+
+def rebuild_occupancy():
+    """Recalcula la tabla completa desde las reservas. Devuelve el número de días ocupados."""
+    counts = {}
+    reservations = Reservation.objects.values_list('status_id', 'start_date', 'end_date')
+    for status_id, start, end in reservations.iterator(chunk_size=5000):
+        if is_active_status(status_id):
+            for day in date_range(start, end):
+                counts[day] = counts.get(day, 0) + 1
+
+    with transaction.atomic():
+        DailyOccupancy.objects.all().delete()
+        DailyOccupancy.objects.bulk_create(
+            [DailyOccupancy(day=day, booked=booked) for day, booked in counts.items()],
+            batch_size=1000,
+        )
+    return len(counts)
@@ -0,0 +1,87 @@
+# reservations/overlaps.py
+"""
+Una mascota no puede tener dos reservas activas con días en común.
+
+Reservation.save comprueba el cruce dentro de su transacción con una consulta
+sobre el índice (pet, end_date, start_date): solo se leen las reservas de la
+mascota que terminan después del nuevo inicio, no su historial completo. En
+SQLite, transaction_mode IMMEDIATE serializa las escrituras, así que entre la
+comprobación y el INSERT no se puede colar otra reserva. En PostgreSQL la
+restricción EXCLUDE `reservations_no_overlap` (migración 0005) lo garantiza
+además en la base de datos; en motores con SELECT ... FOR UPDATE se bloquea
+la fila de la mascota antes de comprobar.
+"""
+from django.db import connection
+
+from pets.models import Pet
+from .models import Reservation
+from .occupancy import is_active_status
+
+OVERLAP_CONSTRAINT = 'reservations_no_overlap'
+
+
+class ReservationOverlap(Exception):
+    def __init__(self, conflicts=()):
+        self.conflicts = list(conflicts) # [(id, start_date, end_date)]
+        message = "La mascota ya tiene una reserva activa en esas fechas"
+        if self.conflicts:
+            message += " (" + ', '.join(
+                f"{start.isoformat()} a {end.isoformat()}" for _, start, end in self.conflicts
+            ) + ")"
+        super().__init__(message + ".")
+
+
+def overlapping(pet_id, start, end, exclude=None):
+    """Reservas activas de la mascota que comparten algún día con [start, end]."""
+    queryset = Reservation.objects.filter(
+        pet_id=pet_id, is_active=True, end_date__gte=start, start_date__lte=end
+    ).order_by('end_date') # El orden del índice: sin paso de ordenación aparte
+    if exclude is not None:
+        queryset = queryset.exclude(pk=exclude)
+    return queryset
+
+
+def _same_booking(previous, current):
+    return previous is not None and is_active_status(previous['status_id']) and all(
+        previous[field] == current[field] for field in ('pet_id', 'start_date', 'end_date')
+    )
+
+
+def check_overlap(reservation, previous):
+    """
+    Lanza ReservationOverlap si `reservation` (a punto de guardarse, con su
+    estado anterior `previous`) pisa otra reserva activa de la misma mascota.
+    Debe llamarse dentro de la transacción del save.
+    """
+    current = reservation.tracked_state()
+    if not reservation.is_active or _same_booking(previous, current):
+        return
+    if connection.features.has_select_for_update:
+        list(Pet.objects.select_for_update().filter(pk=reservation.pet_id).values_list('pk', flat=True))
+    conflicts = list(
+        overlapping(reservation.pet_id, reservation.start_date, reservation.end_date, exclude=reservation.pk)
+        .values_list('id', 'start_date', 'end_date')[:5]
+    )
+    if conflicts:
+        raise ReservationOverlap(conflicts)
+
+
+def overlaps(first, second):
+    return (
+        first['pet_id'] == second['pet_id']
+        and first['start_date'] <= second['end_date']
+        and second['start_date'] <= first['end_date']
+    )
+
+
+def active_near(rows):
+    """Reservas activas que podrían cruzarse con `rows` (dicts con pet_id y fechas), en una consulta."""
+    if not rows:
+        return []
+    return list(
+        Reservation.objects.filter(
+            pet_id__in={row['pet_id'] for row in rows}, is_active=True,
+            end_date__gte=min(row['start_date'] for row in rows),
+            start_date__lte=max(row['end_date'] for row in rows),
+        ).values('id', 'pet_id', 'start_date', 'end_date')
+    )
@@ -0,0 +1,126 @@
+# reservations/rollups.py
+"""
+Agregados incrementales para las analíticas de reservas.
+
+ReservationDailyRollup guarda cuántas reservas hay por (día de inicio, mascota,
+dueño, estado). Reservation.save y la señal post_delete suman o restan 1 a la
+fila afectada, así que /api/reservations/analytics/ agrega unas pocas filas por
+día en lugar de recorrer toda la tabla de reservas. Las claves usan el dueño
+actual de la mascota: al cambiar de dueño, sus filas pasan al nuevo
+(move_pet, desde la señal post_save de Pet), así que un cancelado o borrado
+posterior resta de la fila correcta. Los cambios de dueño hechos con
+QuerySet.update() no disparan señales: después de uno hay que correr
+`manage.py backfill_reservation_rollups`.
+"""
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from pets.models import Pet
+from .models import Reservation, ReservationDailyRollup
+
+
+def _group(state):
+    # end_date no forma parte de la clave: cambiarlo no toca el rollup
+    return state and (state['start_date'], state['pet_id'], state['status_id'])
+
+
+def _keys(states):
+    """(día, mascota, dueño, estado) de cada estado (None se conserva); una sola consulta para los dueños."""
+    pet_ids = {state['pet_id'] for state in states if state is not None}
+    owners = dict(Pet.objects.filter(id__in=pet_ids).values_list('id', 'user_id'))
+    return [
+        (state['start_date'], state['pet_id'], owners[state['pet_id']], state['status_id'])
+        if state is not None and state['pet_id'] in owners else None
+        for state in states
+    ]
+
+
+def _add(key, delta):
+    day, pet_id, user_id, status_id = key
+    rows = ReservationDailyRollup.objects.filter(day=day, pet_id=pet_id, user_id=user_id, status_id=status_id)
+    if rows.update(count=F('count') + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            ReservationDailyRollup.objects.create(
+                day=day, pet_id=pet_id, user_id=user_id, status_id=status_id, count=delta
+            )
+    except IntegrityError:
+        # Otra transacción creó la fila entretanto
+        rows.update(count=F('count') + delta)
+
+
+def apply_rollups(changes):
+    """Aplica una lista de cambios (estado anterior, estado nuevo); None si la reserva no existe."""
+    changes = [(previous, current) for previous, current in changes if _group(previous) != _group(current)]
+    if not changes:
+        return
+    deltas = Counter()
+    # Posiciones pares: estado anterior (resta); impares: estado nuevo (suma)
+    for index, key in enumerate(_keys([state for change in changes for state in change])):
+        if key is not None:
+            deltas[key] += 1 if index % 2 else -1
+    for key, delta in deltas.items():
+        if delta:
+            _add(key, delta)
+
+
+def apply_rollup(previous, current):
+    apply_rollups([(previous, current)])
+
+
+def move_pet(pet_id, user_id):
+    """Pasa las filas de la mascota a `user_id`, su dueño actual."""
+    rows = ReservationDailyRollup.objects.filter(pet_id=pet_id).exclude(user_id=user_id)
+    try:
+        with transaction.atomic():
+            rows.update(user_id=user_id)
+    except IntegrityError:
+        # Ya había filas con el dueño nuevo (p. ej. deriva anterior a esta corrección): se suman
+        for row in rows:
+            if row.count:
+                _add((row.day, pet_id, user_id, row.status_id), row.count)
+        rows.delete()
+
+
+def raw_counts():
+    """Los mismos grupos que el rollup, calculados desde la tabla de reservas."""
+    return (
+        Reservation.objects.order_by()
+        .values('start_date', 'pet_id', 'status_id', user_id=F('pet__user_id'))
+        .annotate(total=Count('id'))
+    )
+
+
+def rebuild_rollups():
+    rows = [
+        ReservationDailyRollup(
+            day=row['start_date'], pet_id=row['pet_id'], user_id=row['user_id'],
+            status_id=row['status_id'], count=row['total'],
+        )
+        for row in raw_counts().iterator(chunk_size=5000)
+    ]
+    with transaction.atomic():
+        ReservationDailyRollup.objects.all().delete()
+        ReservationDailyRollup.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def find_mismatches():
+    """Grupos cuyo contador difiere del conteo real: [(clave, rollup, real), ...]."""
+    expected = Counter({
+        (row['start_date'], row['pet_id'], row['user_id'], row['status_id']): row['total']
+        for row in raw_counts().iterator(chunk_size=5000)
+    })
+    stored = Counter()
+    for day, pet_id, user_id, status_id, count in (
+        ReservationDailyRollup.objects.values_list('day', 'pet_id', 'user_id', 'status_id', 'count').iterator(chunk_size=5000)
+    ):
+        stored[(day, pet_id, user_id, status_id)] += count
+    return [
+        (key, stored[key], expected[key])
+        for key in sorted(set(expected) | set(stored), key=str)
+        if stored[key] != expected[key]
+    ]
@@ -1,8 +1,13 @@
 # reservations/serializers.py
+from django.conf import settings
 from rest_framework import serializers
 from .models import Reservation, ReservationStatus
+from backend.serializers import DynamicFieldsMixin
 from pets.serializers import PetSerializer
 from pets.models import Pet # Necesario para Pet.DoesNotExist
+from payments.serializers import PaymentStatusField
+from .occupancy import CapacityExceeded
+from .overlaps import ReservationOverlap
 from datetime import date
 
 class ReservationStatusSerializer(serializers.ModelSerializer):
@@ -11,18 +16,22 @@ class ReservationStatusSerializer(serializers.ModelSerializer):
         fields = ['id', 'name']
         read_only_fields = ['id']
 
-class ReservationSerializer(serializers.ModelSerializer):
-    pet = PetSerializer(read_only=True)
-    status = ReservationStatusSerializer(read_only=True)
+class ReservationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    # 'pet' y 'status' salen como id salvo ?expand=pet,status (ver backend/serializers.py)
+    expandable_fields = {
+        'pet': (PetSerializer, {}),
+        'status': (ReservationStatusSerializer, {}),
+    }
 
     pet_id = serializers.UUIDField(write_only=True, required=True)
     status_id = serializers.UUIDField(write_only=True, required=False)
+    payment_status = PaymentStatusField() # Estado del último pago, o None
 
     class Meta:
         model = Reservation
         fields = [
             'id', 'pet', 'pet_id', 'status', 'status_id',
-            'start_date', 'end_date', 'observations',
+            'start_date', 'end_date', 'observations', 'payment_status',
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
@@ -50,22 +59,25 @@ class ReservationSerializer(serializers.ModelSerializer):
 
         if status_id:
             try:
-                status_obj = ReservationStatus.objects.get(id=status_id)
+                status_obj = ReservationStatus.lookups.by_id(status_id)
             except ReservationStatus.DoesNotExist:
                 raise serializers.ValidationError({"status_id": "Estado de reserva inválido."})
         else:
             try:
-                status_obj = ReservationStatus.objects.get(name='Pending')
+                status_obj = ReservationStatus.lookups.by_name('Pending')
             except ReservationStatus.DoesNotExist:
                 raise serializers.ValidationError(
                     "El estado 'Pending' no está configurado. Contacte al administrador."
                 )
 
-        reservation = Reservation.objects.create(
-            pet=pet,
-            status=status_obj,
-            **validated_data
-        )
+        try:
+            reservation = Reservation.objects.create(
+                pet=pet,
+                status=status_obj,
+                **validated_data
+            )
+        except (CapacityExceeded, ReservationOverlap) as e:
+            raise serializers.ValidationError(str(e))
         return reservation
 
     def update(self, instance, validated_data):
@@ -82,19 +94,34 @@ class ReservationSerializer(serializers.ModelSerializer):
 
         if status_id:
             try:
-                new_status = ReservationStatus.objects.get(id=status_id)
+                new_status = ReservationStatus.lookups.by_id(status_id)
                 instance.status = new_status
             except ReservationStatus.DoesNotExist:
                 raise serializers.ValidationError({"status_id": "Estado de reserva inválido."})
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
+        try:
+            instance.save()
+        except (CapacityExceeded, ReservationOverlap) as e:
+            raise serializers.ValidationError(str(e))
         return instance
 
+class ReservationBulkStatusSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.UUIDField(), allow_empty=False, max_length=settings.RESERVATION_BULK_MAX_SIZE
+    )
+    status = serializers.CharField() # Nombre del estado destino, p. ej. 'Confirmed'
+
+    def validate_status(self, value):
+        try:
+            return ReservationStatus.lookups.by_name(value)
+        except ReservationStatus.DoesNotExist:
+            raise serializers.ValidationError("Estado de reserva inválido.")
+
 # ¡NUEVA CLASE PARA EL SERIALIZER DE ANALÍTICAS!
 class ReservationCountSerializer(serializers.Serializer):
     # Estos campos mapearán a los alias usados en el método .values() en la vista
-    id = serializers.UUIDField(source='item_id')      # Mapea 'item_id' a 'id' en la salida
+    id = serializers.CharField(source='item_id', allow_null=True) # Mapea 'item_id' a 'id' (UUID, o el mes con by=month)
     name = serializers.CharField(source='item_name') # Mapea 'item_name' a 'name' en la salida
     total_reservations = serializers.IntegerField()
\ No newline at end of file
@@ -0,0 +1,24 @@
+# reservations/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from pets.models import Pet
+from .models import Reservation
+from .occupancy import apply_occupancy
+from .rollups import apply_rollup, move_pet
+
+
+@receiver(post_delete, sender=Reservation)
+def release_reservation(sender, instance, **kwargs):
+    # También cubre los borrados en cascada (p. ej. al eliminar la mascota)
+    previous = getattr(instance, '_loaded_state', None) or instance.tracked_state()
+    apply_occupancy(previous, None)
+    apply_rollup(previous, None)
+
+
+@receiver(post_save, sender=Pet)
+def move_pet_rollups(sender, instance, created, **kwargs):
+    # Pet.save conserva el dueño con el que se cargó en _loaded_user_id hasta terminar el save
+    previous_user_id = getattr(instance, '_loaded_user_id', None)
+    if not created and previous_user_id is not None and previous_user_id != instance.user_id:
+        move_pet(instance.pk, instance.user_id)
@@ -1,3 +1,313 @@
-from django.test import TestCase
+from datetime import date, timedelta
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from pets.models import Pet, PetType
+from users.models import User
+from .models import DailyOccupancy, Reservation, ReservationDailyRollup, ReservationStatus
+from .occupancy import CapacityExceeded, date_range
+from .overlaps import ReservationOverlap
+from .rollups import raw_counts
+from .transitions import OVERLAP, transition_reservations
+
+
+class ReservationTestCase(TestCase):
+    """Estados, un dueño y sus mascotas; las reservas empiezan dentro de una semana."""
+
+    def setUp(self):
+        # Crear los estados invalida la caché de ReservationStatus.lookups (backend/lookups.py)
+        for name in ('Pending', 'Confirmed', 'Cancelled', 'Completed'):
+            ReservationStatus.objects.create(name=name)
+        self.owner = User.objects.create_user(username='owner', email='owner@example.com', password='x')
+        pet_type = PetType.objects.create(name='Dog')
+        self.pets = [
+            Pet.objects.create(user=self.owner, name=f'pet{index}', age=1, pet_type=pet_type, animal_breed='mestizo')
+            for index in range(3)
+        ]
+        self.start = date.today() + timedelta(days=7)
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def status(self, name):
+        return ReservationStatus.lookups.by_name(name)
+
+    def reserve(self, pet, start=None, days=2, status='Pending'):
+        start = start or self.start
+        return Reservation.objects.create(
+            pet=pet, status=self.status(status), start_date=start, end_date=start + timedelta(days=days)
+        )
+
+
+@override_settings(KENNEL_CAPACITY=2)
+class CapacityTests(ReservationTestCase):
+    """Cupo diario del hotel (reservations/occupancy.py)."""
+
+    def booked(self, start, end):
+        booked = dict(DailyOccupancy.objects.filter(day__gte=start, day__lte=end).values_list('day', 'booked'))
+        return [booked.get(day, 0) for day in date_range(start, end)]
+
+    def test_rejects_when_full(self):
+        self.reserve(self.pets[0])
+        self.reserve(self.pets[1])
+        with self.assertRaises(CapacityExceeded) as raised:
+            self.reserve(self.pets[2], start=self.start + timedelta(days=1))
+        self.assertEqual(raised.exception.days, [self.start + timedelta(days=1), self.start + timedelta(days=2)])
+        # El intento rechazado no deja ni la reserva ni la ocupación
+        self.assertEqual(Reservation.objects.count(), 2)
+        self.assertEqual(self.booked(self.start, self.start + timedelta(days=3)), [2, 2, 2, 0])
+
+    def test_api_rejects_when_full(self):
+        self.reserve(self.pets[0])
+        self.reserve(self.pets[1])
+        response = self.client.post('/api/reservations/', {
+            'pet_id': str(self.pets[2].pk),
+            'start_date': self.start.isoformat(),
+            'end_date': self.start.isoformat(),
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('No hay cupo disponible', str(response.data))
+
+    def test_cancel_releases_days(self):
+        first = self.reserve(self.pets[0])
+        self.reserve(self.pets[1])
+        response = self.client.post(f'/api/reservations/{first.pk}/cancel/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.booked(self.start, self.start + timedelta(days=2)), [1, 1, 1])
+        # El día liberado se puede volver a reservar
+        self.reserve(self.pets[2])
+        self.assertEqual(self.booked(self.start, self.start + timedelta(days=2)), [2, 2, 2])
+
+    def test_delete_releases_days(self):
+        self.reserve(self.pets[0])
+        self.reserve(self.pets[1])
+        Reservation.objects.filter(pet=self.pets[0]).delete()
+        self.assertEqual(self.booked(self.start, self.start + timedelta(days=2)), [1, 1, 1])
+
+
+class RollupTests(ReservationTestCase):
+    """Los agregados de analíticas (reservations/rollups.py) coinciden con la tabla de reservas."""
+
+    def assertRollupsMatch(self):
+        expected = {
+            (row['start_date'], row['pet_id'], row['user_id'], row['status_id']): row['total']
+            for row in raw_counts()
+        }
+        stored = {
+            (row.day, row.pet_id, row.user_id, row.status_id): row.count
+            for row in ReservationDailyRollup.objects.filter(count__gt=0)
+        }
+        self.assertEqual(stored, expected)
+
+    def test_status_change_on_save(self):
+        reservation = self.reserve(self.pets[0])
+        self.reserve(self.pets[1])
+        reservation.status = self.status('Confirmed')
+        reservation.save()
+        self.assertRollupsMatch()
+
+    def test_status_change_in_bulk(self):
+        reservations = [self.reserve(pet) for pet in self.pets]
+        transition_reservations([reservation.pk for reservation in reservations[:2]], self.status('Cancelled'))
+        self.assertRollupsMatch()
+
+    def test_start_date_change_and_delete(self):
+        first = self.reserve(self.pets[0])
+        self.reserve(self.pets[1])
+        first.start_date -= timedelta(days=1)
+        first.save()
+        self.assertRollupsMatch()
+        Reservation.objects.filter(pet=self.pets[1]).delete()
+        self.assertRollupsMatch()
+
+    def test_owner_change_moves_rollups(self):
+        reservation = self.reserve(self.pets[0])
+        self.reserve(self.pets[0], start=self.start + timedelta(days=10))
+        new_owner = User.objects.create_user(username='new', email='new@example.com', password='x')
+        pet = Pet.objects.get(pk=self.pets[0].pk)
+        pet.user = new_owner
+        pet.save()
+        self.assertRollupsMatch()
+        # El cancelado y el borrado restan de la fila del dueño nuevo, no de una inexistente
+        reservation.status = self.status('Cancelled')
+        reservation.save()
+        self.assertRollupsMatch()
+        reservation.delete()
+        self.assertRollupsMatch()
+        self.assertFalse(ReservationDailyRollup.objects.filter(user=self.owner, count__gt=0).exists())
+
+    def test_owner_change_merges_drifted_rows(self):
+        self.reserve(self.pets[0])
+        new_owner = User.objects.create_user(username='new', email='new@example.com', password='x')
+        # Deriva previa: una fila del dueño nuevo con la misma clave (día, mascota, estado)
+        row = ReservationDailyRollup.objects.get(pet=self.pets[0])
+        ReservationDailyRollup.objects.create(day=row.day, pet=self.pets[0], user=new_owner, status=row.status, count=0)
+        pet = Pet.objects.get(pk=self.pets[0].pk)
+        pet.user = new_owner
+        pet.save()
+        self.assertRollupsMatch()
+
+    def test_analytics_by_status_pages_past_missing_status(self):
+        self.reserve(self.pets[0])
+        for pet in self.pets[1:]:
+            reservation = self.reserve(pet)
+            reservation.status = None
+            reservation.save()
+        admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='x')
+        self.client.force_authenticate(admin)
+        url, results = '/api/reservations/analytics/?by=status&page_size=1', []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            results += response.data['results']
+            url = response.data['next']
+        self.assertEqual(
+            [(item['id'], item['total_reservations']) for item in results],
+            [(None, 2), (str(self.status('Pending').pk), 1)],
+        )
+
+
+class OverlapTests(ReservationTestCase):
+    """Una mascota no puede tener dos reservas activas con días en común (reservations/overlaps.py)."""
+
+    def test_rejects_overlapping_stay(self):
+        self.reserve(self.pets[0])
+        with self.assertRaises(ReservationOverlap):
+            self.reserve(self.pets[0], start=self.start + timedelta(days=2))
+        # Otra mascota, o el día siguiente al fin, no se cruzan
+        self.reserve(self.pets[1])
+        self.reserve(self.pets[0], start=self.start + timedelta(days=3))
+
+    def test_cancelled_stay_does_not_block(self):
+        self.reserve(self.pets[0], status='Cancelled')
+        self.reserve(self.pets[0])
+
+    @override_settings(RESERVATION_STATUS_TRANSITIONS={'Pending': ('Cancelled',), 'Cancelled': ('Pending',)})
+    def test_reactivating_overlapping_stay_is_reported(self):
+        cancelled = self.reserve(self.pets[0])
+        transition_reservations([cancelled.pk], self.status('Cancelled'))
+        self.reserve(self.pets[0], start=self.start + timedelta(days=1))
+        results = transition_reservations([cancelled.pk], self.status('Pending'))
+        self.assertEqual(results[0]['result'], OVERLAP)
+        self.assertEqual(Reservation.objects.get(pk=cancelled.pk).status, self.status('Cancelled'))
+
+
+class ListingTests(ReservationTestCase):
+    """Listado paginado por cursor y filtros de fechas (ReservationViewSet)."""
+
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='x')
+        self.client.force_authenticate(self.admin)
+
+    def ids(self, response):
+        return {item['id'] for item in response.data['results']}
+
+    def test_week_includes_stays_that_started_before(self):
+        week = self.start + timedelta(days=7)
+        before = self.reserve(self.pets[0], start=week - timedelta(days=2), days=3) # Cruza el lunes
+        inside = self.reserve(self.pets[1], start=week + timedelta(days=6))
+        self.reserve(self.pets[2], start=week + timedelta(days=7)) # Semana siguiente
+        self.reserve(self.pets[2], start=week - timedelta(days=5), days=2) # Termina antes
+        response = self.client.get('/api/reservations/', {
+            'stays_from': week.isoformat(), 'stays_before': (week + timedelta(days=7)).isoformat(),
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.ids(response), {str(before.pk), str(inside.pk)})
+        # Ninguna estancia termina tan tarde
+        response = self.client.get('/api/reservations/', {'stays_from': (week + timedelta(days=365)).isoformat()})
+        self.assertEqual(self.ids(response), set())
+
+    def test_active_on_skips_inactive(self):
+        active = self.reserve(self.pets[0])
+        self.reserve(self.pets[1], status='Cancelled')
+        response = self.client.get('/api/reservations/', {'active_on': (self.start + timedelta(days=1)).isoformat()})
+        self.assertEqual(self.ids(response), {str(active.pk)})
+
+    def test_pages_in_start_order(self):
+        reservations = [self.reserve(pet, start=self.start + timedelta(days=index)) for index, pet in enumerate(self.pets)]
+        url, seen = '/api/reservations/?page_size=2', []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen += [item['id'] for item in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(seen, [str(reservation.pk) for reservation in reservations])
+
+    def test_invalid_dates_and_cursor(self):
+        response = self.client.get('/api/reservations/', {'stays_from': '2024-13-01'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get('/api/reservations/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+
+class BulkStatusTests(ReservationTestCase):
+    """POST /api/reservations/bulk-status/ (reservations/transitions.py)."""
+
+    def setUp(self):
+        super().setUp()
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='x')
+        self.client.force_authenticate(self.admin)
+
+    def bulk(self, ids, status):
+        return self.client.post('/api/reservations/bulk-status/', {'ids': [str(pk) for pk in ids], 'status': status},
+                                format='json')
+
+    def test_reports_a_result_per_id(self):
+        pending = self.reserve(self.pets[0])
+        completed = self.reserve(self.pets[1], status='Completed')
+        missing = '00000000-0000-0000-0000-000000000000'
+        response = self.bulk([pending.pk, completed.pk, missing], 'Confirmed')
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body['updated'], 1)
+        self.assertEqual(
+            [(item['id'], item['result']) for item in body['results']],
+            [(str(pending.pk), 'updated'), (str(completed.pk), 'invalid_transition'), (missing, 'not_found')],
+        )
+        self.assertEqual(Reservation.objects.get(pk=pending.pk).status, self.status('Confirmed'))
+        self.assertEqual(Reservation.objects.get(pk=completed.pk).status, self.status('Completed'))
+
+    def test_rejects_bad_input_and_non_admins(self):
+        reservation = self.reserve(self.pets[0])
+        response = self.bulk([reservation.pk], 'Archivada')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('status', response.data)
+        self.assertEqual(self.bulk([], 'Confirmed').status_code, 400)
+        self.client.force_authenticate(self.owner)
+        self.assertEqual(self.bulk([reservation.pk], 'Confirmed').status_code, 403)
+        self.assertEqual(Reservation.objects.get(pk=reservation.pk).status, self.status('Pending'))
+
+
+class FieldSelectionTests(ReservationTestCase):
+    """?fields= y ?expand= en el listado de reservas (backend/serializers.py)."""
+
+    def setUp(self):
+        super().setUp()
+        self.reservation = self.reserve(self.pets[0])
+
+    def first(self, **params):
+        response = self.client.get('/api/reservations/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results'][0]
+
+    def test_sparse_fields_and_nested_relations(self):
+        self.assertEqual(self.first(fields='id,start_date'), {
+            'id': str(self.reservation.pk), 'start_date': self.start.isoformat(),
+        })
+        # Sin ?expand= las relaciones salen como id
+        item = self.first()
+        self.assertEqual((item['pet'], item['status']), (str(self.pets[0].pk), str(self.status('Pending').pk)))
+        item = self.first(expand='pet.pet_type,status', fields='pet,status')
+        self.assertEqual(item['status']['name'], 'Pending')
+        self.assertEqual(item['pet']['pet_type']['name'], 'Dog')
+
+    def test_unknown_fields_and_relations_are_rejected(self):
+        response = self.client.get('/api/reservations/', {'fields': 'id,owner'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('owner', str(response.data['fields']))
+        for expand in ('owner', 'status.pet', 'pet.owner'):
+            with self.subTest(expand=expand):
+                response = self.client.get('/api/reservations/', {'expand': expand})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(expand, str(response.data['expand']))
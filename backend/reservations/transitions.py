@@ -0,0 +1,94 @@
+# reservations/transitions.py
+"""
+Cambios de estado masivos para el personal (POST /api/reservations/bulk-status/).
+
+Las transiciones permitidas salen de RESERVATION_STATUS_TRANSITIONS. Todas las
+reservas válidas se actualizan con un único UPDATE ... WHERE id IN (...) y la
+ocupación diaria y los agregados de analíticas se ajustan en bloque, dentro de
+la misma transacción. Reactivar una reserva que se cruza con otra activa de la
+misma mascota se rechaza por reserva (resultado 'overlap').
+"""
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Reservation, ReservationStatus
+from .occupancy import apply_occupancy_changes, is_active_status
+from .overlaps import OVERLAP_CONSTRAINT, ReservationOverlap, active_near, overlaps
+from .rollups import apply_rollups
+
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'
+NOT_FOUND = 'not_found'
+INVALID_TRANSITION = 'invalid_transition'
+OVERLAP = 'overlap'
+
+
+def allowed_targets(status_name):
+    # Una reserva sin estado se trata como 'Pending'
+    return settings.RESERVATION_STATUS_TRANSITIONS.get(status_name or 'Pending', ())
+
+
+def transition_reservations(reservation_ids, target):
+    """
+    Pasa las reservas de `reservation_ids` al estado `target` (ReservationStatus).
+    Devuelve un resultado por id, en el orden recibido. Lanza CapacityExceeded
+    (y no cambia nada) si reactivar alguna reserva supera el cupo de algún día.
+    """
+    reservation_ids = list(dict.fromkeys(reservation_ids))
+    with transaction.atomic():
+        rows = {
+            row['id']: row
+            for row in Reservation.objects.select_for_update().filter(id__in=reservation_ids)
+            .values('id', 'pet_id', 'status_id', 'start_date', 'end_date')
+        }
+
+        target_active = is_active_status(target.id)
+        # Reservas activas contra las que se comprueban las que se reactivan (una consulta)
+        reactivating = [row for row in rows.values() if not is_active_status(row['status_id'])]
+        active = active_near(reactivating) if target_active else []
+
+        results, changes = [], []
+        for reservation_id in reservation_ids:
+            row = rows.get(reservation_id)
+            if row is None:
+                results.append({'id': reservation_id, 'result': NOT_FOUND})
+                continue
+            if row['status_id'] == target.id:
+                results.append({'id': reservation_id, 'result': UNCHANGED})
+                continue
+            current_name = ReservationStatus.lookups.by_id(row['status_id']).name if row['status_id'] else None
+            if target.name not in allowed_targets(current_name):
+                results.append({
+                    'id': reservation_id,
+                    'result': INVALID_TRANSITION,
+                    'detail': f"No se puede pasar de '{current_name or 'Sin estado'}' a '{target.name}'.",
+                })
+                continue
+            if target_active and not is_active_status(row['status_id']):
+                conflict = next((other for other in active if overlaps(row, other)), None)
+                if conflict is not None:
+                    results.append({
+                        'id': reservation_id,
+                        'result': OVERLAP,
+                        'detail': f"Se cruza con la reserva {conflict['id']} "
+                                  f"({conflict['start_date'].isoformat()} a {conflict['end_date'].isoformat()}).",
+                    })
+                    continue
+                active.append(row)
+            previous = {field: row[field] for field in ('pet_id', 'status_id', 'start_date', 'end_date')}
+            changes.append((previous, {**previous, 'status_id': target.id}))
+            results.append({'id': reservation_id, 'result': UPDATED})
+
+        if changes:
+            try:
+                Reservation.objects.filter(
+                    id__in=[result['id'] for result in results if result['result'] == UPDATED]
+                ).update(status=target, is_active=target_active, updated_at=timezone.now())
+            except IntegrityError as e:
+                if OVERLAP_CONSTRAINT in str(e):
+                    raise ReservationOverlap() from e
+                raise
+            apply_occupancy_changes(changes)
+            apply_rollups(changes)
+    return results
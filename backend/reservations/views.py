@@ -3,13 +3,74 @@ from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
+from rest_framework.exceptions import ValidationError
 from django.shortcuts import get_object_or_404
-from datetime import date
-from django.db.models import Count, F # Importamos F para comparaciones de campos en anotaciones
-from .models import Reservation, ReservationStatus
+import uuid
+from datetime import date, timedelta
+from django.conf import settings
+from django.utils.dateparse import parse_date
+from django.db.models import Count, F, Min, Sum, UUIDField, Value # Importamos F para comparaciones de campos en anotaciones
+from django.db.models.functions import Coalesce, TruncMonth
+from backend.pagination import KeysetPagination
+from backend.serializers import requested_expand
+from .models import Reservation, ReservationDailyRollup, ReservationStatus
+from .occupancy import CapacityExceeded, get_availability
+from .overlaps import ReservationOverlap
+from .transitions import UPDATED, transition_reservations
 from .serializers import *
 
 
+# Alias item_id/item_name por agrupación (ver ReservationCountSerializer)
+ANALYTICS_GROUPS = {
+    'pet': {'item_id': F('pet_id'), 'item_name': F('pet__name')},
+    'user': {'item_id': F('user_id'), 'item_name': F('user__username')},
+    'status': {'item_id': F('status_id'), 'item_name': Coalesce(F('status__name'), Value('Sin estado'))},
+    'month': {'item_id': TruncMonth('day'), 'item_name': TruncMonth('day')},
+}
+# Clave de desempate del cursor: item_id nunca NULL (status es SET_NULL; NULL > x no es comparable)
+ANALYTICS_KEYS = {
+    'status': Coalesce(F('status_id'), Value(uuid.UUID(int=0), output_field=UUIDField())),
+}
+
+
+class ReservationPagination(KeysetPagination):
+    """Listado de reservas en orden cronológico; el índice reservations_start_keyset_idx cubre el orden."""
+    page_size = 50
+    max_page_size = 200
+    ordering = ('start_date', 'created_at', 'id')
+
+
+class ReservationAnalyticsPagination(KeysetPagination):
+    page_size = 50
+    ordering = ('-total_reservations', 'item_key')
+
+
+def _parse_day(value):
+    """None si no se envió; ValueError si no es una fecha YYYY-MM-DD válida."""
+    if not value:
+        return None
+    day = parse_date(value)
+    if day is None:
+        raise ValueError(value)
+    return day
+
+
+def _ending_on_or_after(queryset, day):
+    """
+    Filtra las reservas que terminan en o después de `day`. El listado se ordena por
+    start_date, así que sin cota inferior el índice del cursor recorrería todo el historial
+    anterior: se acota con el primer inicio entre esas reservas, leído del índice
+    (end_date, start_date).
+    """
+    bounds = Reservation.objects.filter(end_date__gte=day).aggregate(
+        first_start=Min('start_date'),
+        rows=Count('pk'), # Con dos agregados SQLite no resuelve MIN recorriendo el índice del cursor
+    )
+    if bounds['first_start'] is None:
+        return queryset.none()
+    return queryset.filter(end_date__gte=day, start_date__gte=bounds['first_start'])
+
+
 class ReservationStatusViewSet(viewsets.ReadOnlyModelViewSet):
     """
     API endpoint para ver los estados de reserva disponibles.
@@ -22,13 +83,43 @@ class ReservationViewSet(viewsets.ModelViewSet):
     """
     API endpoint que permite a los usuarios gestionar sus propias reservas
     y a los administradores gestionar todas las reservas.
+
+    El listado va paginado por cursor y acepta ?start_after= (inicio desde ese día,
+    incluido), ?start_before= (inicio antes de ese día), ?active_on= (reservas
+    activas que cubren ese día) y ?stays_from= / ?stays_before= (reservas con algún
+    día en ese rango, aunque hayan empezado antes). Una semana del calendario es
+    ?stays_from=<lunes>&stays_before=<lunes siguiente>.
     """
     serializer_class = ReservationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = ReservationPagination
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Reservation.objects.all().select_related('pet__user', 'status')
+        # Solo se unen las tablas que el serializer va a anidar (?expand=)
+        related = ReservationSerializer.select_related_for(requested_expand(self.request))
+        queryset = Reservation.objects.all().select_related(*related).prefetch_related('payments') # payment_status sin N+1
+
+        params = self.request.query_params
+        try:
+            start_after = _parse_day(params.get('start_after'))
+            start_before = _parse_day(params.get('start_before'))
+            active_on = _parse_day(params.get('active_on'))
+            stays_from = _parse_day(params.get('stays_from'))
+            stays_before = _parse_day(params.get('stays_before'))
+        except ValueError:
+            raise ValidationError({"detail": "Fechas inválidas. Use el formato YYYY-MM-DD."})
+        if start_after:
+            queryset = queryset.filter(start_date__gte=start_after)
+        if start_before:
+            queryset = queryset.filter(start_date__lt=start_before)
+        if active_on:
+            queryset = _ending_on_or_after(queryset.filter(is_active=True, start_date__lte=active_on), active_on)
+        # Cruce de rangos: la estancia termina en o después de stays_from y empieza antes de stays_before
+        if stays_from:
+            queryset = _ending_on_or_after(queryset, stays_from)
+        if stays_before:
+            queryset = queryset.filter(start_date__lt=stays_before)
 
         if user.is_staff:
             status_name = self.request.query_params.get('status', None)
@@ -60,7 +151,7 @@ class ReservationViewSet(viewsets.ModelViewSet):
             )
 
         try:
-            cancelled_status = ReservationStatus.objects.get(name='Cancelled')
+            cancelled_status = ReservationStatus.lookups.by_name('Cancelled')
         except ReservationStatus.DoesNotExist:
             return Response(
                 {"detail": "El estado 'Cancelled' no está configurado. Contacte al administrador."},
@@ -82,33 +173,80 @@ class ReservationViewSet(viewsets.ModelViewSet):
             status=status.HTTP_200_OK
         )
 
-    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
+    def availability(self, request):
+        """
+        Cupo libre por día entre ?from= y ?to= (YYYY-MM-DD, ambos incluidos).
+        Por defecto, los próximos 30 días. Se lee de la tabla de ocupación diaria.
+        """
+        try:
+            start = _parse_day(request.query_params.get('from')) or date.today()
+            end = _parse_day(request.query_params.get('to')) or start + timedelta(days=29)
+        except ValueError:
+            return Response({"detail": "Fechas inválidas. Use el formato YYYY-MM-DD."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if end < start:
+            return Response({"detail": "'to' no puede ser anterior a 'from'."}, status=status.HTTP_400_BAD_REQUEST)
+        if (end - start).days >= settings.RESERVATION_AVAILABILITY_MAX_DAYS:
+            return Response(
+                {"detail": f"El rango no puede superar {settings.RESERVATION_AVAILABILITY_MAX_DAYS} días."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(get_availability(start, end))
+
+    @action(detail=False, methods=['post'], permission_classes=[IsAdminUser], url_path='bulk-status')
+    def bulk_status(self, request):
+        """
+        Cambia el estado de varias reservas a la vez (solo administradores).
+        Recibe {"ids": [...], "status": "Confirmed"} y devuelve un resultado por id:
+        updated, unchanged, not_found, invalid_transition u overlap.
+        """
+        serializer = ReservationBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        target = serializer.validated_data['status']
+        try:
+            results = transition_reservations(serializer.validated_data['ids'], target)
+        except (CapacityExceeded, ReservationOverlap) as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'status': target.name,
+            'updated': sum(1 for result in results if result['result'] == UPDATED),
+            'results': results,
+        })
+
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser],
+            pagination_class=ReservationAnalyticsPagination)
     def analytics(self, request):
         """
-        Devuelve la cantidad total de reservas por mascota o por usuario.
-        Se puede filtrar por 'by=pet' o 'by=user'. Por defecto, agrupa por mascota.
+        Devuelve la cantidad de reservas agrupada por ?by=pet|user|status|month
+        (por defecto, pet), opcionalmente entre ?from= y ?to= (fecha de inicio).
+        Se calcula sobre la tabla de agregados diarios (reservations/rollups.py),
+        paginada por cursor; by=month se ordena cronológicamente.
         """
         group_by = request.query_params.get('by', 'pet')
-
-        if group_by == 'pet':
-            analytics_data = Reservation.objects.values(
-                item_id=F('pet__id'),      # Nuevo alias: item_id
-                item_name=F('pet__name')   # Nuevo alias: item_name
-            ).annotate(
-                total_reservations=Count('id')
-            ).order_by('-total_reservations')
-        elif group_by == 'user':
-            analytics_data = Reservation.objects.values(
-                item_id=F('pet__user__id'),       # Nuevo alias: item_id
-                item_name=F('pet__user__username') # Nuevo alias: item_name
-            ).annotate(
-                total_reservations=Count('id')
-            ).order_by('-total_reservations')
-        else:
+        if group_by not in ANALYTICS_GROUPS:
             return Response(
-                {"detail": "Parámetro 'by' inválido. Use 'pet' o 'user'."},
+                {"detail": "Parámetro 'by' inválido. Use 'pet', 'user', 'status' o 'month'."},
                 status=status.HTTP_400_BAD_REQUEST
             )
-
-        serializer = ReservationCountSerializer(analytics_data, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        try:
+            start = _parse_day(request.query_params.get('from'))
+            end = _parse_day(request.query_params.get('to'))
+        except ValueError:
+            return Response({"detail": "Fechas inválidas. Use el formato YYYY-MM-DD."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        rollups = ReservationDailyRollup.objects.all()
+        if start:
+            rollups = rollups.filter(day__gte=start)
+        if end:
+            rollups = rollups.filter(day__lte=end)
+        analytics_data = rollups.values(**ANALYTICS_GROUPS[group_by]).annotate(
+            total_reservations=Sum('count'),
+            item_key=ANALYTICS_KEYS.get(group_by, F('item_id')),
+        ).filter(total_reservations__gt=0)
+
+        self.keyset_ordering = ('item_key',) if group_by == 'month' else None
+        page = self.paginate_queryset(analytics_data)
+        serializer = ReservationCountSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
@@ -0,0 +1,80 @@
+# store/cache.py
+"""
+Caché de respuestas del catálogo público.
+
+Todas las claves incluyen un contador de versión del catálogo que se incrementa
+en cada save/delete de Product o ProductCategory, así que nunca hay que borrar
+entradas: las viejas simplemente dejan de consultarse y expiran solas.
+"""
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework.renderers import JSONRenderer
+
+from backend.versioning import bump_version, get_version
+
+CATALOG_VERSION_KEY = 'store:catalog:version'
+
+
+def get_catalog_version():
+    return get_version(CATALOG_VERSION_KEY)
+
+
+def bump_catalog_version():
+    """
+    Llamar con transaction.on_commit(bump_catalog_version): si se incrementa antes de
+    confirmar, un lector concurrente puede volver a cachear los datos viejos bajo la versión nueva.
+    """
+    bump_version(CATALOG_VERSION_KEY)
+
+
+class CatalogCacheMixin:
+    """
+    Cachea el JSON ya renderizado de list/retrieve y responde con ETag fuerte.
+    Si el cliente envía If-None-Match con el ETag vigente se devuelve 304 sin
+    ejecutar el queryset ni el serializer. El personal (is_staff) ve productos
+    sin stock, así que tiene su propia partición.
+    """
+    catalog_cache_prefix = 'store:catalog'
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def catalog_cache_key(self, request):
+        partition = 'staff' if request.user.is_staff else 'public'
+        query = urlencode(sorted(request.query_params.lists()), doseq=True)
+        # El host forma parte de la clave porque las URLs de imágenes son absolutas
+        path = hashlib.md5(f'{request.get_host()}{request.path}?{query}'.encode('utf-8')).hexdigest()
+        return f'{self.catalog_cache_prefix}:{get_catalog_version()}:{partition}:{path}'
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        # El API navegable (HTML) no se cachea
+        if request.accepted_renderer.format != 'json':
+            return handler(request, *args, **kwargs)
+
+        key = self.catalog_cache_key(request)
+        entry = cache.get(key)
+        if entry is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            body = JSONRenderer().render(response.data)
+            entry = (f'"{hashlib.sha256(body).hexdigest()}"', body)
+            cache.set(key, entry, settings.STORE_CATALOG_CACHE_TIMEOUT)
+
+        etag, body = entry
+        if etag in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(body, content_type='application/json')
+        response['ETag'] = etag
+        patch_vary_headers(response, ['Authorization'])
+        return response
@@ -0,0 +1,75 @@
+# store/facets.py
+import hashlib
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .cache import get_catalog_version
+
+
+def _price(value):
+    # Mismo formato que ProductSerializer.price ("10.00")
+    return f'{Decimal(value):.2f}'
+
+
+def _price_filter(low, high):
+    condition = Q(price__gte=low)
+    if high is not None:
+        condition &= Q(price__lt=high)
+    return condition
+
+
+def compute_facets(queryset):
+    """
+    Calcula las facetas de categoría, rango de precio y disponibilidad con una sola
+    consulta: un GROUP BY categoría con conteos condicionales para cada rango de precio
+    y para el stock. Los totales por precio y stock se suman en Python.
+    """
+    ranges = settings.STORE_PRICE_FACETS
+    aggregates = {
+        'total': Count('id'),
+        'in_stock': Count('id', filter=Q(stock__gt=0)),
+    }
+    for index, (low, high) in enumerate(ranges):
+        aggregates[f'price_{index}'] = Count('id', filter=_price_filter(low, high))
+
+    rows = list(queryset.order_by().values('category_id', 'category__name').annotate(**aggregates))
+
+    in_stock = sum(row['in_stock'] for row in rows)
+    total = sum(row['total'] for row in rows)
+    return {
+        'categories': sorted(
+            [
+                {'id': row['category_id'], 'name': row['category__name'], 'count': row['total']}
+                for row in rows if row['category_id'] is not None
+            ],
+            key=lambda item: item['name'],
+        ),
+        'price_ranges': [
+            {
+                'min': _price(low),
+                'max': _price(high) if high is not None else None,
+                'count': sum(row[f'price_{index}'] for row in rows),
+            }
+            for index, (low, high) in enumerate(ranges)
+        ],
+        'availability': {'in_stock': in_stock, 'out_of_stock': total - in_stock},
+        'total': total,
+    }
+
+
+def get_facets(queryset, partition, params):
+    """
+    Facetas cacheadas por versión del catálogo: cualquier escritura de productos
+    cambia la versión y las deja obsoletas. `params` son los filtros que definen el
+    conjunto base (búsqueda), no el cursor ni los filtros de facetas.
+    """
+    digest = hashlib.md5(repr(sorted(params.items())).encode('utf-8')).hexdigest()
+    key = f'store:facets:{get_catalog_version()}:{partition}:{digest}'
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(queryset)
+        cache.set(key, facets, settings.STORE_CATALOG_CACHE_TIMEOUT)
+    return facets
@@ -0,0 +1,78 @@
+# store/importers.py
+from django.conf import settings
+from django.db import transaction
+from rest_framework import serializers
+
+from backend.importers import BatchImporter
+from .cache import bump_catalog_version
+from .models import Product, ProductCategory
+from .search import get_search_backend
+
+
+class ProductImportRowSerializer(serializers.Serializer):
+    """Valida una fila del archivo de importación (CSV o JSONL)."""
+    sku = serializers.CharField(max_length=64)
+    name = serializers.CharField(max_length=100)
+    description = serializers.CharField(required=False, allow_blank=True, default='')
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    stock = serializers.IntegerField(min_value=0, default=0)
+    category = serializers.CharField(required=False, allow_blank=True, default='') # Nombre de la categoría
+
+
+class ProductImporter(BatchImporter):
+    """
+    Importa productos por lotes haciendo upsert por `sku` con
+    bulk_create(update_conflicts=True). Las categorías se resuelven por nombre con
+    un único diccionario precargado, en lugar de una consulta por fila.
+    """
+    row_serializer_class = ProductImportRowSerializer
+    update_fields = ['name', 'description', 'price', 'stock', 'category', 'updated_at']
+
+    def __init__(self, chunk_size=None):
+        super().__init__(
+            chunk_size or settings.STORE_IMPORT_CHUNK_SIZE,
+            settings.STORE_IMPORT_MAX_REPORTED_ERRORS,
+        )
+        self.categories = {
+            name.strip().lower(): category_id
+            for category_id, name in ProductCategory.objects.values_list('id', 'name')
+        }
+
+    def _build(self, line, data):
+        category_id = None
+        if data['category']:
+            category_id = self.categories.get(data['category'].strip().lower())
+            if category_id is None:
+                self._add_error(line, {'category': [f"Categoría '{data['category']}' no encontrada."]})
+                return None
+        # Por sku: si se repite dentro del mismo lote gana la última fila
+        return data['sku'], Product(
+            sku=data['sku'],
+            name=data['name'],
+            description=data['description'],
+            price=data['price'],
+            stock=data['stock'],
+            category_id=category_id,
+        )
+
+    def _flush(self, chunk):
+        products = list(chunk.values())
+        with transaction.atomic():
+            Product.objects.bulk_create(
+                products,
+                update_conflicts=True,
+                unique_fields=['sku'],
+                update_fields=self.update_fields,
+            )
+            # En un conflicto la fila conserva su id original: releemos por sku para el índice
+            get_search_backend().index(
+                Product.objects.filter(sku__in=list(chunk)).only('id', 'name', 'description')
+            )
+        self.imported += len(products)
+        chunk.clear()
+
+    def run(self, rows):
+        report = super().run(rows)
+        if self.imported:
+            transaction.on_commit(bump_catalog_version)
+        return report
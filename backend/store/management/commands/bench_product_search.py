@@ -0,0 +1,89 @@
+# store/management/commands/bench_product_search.py
+import random
+import statistics
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from store.models import Product
+from store.search import IcontainsProductSearch, get_search_backend
+
+WORDS = [
+    'comida', 'perro', 'gato', 'adulto', 'cachorro', 'croquetas', 'arena', 'juguete', 'pelota',
+    'collar', 'correa', 'cama', 'rascador', 'snack', 'dental', 'premium', 'natural', 'salmón',
+    'pollo', 'cordero', 'hueso', 'shampoo', 'antipulgas', 'transportadora', 'comedero', 'bebedero',
+    'abrigo', 'arnés', 'peine', 'vitaminas', 'grande', 'pequeño', 'mediano', 'senior', 'light',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara la búsqueda indexada con el filtro name__icontains sobre un catálogo sintético. "
+        "Los datos se crean dentro de una transacción que se revierte al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--products', type=int, default=100_000)
+        parser.add_argument('--queries', type=int, default=30)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        with transaction.atomic():
+            self._populate(rng, options['products'])
+            queries = options['queries']
+            term_groups = {
+                'frecuente': [rng.choice(WORDS)[:rng.randint(3, 6)] for _ in range(queries)],
+                'selectivo': [f'marca{rng.randint(0, 4999)}' for _ in range(queries)],
+                'sin resultados': [f'zz{rng.randint(0, 9999)}' for _ in range(queries)],
+            }
+
+            indexed = get_search_backend()
+            baseline = IcontainsProductSearch()
+            base_qs = Product.objects.filter(stock__gt=0)
+            indexed_name = type(indexed).__name__
+
+            for group, terms in term_groups.items():
+                self.stdout.write(f"\nTérminos {group}:")
+                self._report('icontains ?name=', terms, lambda t: baseline.filter_name(base_qs, t))
+                self._report(f'{indexed_name} ?name=', terms, lambda t: indexed.filter_name(base_qs, t))
+                self._report(
+                    f'{indexed_name} ?q=', terms,
+                    lambda t: indexed.ranked(base_qs, t, 200).order_by('search_rank', 'id'),
+                )
+            transaction.set_rollback(True)
+
+    def _populate(self, rng, count):
+        self.stdout.write(f"Creando {count} productos sintéticos...")
+        batch = []
+        for _ in range(count):
+            batch.append(Product(
+                name=' '.join(rng.sample(WORDS, 3) + [f'marca{rng.randint(0, 4999)}']),
+                description=' '.join(rng.choices(WORDS, k=12)),
+                price=Decimal(rng.randint(100, 100_000)) / 100,
+                stock=rng.randint(0, 50),
+            ))
+            if len(batch) == 5000:
+                Product.objects.bulk_create(batch)
+                batch = []
+        Product.objects.bulk_create(batch)
+        started = time.perf_counter()
+        get_search_backend().rebuild()
+        self.stdout.write(f"Índice construido en {time.perf_counter() - started:.2f}s")
+
+    def _report(self, label, terms, build_queryset):
+        timings = []
+        for term in terms:
+            started = time.perf_counter()
+            # Primera página del catálogo, con el mismo orden que la paginación por cursor
+            queryset = build_queryset(term)
+            if not queryset.query.order_by:
+                queryset = queryset.order_by('-created_at', '-id')
+            list(queryset.values_list('id', flat=True)[:24])
+            timings.append((time.perf_counter() - started) * 1000)
+        self.stdout.write(
+            f"  {label:<32} mediana {statistics.median(timings):8.2f} ms   "
+            f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:8.2f} ms"
+        )
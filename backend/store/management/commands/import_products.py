@@ -0,0 +1,31 @@
+# store/management/commands/import_products.py
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.importers import guess_format, iter_rows
+from store.importers import ProductImporter
+
+
+class Command(BaseCommand):
+    help = "Importa productos desde un archivo CSV o JSONL haciendo upsert por sku (gemelo de POST /api/products/import/)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', dest='file_format', choices=['csv', 'jsonl'])
+        parser.add_argument('--chunk-size', type=int)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['file_format'] or guess_format(path)
+        try:
+            with open(path, 'rb') as source:
+                report = ProductImporter(chunk_size=options['chunk_size']).run(iter_rows(source, file_format))
+        except OSError as e:
+            raise CommandError(f"No se pudo leer {path}: {e}")
+
+        for error in report['errors']:
+            self.stderr.write(f"Línea {error['row']}: {error['errors']}")
+        if report['errors_truncated']:
+            self.stderr.write(f"... y {report['failed'] - len(report['errors'])} errores más.")
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['processed']} filas procesadas, {report['imported']} importadas, {report['failed']} con errores."
+        ))
@@ -0,0 +1,17 @@
+# store/management/commands/rebuild_product_search.py
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from store.search import get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda de productos (FTS5 en SQLite, REINDEX en PostgreSQL)."
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        with transaction.atomic():
+            total = backend.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f"Índice de búsqueda reconstruido con {type(backend).__name__}: {total} productos."
+        ))
@@ -0,0 +1,63 @@
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS store_product_fts USING fts5("
+    "name, description, product_id UNINDEXED, tokenize='unicode61 remove_diacritics 2', prefix='2 3 4')",
+]
+SQLITE_REVERSE = [
+    "DROP TABLE IF EXISTS store_product_fts",
+]
+
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "ALTER TABLE store_product ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('spanish'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('spanish'::regconfig, coalesce(description, '')), 'B')) STORED",
+    "CREATE INDEX store_product_search_idx ON store_product USING gin (search_vector)",
+    # Django traduce name__icontains a UPPER(name::text) LIKE UPPER(%s)
+    "CREATE INDEX store_product_name_trgm_idx ON store_product USING gin ((UPPER(name::text)) gin_trgm_ops)",
+]
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS store_product_name_trgm_idx",
+    "DROP INDEX IF EXISTS store_product_search_idx",
+    "ALTER TABLE store_product DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        for sql in SQLITE_FORWARD:
+            schema_editor.execute(sql)
+        # Indexar los productos existentes (mismo rowid que store.search.SQLiteFTSProductSearch)
+        Product = apps.get_model('store', 'Product')
+        rows = [
+            (product.id.int >> 65, product.id.hex, product.name, product.description or '')
+            for product in Product.objects.only('id', 'name', 'description').iterator()
+        ]
+        with schema_editor.connection.cursor() as cursor:
+            cursor.executemany(
+                "INSERT INTO store_product_fts (rowid, product_id, name, description) VALUES (%s, %s, %s, %s)",
+                rows,
+            )
+    elif vendor == 'postgresql':
+        for sql in POSTGRES_FORWARD:
+            schema_editor.execute(sql)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'sqlite': SQLITE_REVERSE, 'postgresql': POSTGRES_REVERSE}.get(vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0005_product_created_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
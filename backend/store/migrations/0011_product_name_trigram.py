@@ -0,0 +1,45 @@
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    # ?name= busca subcadenas (como icontains); el tokenizador trigram las indexa
+    "CREATE VIRTUAL TABLE IF NOT EXISTS store_product_name_fts USING fts5("
+    "name, product_id UNINDEXED, tokenize='trigram')",
+]
+SQLITE_REVERSE = [
+    "DROP TABLE IF EXISTS store_product_name_fts",
+]
+
+
+def create_name_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return # En PostgreSQL ?name= ya usa el índice trigram de la migración 0006
+    for sql in SQLITE_FORWARD:
+        schema_editor.execute(sql)
+    # Mismo rowid que store.search.SQLiteFTSProductSearch
+    Product = apps.get_model('store', 'Product')
+    rows = [
+        (product.id.int >> 65, product.id.hex, product.name)
+        for product in Product.objects.only('id', 'name').iterator()
+    ]
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO store_product_name_fts (rowid, product_id, name) VALUES (%s, %s, %s)",
+            rows,
+        )
+
+
+def drop_name_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'sqlite':
+        for sql in SQLITE_REVERSE:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0010_product_image_blob'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_name_index, drop_name_index),
+    ]
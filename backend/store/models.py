@@ -1,52 +1,86 @@
 import uuid
-from django.db import models
-import os
-from PIL import Image
-from django.core.files.base import ContentFile
-from io import BytesIO
+from django.db import models, transaction
+from backend.lookups import LookupManager
+from images.blobs import attach_upload, release_blob, stored_blob_id
+from images.jobs import enqueue_image
+from images.models import ImageBlob
+from .search import get_search_backend
+from .cache import bump_catalog_version
 
 class ProductCategory(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=100)
 
+    objects = models.Manager()
+    lookups = LookupManager()
+
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Invalida la caché del catálogo (store/cache.py) al confirmar la transacción
+        transaction.on_commit(bump_catalog_version)
+
 class Product(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    # Código del producto; clave de los upserts de la importación masiva
+    sku = models.CharField(max_length=64, unique=True, blank=True, null=True)
     name = models.CharField(max_length=100)
     description = models.TextField(blank=True, null=True)
     price = models.DecimalField(max_digits=10, decimal_places=2)
     stock = models.PositiveIntegerField(default=0)
     image = models.ImageField(upload_to='products/', blank=True, null=True)
+    # Miniaturas generadas por el worker de imágenes: {"128": "ruta.webp", ...}
+    image_variants = models.JSONField(default=dict, blank=True)
+    # Blob optimizado compartido (images/blobs.py); vacío mientras el original espera al worker
+    image_blob = models.ForeignKey(
+        ImageBlob, on_delete=models.SET_NULL, null=True, blank=True, editable=False, related_name='product_images'
+    )
     category = models.ForeignKey(ProductCategory, on_delete=models.SET_NULL, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Soporta la paginación por cursor del catálogo (ORDER BY created_at, id)
+            models.Index(fields=['created_at', 'id'], name='store_product_created_idx'),
+            # Filtros y facetas del catálogo
+            models.Index(fields=['category', 'price'], name='store_product_cat_price_idx'),
+            models.Index(fields=['stock'], name='store_product_stock_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
     def save(self, *args, **kwargs):
-        # Guardar la instancia primero para asegurar que self.photo sea accesible
-        super().save(*args, **kwargs)
-
-        if self.image and not self.image.name.lower().endswith('.webp'):
-            try:
-                self.image.seek(0)
-                img = Image.open(self.image)
+        # Se guarda el original tal cual; la conversión a WebP la hace el worker
+        # (manage.py process_image_jobs) fuera de la petición.
+        new_image = bool(self.image) and not self.image._committed
+        reused_blob = False
 
-                if img.mode in ("RGBA", "P"):
-                    img = img.convert("RGB")
+        with transaction.atomic():
+            previous_blob_id = None
+            if new_image or not self.image:
+                previous_blob_id = stored_blob_id(self, 'image')
+            if new_image:
+                # Si ya existe un blob con el mismo contenido se reutiliza sin volver a codificar
+                reused_blob = attach_upload(self, 'image')
+            elif not self.image:
+                self.image_variants = {} # Las miniaturas anteriores ya no corresponden
+                self.image_blob = None
 
-                img_io = BytesIO()
-                # Ajustar calidad para mayor optimización si es necesario
-                img.save(img_io, format='WEBP', quality=75) # Calidad 75 es un buen balance
+            super().save(*args, **kwargs)
+            # attach_upload sumó una referencia al blob reutilizado: si es el mismo que ya
+            # teníamos (se volvió a subir la misma imagen), la anterior sobra igual
+            if previous_blob_id and (reused_blob or previous_blob_id != self.image_blob_id):
+                release_blob(previous_blob_id)
 
-                base_name = os.path.splitext(os.path.basename(self.image.name))[0]
-                new_image_name = f"{base_name}.webp"
+        if new_image and not reused_blob:
+            enqueue_image(self, 'image', quality=75) # Calidad 75 es un buen balance
 
-                self.image.save(new_image_name, ContentFile(img_io.getvalue()), save=False)
-                super().save(update_fields=['photo']) # Guardar solo el campo de la foto
-            except Exception as e:
-                print(f"Error optimizing product image: {e}")
-                # Considera loggear este error en un entorno de producción.
+        # Mantener sincronizado el índice de búsqueda (FTS5 en SQLite; en Postgres es una columna generada)
+        get_search_backend().index([self])
+        # Invalida la caché del catálogo (store/cache.py) al confirmar la transacción
+        transaction.on_commit(bump_catalog_version)
+        # Los borrados se sincronizan en store/signals.py (post_delete cubre también QuerySet.delete())
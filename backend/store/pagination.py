@@ -0,0 +1,14 @@
+# store/pagination.py
+from django.conf import settings
+
+from backend.pagination import KeysetPagination
+
+
+class ProductCursorPagination(KeysetPagination):
+    """
+    Paginación por cursor del catálogo: los productos más recientes primero,
+    con 'id' como desempate para que el orden sea estable.
+    """
+    page_size = getattr(settings, 'STORE_PRODUCT_PAGE_SIZE', 24)
+    max_page_size = getattr(settings, 'STORE_PRODUCT_MAX_PAGE_SIZE', 100)
+    ordering = ('-created_at', '-id')
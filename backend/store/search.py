@@ -0,0 +1,243 @@
+# store/search.py
+"""
+Búsqueda indexada de productos.
+
+- SQLite: tabla virtual FTS5 `store_product_fts` para `?q=` y otra con tokenizador
+  trigram, `store_product_name_fts`, para `?name=` (subcadena, como icontains).
+  Se mantienen desde Product.save y la señal post_delete.
+- PostgreSQL: columna generada `search_vector` (tsvector) con índice GIN, más un
+  índice trigram sobre el nombre para `?name=`. Postgres la mantiene sola.
+- Otros motores: `icontains` como antes.
+"""
+import re
+import uuid
+
+from django.core.exceptions import EmptyResultSet
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = 'store_product_fts'
+NAME_FTS_TABLE = 'store_product_name_fts'
+# Los trigramas no sirven para términos más cortos: esos van por icontains
+MIN_NAME_INDEX_LENGTH = 3
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _tokens(text):
+    return _TOKEN_RE.findall(text or '')
+
+
+def _to_uuid(value):
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(value)
+
+
+def _candidates_sql(queryset):
+    """
+    (sql, params) con los ids del queryset, para filtrar dentro de la consulta de ranking
+    antes del LIMIT. ('', ()) si el queryset no tiene filtros; EmptyResultSet si no puede
+    devolver filas.
+    """
+    if not queryset.query.where:
+        return '', ()
+    return queryset.order_by().values('id').query.sql_with_params()
+
+
+def _rank_queryset(queryset, ranked_ids):
+    """Filtra el queryset a `ranked_ids` y anota `search_rank` (0 = más relevante)."""
+    ranked = queryset.filter(id__in=ranked_ids) if ranked_ids else queryset.none()
+    return ranked.annotate(
+        search_rank=Case(
+            *[When(id=product_id, then=Value(position)) for position, product_id in enumerate(ranked_ids)],
+            default=Value(len(ranked_ids)),
+            output_field=IntegerField(),
+        )
+    )
+
+
+class IcontainsProductSearch:
+    """Búsqueda sin índice (LIKE '%x%'); se usa en motores sin soporte de texto completo."""
+
+    def filter_name(self, queryset, term):
+        return queryset.filter(name__icontains=term)
+
+    def ranked(self, queryset, query, limit):
+        # Sin ranking real: primero coincidencias en el nombre, luego en la descripción
+        name_ids = list(queryset.filter(name__icontains=query).values_list('id', flat=True)[:limit])
+        description_ids = list(
+            queryset.filter(description__icontains=query)
+            .exclude(id__in=name_ids)
+            .values_list('id', flat=True)[:limit - len(name_ids)]
+        )
+        return _rank_queryset(queryset, name_ids + description_ids)
+
+    def matching(self, queryset, query):
+        # Las mismas coincidencias que ranked(), sin orden ni límite (para contar facetas)
+        return queryset.filter(Q(name__icontains=query) | Q(description__icontains=query))
+
+    def index(self, products):
+        pass
+
+    def remove(self, product_ids):
+        pass
+
+    def rebuild(self):
+        return 0
+
+
+class SQLiteFTSProductSearch(IcontainsProductSearch):
+    """
+    Índice FTS5. El rowid de cada fila se deriva del UUID del producto (63 bits altos),
+    así las actualizaciones y borrados van por clave primaria en lugar de escanear la tabla.
+    """
+    # Pesos de bm25 por columna: (name, description, product_id)
+    bm25_weights = (10.0, 1.0, 0.0)
+
+    @staticmethod
+    def _rowid(product_id):
+        return product_id.int >> 65
+
+    @staticmethod
+    def _match_expression(columns, tokens, operator):
+        terms = f' {operator} '.join('"{}"*'.format(token.replace('"', '""')) for token in tokens)
+        return '{%s} : (%s)' % (' '.join(columns), terms)
+
+    def filter_name(self, queryset, term):
+        if len(term) < MIN_NAME_INDEX_LENGTH:
+            return super().filter_name(queryset, term)
+        # Una frase en el índice trigram equivale a buscar la subcadena (sin distinguir mayúsculas)
+        expression = '"{}"'.format(term.replace('"', '""'))
+        return queryset.filter(id__in=RawSQL(
+            f'SELECT product_id FROM {NAME_FTS_TABLE} WHERE {NAME_FTS_TABLE} MATCH %s', (expression,)
+        ))
+
+    def _query_expression(self, query):
+        tokens = _tokens(query)
+        return self._match_expression(['name', 'description'], tokens, 'OR') if tokens else None
+
+    def ranked(self, queryset, query, limit):
+        expression = self._query_expression(query)
+        if expression is None:
+            return _rank_queryset(queryset, [])
+        weights = ', '.join(str(weight) for weight in self.bm25_weights)
+        try:
+            candidates, candidate_params = _candidates_sql(queryset)
+        except EmptyResultSet:
+            return _rank_queryset(queryset, [])
+        # Los filtros de la vista (stock, categoría, precio) se aplican antes del LIMIT:
+        # si no, el top global podría no contener ningún producto que los cumpla
+        sql = f'SELECT product_id FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s'
+        if candidates:
+            sql += f' AND product_id IN ({candidates})'
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'{sql} ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s',
+                [expression, *candidate_params, limit],
+            )
+            ranked_ids = [_to_uuid(row[0]) for row in cursor.fetchall()]
+        return _rank_queryset(queryset, ranked_ids)
+
+    def matching(self, queryset, query):
+        expression = self._query_expression(query)
+        if expression is None:
+            return queryset.none()
+        return queryset.filter(id__in=RawSQL(
+            f'SELECT product_id FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (expression,)
+        ))
+
+    def index(self, products):
+        rows = [
+            (self._rowid(product.id), product.id.hex, product.name, product.description or '')
+            for product in products
+        ]
+        if not rows:
+            return
+        rowids = [(row[0],) for row in rows]
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', rowids)
+            cursor.executemany(
+                f'INSERT INTO {FTS_TABLE} (rowid, product_id, name, description) VALUES (%s, %s, %s, %s)',
+                rows,
+            )
+            cursor.executemany(f'DELETE FROM {NAME_FTS_TABLE} WHERE rowid = %s', rowids)
+            cursor.executemany(
+                f'INSERT INTO {NAME_FTS_TABLE} (rowid, product_id, name) VALUES (%s, %s, %s)',
+                [row[:3] for row in rows],
+            )
+
+    def remove(self, product_ids):
+        rowids = [(self._rowid(product_id),) for product_id in product_ids]
+        with connection.cursor() as cursor:
+            cursor.executemany(f'DELETE FROM {FTS_TABLE} WHERE rowid = %s', rowids)
+            cursor.executemany(f'DELETE FROM {NAME_FTS_TABLE} WHERE rowid = %s', rowids)
+
+    def rebuild(self, chunk_size=2000):
+        from .models import Product
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE}')
+            cursor.execute(f'DELETE FROM {NAME_FTS_TABLE}')
+        total = 0
+        batch = []
+        for product in Product.objects.only('id', 'name', 'description').iterator(chunk_size=chunk_size):
+            batch.append(product)
+            if len(batch) >= chunk_size:
+                self.index(batch)
+                total += len(batch)
+                batch = []
+        self.index(batch)
+        return total + len(batch)
+
+
+class PostgresProductSearch(IcontainsProductSearch):
+    """
+    `?name=` sigue usando icontains, que en Postgres usa el índice GIN trigram
+    (UPPER(name) gin_trgm_ops). `?q=` usa la columna generada `search_vector`.
+    """
+    config = 'spanish'
+
+    def ranked(self, queryset, query, limit):
+        if not _tokens(query):
+            return _rank_queryset(queryset, [])
+        try:
+            candidates, candidate_params = _candidates_sql(queryset)
+        except EmptyResultSet:
+            return _rank_queryset(queryset, [])
+        sql = "SELECT id FROM store_product, websearch_to_tsquery(%s, %s) query WHERE search_vector @@ query"
+        if candidates:
+            sql += f" AND id IN ({candidates})"
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"{sql} ORDER BY ts_rank(search_vector, query) DESC LIMIT %s",
+                [self.config, query, *candidate_params, limit],
+            )
+            ranked_ids = [_to_uuid(row[0]) for row in cursor.fetchall()]
+        return _rank_queryset(queryset, ranked_ids)
+
+    def matching(self, queryset, query):
+        if not _tokens(query):
+            return queryset.none()
+        return queryset.filter(id__in=RawSQL(
+            "SELECT id FROM store_product WHERE search_vector @@ websearch_to_tsquery(%s, %s)",
+            (self.config, query),
+        ))
+
+    def rebuild(self):
+        from .models import Product
+
+        with connection.cursor() as cursor:
+            cursor.execute('REINDEX INDEX store_product_search_idx')
+            cursor.execute('REINDEX INDEX store_product_name_trgm_idx')
+        return Product.objects.count()
+
+
+_BACKENDS = {
+    'sqlite': SQLiteFTSProductSearch,
+    'postgresql': PostgresProductSearch,
+}
+
+
+def get_search_backend():
+    backend_class = _BACKENDS.get(connection.vendor, IcontainsProductSearch)
+    return backend_class()
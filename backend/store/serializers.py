@@ -1,6 +1,8 @@
 # store/serializers.py
 from rest_framework import serializers
 from .models import ProductCategory, Product
+from backend.serializers import DynamicFieldsMixin
+from images.serializers import ImageVariantsMixin
 
 class ProductCategorySerializer(serializers.ModelSerializer):
     class Meta:
@@ -8,14 +10,17 @@ class ProductCategorySerializer(serializers.ModelSerializer):
         fields = ['id', 'name']
         read_only_fields = ['id']
 
-class ProductSerializer(serializers.ModelSerializer):
-    category = ProductCategorySerializer(read_only=True) # Usamos el nombre del campo 'category'
+class ProductSerializer(DynamicFieldsMixin, ImageVariantsMixin, serializers.ModelSerializer):
+    # La categoría se anida por defecto; con ?expand= sin 'category' sale solo su id
+    expandable_fields = {'category': (ProductCategorySerializer, {})}
+    default_expand = ('category',)
     category_id = serializers.UUIDField(write_only=True, required=False) # Para enviar el ID de la categoría, y que sea opcional
+    image_field = 'image' # Miniaturas en Product.image_variants (ver ImageVariantsMixin)
 
     class Meta:
         model = Product
         fields = [
-            'id', 'name', 'description', 'price', 'stock', 'image', # Usamos el nombre del campo 'image'
+            'id', 'sku', 'name', 'description', 'price', 'stock', 'image', 'variants', # Usamos el nombre del campo 'image'
             'category', 'category_id', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
@@ -23,7 +28,9 @@ class ProductSerializer(serializers.ModelSerializer):
     def validate_category_id(self, value):
         if value is None: # Si no se proporciona un ID, es válido (campo null=True)
             return None
-        if not ProductCategory.objects.filter(id=value).exists():
+        try:
+            ProductCategory.lookups.by_id(value)
+        except ProductCategory.DoesNotExist:
             raise serializers.ValidationError("Categoría de producto no encontrada.")
         return value
 
@@ -32,7 +39,7 @@ class ProductSerializer(serializers.ModelSerializer):
         category = None
         if category_id:
             try:
-                category = ProductCategory.objects.get(id=category_id)
+                category = ProductCategory.lookups.by_id(category_id)
             except ProductCategory.DoesNotExist:
                 raise serializers.ValidationError({"category_id": "Categoría de producto inválida."})
 
@@ -43,7 +50,7 @@ class ProductSerializer(serializers.ModelSerializer):
         category_id = validated_data.pop('category_id', None)
         if category_id is not None: # Solo actualizar si se proporciona un ID de categoría
             try:
-                category = ProductCategory.objects.get(id=category_id)
+                category = ProductCategory.lookups.by_id(category_id)
                 instance.category = category
             except ProductCategory.DoesNotExist:
                 raise serializers.ValidationError({"category_id": "Categoría de producto inválida."})
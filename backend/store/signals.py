@@ -0,0 +1,35 @@
+# store/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from images.blobs import release_blob
+from images.signals import image_optimized
+from .cache import bump_catalog_version
+from .models import Product, ProductCategory
+from .search import get_search_backend
+
+
+@receiver(image_optimized, sender=Product)
+def product_image_optimized(sender, **kwargs):
+    # El worker actualiza la imagen con un UPDATE directo, sin pasar por Product.save
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_delete, sender=Product)
+def release_product_image_blob(sender, instance, **kwargs):
+    # El archivo puede estar compartido con otros productos o mascotas (images/blobs.py)
+    release_blob(instance.image_blob_id)
+
+
+@receiver(post_delete, sender=Product)
+def remove_product_from_search(sender, instance, **kwargs):
+    # post_delete también se dispara en QuerySet.delete(), en el borrado masivo del admin
+    # y en cascadas; corre dentro de la transacción del borrado.
+    get_search_backend().remove([instance.pk])
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_delete, sender=ProductCategory)
+def category_deleted(sender, instance, **kwargs):
+    transaction.on_commit(bump_catalog_version)
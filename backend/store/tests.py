@@ -1,3 +1,129 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from users.models import User
+from .models import Product, ProductCategory
+
+
+class CatalogTestCase(TestCase):
+    """Catálogo pequeño con dos categorías; la caché del catálogo empieza vacía en cada prueba."""
+
+    def setUp(self):
+        cache.clear()
+        self.food = ProductCategory.objects.create(name='Alimentos')
+        self.toys = ProductCategory.objects.create(name='Juguetes')
+        self.products = [
+            Product.objects.create(name='Pelota de goma', description='Juguete resistente', price=Decimal('8.50'),
+                                   stock=10, category=self.toys),
+            Product.objects.create(name='Cuerda para perros', description='Juguete de tirar', price=Decimal('15.00'),
+                                   stock=0, category=self.toys),
+            Product.objects.create(name='Alimento balanceado', description='Para perros adultos', price=Decimal('40.00'),
+                                   stock=5, category=self.food),
+            Product.objects.create(name='Snack dental', description='Premio para perros', price=Decimal('120.00'),
+                                   stock=3, category=self.food),
+        ]
+        self.client = APIClient()
+
+    def names(self, response):
+        return sorted(item['name'] for item in response.json()['results'])
+
+
+
+class CatalogPaginationTests(CatalogTestCase):
+
+    def test_pages_newest_first_without_repeats(self):
+        url, seen = '/api/products/?page_size=1', []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen += [item['id'] for item in response.json()['results']]
+            url = response.json()['next']
+        # El público no ve productos sin stock
+        expected = [str(pk) for pk in Product.objects.filter(stock__gt=0).order_by('-created_at', '-id')
+                    .values_list('pk', flat=True)]
+        self.assertEqual(len(expected), 3)
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor_is_not_found(self):
+        self.assertEqual(self.client.get('/api/products/', {'cursor': 'not-a-cursor'}).status_code, 404)
+
+
+
+class CatalogCacheTests(CatalogTestCase):
+    """Respuestas cacheadas con ETag (store/cache.py)."""
+
+    def test_not_modified_until_catalog_changes(self):
+        response = self.client.get('/api/products/')
+        etag = response['ETag']
+        with CaptureQueriesContext(connection) as queries:
+            cached = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(len(queries.captured_queries), 0)
+
+        # La versión del catálogo cambia al confirmar la transacción
+        with self.captureOnCommitCallbacks(execute=True):
+            Product.objects.create(name='Collar', price=Decimal('12.00'), stock=2, category=self.toys)
+        response = self.client.get('/api/products/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn('Collar', self.names(response))
+
+    def test_staff_and_public_do_not_share_entries(self):
+        public = self.client.get('/api/products/')
+        staff = APIClient()
+        staff.force_authenticate(User.objects.create_superuser(username='admin', email='admin@example.com', password='x'))
+        response = staff.get('/api/products/')
+        self.assertIn('Cuerda para perros', self.names(response))
+        self.assertNotIn('Cuerda para perros', self.names(public))
+
+    def test_errors_are_not_cached(self):
+        self.assertEqual(self.client.get('/api/products/00000000-0000-0000-0000-000000000000/').status_code, 404)
+        response = self.client.get('/api/products/', {'min_price': 'abc'})
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn('ETag', response)
+
+
+class PriceFilterTests(CatalogTestCase):
+
+    def test_filters_by_price_range(self):
+        response = self.client.get('/api/products/', {'min_price': '10', 'max_price': '100'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.names(response), ['Alimento balanceado'])
+
+    def test_rejects_malformed_and_non_finite_prices(self):
+        for name, value in [('min_price', 'abc'), ('max_price', 'Infinity'), ('min_price', 'nan'),
+                            ('max_price', '-inf'), ('min_price', 'sNaN')]:
+            with self.subTest(**{name: value}):
+                response = self.client.get('/api/products/', {name: value})
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {name: "Debe ser un número."})
+
+
+class FacetTests(CatalogTestCase):
+
+    def test_facets_count_the_search_set_before_facet_filters(self):
+        response = self.client.get('/api/products/', {'category_id': str(self.food.pk)})
+        facets = response.json()['facets']
+        # El público solo ve productos con stock; el filtro de categoría no cambia las facetas
+        self.assertEqual(facets['total'], 3)
+        self.assertEqual(
+            [(item['name'], item['count']) for item in facets['categories']],
+            [('Alimentos', 2), ('Juguetes', 1)],
+        )
+        self.assertEqual([item['count'] for item in facets['price_ranges']], [1, 0, 1, 0, 1])
+        self.assertEqual(self.names(response), ['Alimento balanceado', 'Snack dental'])
 
-# Create your tests here.
+    def test_search_ranks_once_per_request(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/products/', {'q': 'perros'})
+        self.assertEqual(self.names(response), ['Alimento balanceado', 'Snack dental'])
+        facets = response.json()['facets']
+        self.assertEqual(facets['total'], 2)
+        self.assertEqual([(item['name'], item['count']) for item in facets['categories']], [('Alimentos', 2)])
+        if connection.vendor == 'sqlite':
+            self.assertEqual(sum('bm25(' in query['sql'] for query in queries.captured_queries), 1)
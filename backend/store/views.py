@@ -1,12 +1,24 @@
 # store/views.py
 from rest_framework import viewsets, status
 from rest_framework.response import Response
+from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.exceptions import ValidationError
+from django.conf import settings
+from decimal import Decimal, InvalidOperation
 
+from backend.importers import guess_format, iter_rows
+from backend.serializers import requested_expand
 from .models import ProductCategory, Product
 from .serializers import ProductCategorySerializer, ProductSerializer
+from .pagination import ProductCursorPagination
+from .search import get_search_backend
+from .cache import CatalogCacheMixin
+from .facets import get_facets
+from .importers import ProductImporter
 
-class ProductCategoryViewSet(viewsets.ReadOnlyModelViewSet):
+class ProductCategoryViewSet(CatalogCacheMixin, viewsets.ReadOnlyModelViewSet):
     """
     API endpoint que permite ver las categorías de productos.
     """
@@ -14,7 +26,7 @@ class ProductCategoryViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = ProductCategorySerializer
     permission_classes = [AllowAny]
 
-class ProductViewSet(viewsets.ModelViewSet): # ¡ModelViewSet para CRUD completo!
+class ProductViewSet(CatalogCacheMixin, viewsets.ModelViewSet): # ¡ModelViewSet para CRUD completo!
     """
     API endpoint que permite a los usuarios ver una lista de productos disponibles y
     a los administradores agregar, editar o eliminar productos.
@@ -22,28 +34,95 @@ class ProductViewSet(viewsets.ModelViewSet): # ¡ModelViewSet para CRUD completo
     # Queryset base para la vista de administración (todos los productos)
     queryset = Product.objects.all().select_related('category') # ¡Usamos 'category' aquí!
     serializer_class = ProductSerializer
+    pagination_class = ProductCursorPagination # Cursor sobre (created_at, id): páginas profundas cuestan lo mismo que la primera
 
-    def get_queryset(self):
-        # Primero, obtenemos el queryset base (todos los productos con la relación de categoría precargada)
-        queryset = Product.objects.all().select_related('category')
+    # Parámetros que definen el conjunto base sobre el que se calculan las facetas
+    search_params = ('name', 'q')
+
+    def get_search_queryset(self):
+        # Primero, obtenemos el queryset base; la categoría solo se une si se va a anidar (?expand=)
+        related = ProductSerializer.select_related_for(requested_expand(self.request))
+        queryset = Product.objects.all().select_related(*related)
 
         # Si no es un administrador, solo mostramos productos activos y con stock > 0
         if not self.request.user.is_staff:
             queryset = queryset.filter(stock__gt=0) # Asumo que "activos" se refiere a stock > 0
 
-        # --- Lógica de Filtrado ---
+        search = get_search_backend()
 
-        # Filtrar por nombre (búsqueda parcial, insensible a mayúsculas/minúsculas)
+        # Filtrar por nombre (subcadena sin distinguir mayúsculas, usando el índice de búsqueda)
         name = self.request.query_params.get('name', None)
         if name is not None:
-            queryset = queryset.filter(name__icontains=name) # __icontains para búsqueda insensible a mayúsculas/minúsculas
+            queryset = search.filter_name(queryset, name)
+
+        return queryset
+
+    def rank_search_queryset(self, queryset):
+        # Búsqueda por relevancia en nombre y descripción; los resultados se ordenan por ranking.
+        # Se aplica al final, para que el top de STORE_SEARCH_MAX_RESULTS ya respete los filtros.
+        q = self.request.query_params.get('q', None)
+        if q is None:
+            return queryset
+        self.keyset_ordering = ('search_rank', 'id')
+        return get_search_backend().ranked(queryset, q, settings.STORE_SEARCH_MAX_RESULTS)
+
+    def get_facet_queryset(self):
+        # Conjunto base de las facetas: la búsqueda sin ranking (el orden no cambia los conteos).
+        # Es perezoso: si las facetas están en caché no se ejecuta ninguna consulta.
+        queryset = self.get_search_queryset()
+        q = self.request.query_params.get('q', None)
+        if q is not None:
+            queryset = get_search_backend().matching(queryset, q)
+        return queryset
+
+    def get_queryset(self):
+        queryset = self.get_search_queryset()
+        params = self.request.query_params
+
+        # --- Filtros de facetas (respaldados por los índices (category, price) y (stock)) ---
 
         # Filtrar por categoría (usando el ID de la categoría)
-        category_id = self.request.query_params.get('category_id', None)
+        category_id = params.get('category_id', None)
         if category_id is not None:
             queryset = queryset.filter(category__id=category_id)
 
-        return queryset
+        min_price = self._decimal_param('min_price')
+        if min_price is not None:
+            queryset = queryset.filter(price__gte=min_price)
+
+        max_price = self._decimal_param('max_price')
+        if max_price is not None:
+            queryset = queryset.filter(price__lte=max_price)
+
+        in_stock = params.get('in_stock', None)
+        if in_stock is not None:
+            if in_stock.lower() in ('1', 'true', 'yes'):
+                queryset = queryset.filter(stock__gt=0)
+            else:
+                queryset = queryset.filter(stock=0)
+
+        return self.rank_search_queryset(queryset)
+
+    def _decimal_param(self, name):
+        value = self.request.query_params.get(name, None)
+        if value is None:
+            return None
+        try:
+            number = Decimal(value)
+        except InvalidOperation:
+            number = None
+        # Decimal acepta 'nan' e 'Infinity', que rompen la comparación con price
+        if number is None or not number.is_finite():
+            raise ValidationError({name: "Debe ser un número."})
+        return number
+
+    def get_paginated_response(self, data):
+        # Resultados y facetas en la misma respuesta (y en la misma entrada de la caché)
+        response = super().get_paginated_response(data)
+        partition = 'staff' if self.request.user.is_staff else 'public'
+        params = {key: self.request.query_params.get(key) for key in self.search_params}
+        response.data['facets'] = get_facets(self.get_facet_queryset(), partition, params)
+        return response
 
     def get_permissions(self):
         # Permisos dinámicos:
@@ -55,14 +134,30 @@ class ProductViewSet(viewsets.ModelViewSet): # ¡ModelViewSet para CRUD completo
             permission_classes = [IsAdminUser]
         return [permission() for permission in permission_classes]
 
-    def list(self, request, *args, **kwargs):
-        # Para usuarios no-admin, filtramos por stock > 0
-        if not request.user.is_staff:
-            self.queryset = self.queryset.filter(stock__gt=0)
-        return super().list(request, *args, **kwargs)
-
-    # para eliminar el archivo de imagen del almacenamiento al borrar el producto
+    # para eliminar el archivo de imagen del almacenamiento al borrar el producto;
+    # si ya es un blob compartido, lo libera la señal post_delete (store/signals.py)
     def perform_destroy(self, instance):
-        if instance.image:
+        if instance.image and not instance.image_blob_id:
             instance.image.delete(save=False)
-        instance.delete()
\ No newline at end of file
+        instance.delete()
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_products(self, request):
+        """
+        Importación masiva (solo administradores). Recibe un archivo 'file' CSV o JSONL con
+        columnas sku, name, description, price, stock y category (nombre). Hace upsert por sku
+        y devuelve un reporte con los errores por fila.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"detail": "Debe enviar el archivo en el campo 'file'."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        file_format = request.data.get('file_format') or guess_format(upload.name)
+        try:
+            rows = iter_rows(upload.file, file_format)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        report = ProductImporter().run(rows)
+        return Response(report, status=status.HTTP_200_OK)
@@ -0,0 +1,181 @@
+# users/authentication.py
+"""
+Autenticación por token con caché (reemplazo directo de TokenAuthentication).
+
+TokenAuthentication hace un JOIN Token + User en cada petición. Aquí el par
+token -> usuario se guarda en un LRU por proceso (AUTH_TOKEN_CACHE_SIZE
+entradas, AUTH_TOKEN_CACHE_TTL segundos), así que la base de datos solo se
+consulta la primera vez. La caché compartida (Redis en producción) guarda solo
+(id del usuario, fecha del token, generación), nunca el usuario ni su hash de
+contraseña: un worker que aún no vio el token carga al usuario por su PK.
+Cada petición recibe una instancia nueva del usuario, sin objetos relacionados
+compartidos con otras peticiones.
+
+Cada entrada lleva la "generación" del usuario, un contador en la caché
+compartida que se incrementa cuando el usuario se guarda o se borra (cambio de
+contraseña, desactivación, rol...) y cuando se borra su token (logout). En cada
+petición se compara con la generación actual, así que una revocación vale de
+inmediato en todos los workers. La generación se lee antes de consultar la base
+de datos; un token que nadie vio aún no tiene id de usuario conocido, así que su
+entrada nace sin verificar y se vuelve a consultar en su segundo uso. Los cambios hechos con QuerySet.update() no
+disparan señales: después de uno hay que llamar a `invalidate_user(user_id)`.
+
+Los tokens vencen AUTH_TOKEN_TTL después de creados (vencimiento absoluto). La
+fecha viaja con el token cacheado, así que comprobarla no cuesta una consulta;
+el login reemplaza el token vencido por uno nuevo (issue_token) y
+`manage.py purge_tokens` borra las filas vencidas.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from backend.versioning import bump_version, get_version
+
+_entries = OrderedDict() # clave del token -> (valores del usuario, creado, generación, guardado_en)
+_lock = threading.Lock()
+_stats = {'local_hits': 0, 'shared_hits': 0, 'misses': 0, 'revoked': 0}
+
+
+def _generation_key(user_id):
+    return f'auth:generation:{user_id}'
+
+
+def _token_key(key):
+    # La clave del token no se guarda en claro en la caché compartida
+    return 'auth:token:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+def _count(name):
+    with _lock:
+        _stats[name] += 1
+
+
+def get_generation(user_id):
+    return get_version(_generation_key(user_id))
+
+
+def invalidate_user(user_id):
+    """Invalida en todos los workers los tokens cacheados del usuario."""
+    bump_version(_generation_key(user_id))
+
+
+def token_expired(token, now=None):
+    if settings.AUTH_TOKEN_TTL is None:
+        return False
+    return token.created + settings.AUTH_TOKEN_TTL <= (now or timezone.now())
+
+
+def issue_token(user):
+    """Token vigente del usuario; si el que tiene ya venció, lo reemplaza por uno nuevo."""
+    token, created = Token.objects.get_or_create(user=user)
+    if not created and token_expired(token):
+        token.delete()
+        token = Token.objects.create(user=user)
+    return token
+
+
+def cache_stats():
+    """Contadores de este proceso desde que arrancó."""
+    with _lock:
+        stats = dict(_stats, size=len(_entries), max_size=settings.AUTH_TOKEN_CACHE_SIZE)
+    lookups = stats['local_hits'] + stats['shared_hits'] + stats['misses']
+    stats['hit_ratio'] = round((stats['local_hits'] + stats['shared_hits']) / lookups, 4) if lookups else None
+    return stats
+
+
+def _user_values(user):
+    return tuple(getattr(user, field.attname) for field in user._meta.concrete_fields)
+
+
+def _build_user(values):
+    """Instancia nueva por petición: las vistas pueden modificarla y cargar relaciones sin afectar a otras."""
+    UserModel = get_user_model()
+    return UserModel.from_db(DEFAULT_DB_ALIAS, [field.attname for field in UserModel._meta.concrete_fields], values)
+
+
+def _build_token(key, user, created):
+    token = Token.from_db(DEFAULT_DB_ALIAS, ['key', 'user_id', 'created'], [key, user.pk, created])
+    token.user = user
+    return token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """Igual que TokenAuthentication (mismo header 'Token <clave>'), con caché."""
+
+    def authenticate_credentials(self, key):
+        user, token = self._credentials(key)
+        if token_expired(token):
+            raise exceptions.AuthenticationFailed(_('El token venció. Inicie sesión de nuevo.'))
+        return user, token
+
+    def _credentials(self, key):
+        ttl = settings.AUTH_TOKEN_CACHE_TTL
+        user_id = generation = None
+        with _lock:
+            entry = _entries.get(key)
+            if entry is not None:
+                _entries.move_to_end(key)
+        if entry is not None and time.monotonic() - entry[3] < ttl:
+            values, created, cached_generation = entry[:3]
+            user = _build_user(values)
+            user_id, generation = user.pk, get_generation(user.pk)
+            if cached_generation == generation:
+                _count('local_hits')
+                return user, _build_token(key, user, created)
+            self._forget(key)
+            if cached_generation is not None:
+                _count('revoked')
+        else:
+            shared = cache.get(_token_key(key))
+            if shared is not None:
+                user_id, created, cached_generation = shared
+                generation = get_generation(user_id)
+                if cached_generation == generation:
+                    # Válido para la generación actual: solo falta el usuario, por PK
+                    user = get_user_model().objects.filter(pk=user_id).first()
+                    if user is not None and user.is_active:
+                        _count('shared_hits')
+                        self._remember(key, user, created, generation)
+                        return user, _build_token(key, user, created)
+                elif cached_generation is not None:
+                    _count('revoked')
+        _count('misses')
+
+        # `generation` se leyó antes de esta consulta: si el usuario cambia entretanto, la
+        # entrada nace con la generación vieja y la siguiente petición la descarta. Sin
+        # user_id conocido (token nunca visto) queda en None: sin verificar.
+        token = Token.objects.select_related('user').filter(key=key).first()
+        if token is None:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        user = token.user
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        if token.user_id != user_id:
+            generation = None
+        cache.set(_token_key(key), (user.pk, token.created, generation), ttl)
+        self._remember(key, user, token.created, generation)
+        return user, token # Recién leídos: no se comparten con la entrada cacheada
+
+    @staticmethod
+    def _remember(key, user, created, generation):
+        with _lock:
+            _entries[key] = (_user_values(user), created, generation, time.monotonic())
+            _entries.move_to_end(key)
+            while len(_entries) > settings.AUTH_TOKEN_CACHE_SIZE:
+                _entries.popitem(last=False)
+
+    @staticmethod
+    def _forget(key):
+        with _lock:
+            _entries.pop(key, None)
@@ -0,0 +1,69 @@
+# users/management/commands/bench_login_throttle.py
+import time
+import uuid
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.settings import api_settings
+from rest_framework.test import APIRequestFactory
+
+from users.models import User
+from users.views import LoginView
+
+
+class Command(BaseCommand):
+    help = (
+        "Simula un ataque de credential stuffing contra /api/login/ con y sin throttling y mide "
+        "el CPU que consume el worker. Los usuarios se crean dentro de una transacción que se revierte."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--attempts', type=int, default=100, help="Intentos con contraseña incorrecta.")
+        parser.add_argument('--ips', type=int, default=2, help="IPs distintas desde las que ataca.")
+        parser.add_argument('--accounts', type=int, default=20, help="Cuentas existentes atacadas.")
+
+    def handle(self, *args, **options):
+        tag = uuid.uuid4().hex[:8]
+        with transaction.atomic():
+            password = make_password('contraseña-real') # Un solo hash: todas las cuentas lo comparten
+            emails = [f'bench-{tag}-{index}@example.com' for index in range(options['accounts'])]
+            User.objects.bulk_create([
+                User(username=f'bench-{tag}-{index}', email=email, password=password)
+                for index, email in enumerate(emails)
+            ])
+
+            runs = [
+                ('sin throttling', LoginView.as_view(throttle_classes=())),
+                ('con throttling', LoginView.as_view()),
+            ]
+            for run, (label, view) in enumerate(runs):
+                self._attack(label, view, run, emails, options['attempts'], options['ips'])
+            rates = api_settings.DEFAULT_THROTTLE_RATES
+            self.stdout.write(
+                f"Con throttling los hashes por ventana quedan acotados por {options['ips']} IPs x "
+                f"{rates['login_ip']} (y {rates['login_account']} por cuenta), sin importar el ritmo del ataque."
+            )
+            transaction.set_rollback(True)
+
+    def _attack(self, label, view, run, emails, attempts, ips):
+        factory = APIRequestFactory()
+        rejected = 0
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        for attempt in range(attempts):
+            request = factory.post(
+                '/api/login/',
+                {'username_or_email': emails[attempt % len(emails)], 'password': f'intento-{attempt}'},
+                format='json',
+                # Rango de IPs distinto por corrida para no heredar contadores
+                REMOTE_ADDR=f'198.51.{100 + run}.{attempt % ips + 1}',
+            )
+            if view(request).status_code == 429:
+                rejected += 1
+        cpu = time.process_time() - cpu_started
+        wall = time.perf_counter() - wall_started
+        hashed = attempts - rejected
+        self.stdout.write(
+            f"{label:<16} intentos {attempts:5d}   rechazados (429) {rejected:5d}   hashes {hashed:5d}   "
+            f"CPU {cpu:7.2f} s   ({cpu / attempts * 1000:7.1f} ms/intento, {wall:.2f} s reales)"
+        )
@@ -0,0 +1,44 @@
+# users/management/commands/import_users.py
+from django.core.management.base import BaseCommand, CommandError
+
+from backend.importers import guess_format, iter_rows
+from users.importers import UserImporter
+
+
+class Command(BaseCommand):
+    help = (
+        "Alta masiva de usuarios desde un archivo CSV o JSONL (gemelo de POST /api/admin/users/import/). "
+        "Columnas: username, email, first_name, last_name, phone_number, role y password_hash "
+        "(hash del sistema anterior) o password (en claro; hashearla cuesta ~0.5 s por fila y el "
+        "endpoint la rechaza)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--format', dest='file_format', choices=['csv', 'jsonl'])
+        parser.add_argument('--chunk-size', type=int)
+        parser.add_argument('--default-role', help="Rol de las filas sin 'role' (por defecto USER_IMPORT_DEFAULT_ROLE).")
+        parser.add_argument('--no-tokens', action='store_true', help="No crear tokens de login.")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['file_format'] or guess_format(path)
+        importer = UserImporter(
+            chunk_size=options['chunk_size'],
+            default_role=options['default_role'],
+            create_tokens=not options['no_tokens'],
+            allow_plain_passwords=True,
+        )
+        try:
+            with open(path, 'rb') as source:
+                report = importer.run(iter_rows(source, file_format))
+        except OSError as e:
+            raise CommandError(f"No se pudo leer {path}: {e}")
+
+        for error in report['errors']:
+            self.stderr.write(f"Línea {error['row']}: {error['errors']}")
+        if report['errors_truncated']:
+            self.stderr.write(f"... y {report['failed'] - len(report['errors'])} errores más.")
+        self.stdout.write(self.style.SUCCESS(
+            f"{report['processed']} filas procesadas, {report['imported']} importadas, {report['failed']} con errores."
+        ))
@@ -0,0 +1,41 @@
+# users/management/commands/purge_tokens.py
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+
+class Command(BaseCommand):
+    help = (
+        "Borra los tokens de login vencidos (AUTH_TOKEN_TTL) en lotes pequeños, cada uno en su "
+        "propia transacción, para no bloquear la tabla. Pensado para cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.AUTH_TOKEN_PURGE_BATCH_SIZE)
+        parser.add_argument('--sleep', type=float, default=0.1, help="Pausa entre lotes, en segundos.")
+        parser.add_argument('--dry-run', action='store_true', help="Solo cuenta los tokens vencidos.")
+
+    def handle(self, *args, **options):
+        if settings.AUTH_TOKEN_TTL is None:
+            raise CommandError("AUTH_TOKEN_TTL es None: los tokens no vencen.")
+        expired = Token.objects.filter(created__lte=timezone.now() - settings.AUTH_TOKEN_TTL)
+
+        if options['dry_run']:
+            self.stdout.write(f"{expired.count()} tokens vencidos.")
+            return
+
+        deleted = 0
+        while True:
+            # Claves del lote por el índice de `created`; el DELETE es por clave primaria
+            keys = list(expired.order_by('created').values_list('key', flat=True)[:options['batch_size']])
+            if not keys:
+                break
+            # delete() dispara post_delete, que invalida la caché de autenticación del usuario
+            deleted += Token.objects.filter(key__in=keys).delete()[0]
+            if len(keys) < options['batch_size']:
+                break
+            time.sleep(options['sleep'])
+        self.stdout.write(self.style.SUCCESS(f"{deleted} tokens vencidos borrados."))
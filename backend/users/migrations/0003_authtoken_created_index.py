@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Índice sobre authtoken_token.created para `manage.py purge_tokens`: sin él,
+    cada lote de tokens vencidos recorre la tabla completa. La tabla es de DRF,
+    así que el índice se crea con SQL desde esta app.
+    """
+
+    dependencies = [
+        ('users', '0002_user_pet_count'),
+        ('authtoken', '0004_alter_tokenproxy_options'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "CREATE INDEX IF NOT EXISTS authtoken_token_created_idx ON authtoken_token (created)",
+            "DROP INDEX IF EXISTS authtoken_token_created_idx",
+        ),
+    ]
@@ -2,11 +2,16 @@
 import uuid
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.db.models.functions import Lower
+from backend.lookups import LookupManager
 
 class Role(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=50)
 
+    objects = models.Manager()
+    lookups = LookupManager()
+
     def __str__(self):
         return self.name
 
@@ -15,11 +20,27 @@ class User(AbstractUser):
     email = models.EmailField(unique=True)
     phone_number = models.CharField(max_length=20, blank=True, null=True)
     role = models.ForeignKey(Role, on_delete=models.SET_NULL, null=True)
+    # Contador desnormalizado de mascotas; lo mantiene pets.models.Pet (ver reconcile_pet_counts)
+    pet_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'first_name', 'last_name']
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Listado de administradores ordenado por cantidad de mascotas (keyset sobre pet_count, id)
+            models.Index(fields=['pet_count', 'id'], name='users_user_pet_count_idx'),
+            # Directorio de administradores (views.UserListView): keyset sobre (date_joined, id), con y sin ?role=
+            models.Index(fields=['date_joined', 'id'], name='users_user_joined_idx'),
+            models.Index(fields=['role', 'date_joined', 'id'], name='users_user_role_joined_idx'),
+            # ?search= sin distinguir mayúsculas (users/search.py); en PostgreSQL además trigram (0004)
+            models.Index(Lower('email'), name='users_user_email_lower_idx'),
+            models.Index(Lower('username'), name='users_user_username_lower_idx'),
+            models.Index(Lower('first_name'), name='users_user_first_lower_idx'),
+            models.Index(Lower('last_name'), name='users_user_last_lower_idx'),
+        ]
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -0,0 +1,61 @@
+# users/search.py
+"""
+Búsqueda del directorio de usuarios (GET /api/admin/users/?search=).
+
+Cada palabra del término debe aparecer en el username, el email, el nombre o el
+apellido (sin distinguir mayúsculas):
+
+- Un email completo se busca por igualdad sobre el índice LOWER(email).
+- PostgreSQL: `icontains` (subcadena) sobre índices GIN trigram (migración 0004).
+- Otros motores: prefijo, como un rango LOWER(col) >= 'x' AND < 'x\\U0010ffff' sobre
+  los índices LOWER(...) del modelo; un LIKE '%x%' recorrería la tabla entera.
+  LOWER() de SQLite solo convierte A-Z, así que el término se normaliza igual
+  (_fold): 'Ángela' y 'ÁNGELA' encuentran a Ángela, 'ángela' no (como icontains
+  en SQLite).
+"""
+import string
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+SEARCH_FIELDS = ('username', 'email', 'first_name', 'last_name')
+_PREFIX_END = '\U0010ffff'
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def _fold(term):
+    # Igual que LOWER() en la base de datos: en SQLite solo A-Z, en PostgreSQL también acentos
+    if connection.vendor == 'sqlite':
+        return term.translate(_ASCII_LOWER)
+    return term.lower()
+
+
+def _is_email(term):
+    name, _, domain = term.partition('@')
+    return bool(name) and '.' in domain and ' ' not in term
+
+
+def search_users(queryset, term):
+    term = _fold(term.strip())
+    if not term:
+        return queryset
+    if _is_email(term):
+        return queryset.alias(email_lower=Lower('email')).filter(email_lower=term)
+
+    words = term.split()
+    if connection.vendor == 'postgresql':
+        for word in words:
+            condition = Q()
+            for field in SEARCH_FIELDS:
+                condition |= Q(**{f'{field}__icontains': word})
+            queryset = queryset.filter(condition)
+        return queryset
+
+    queryset = queryset.alias(**{f'{field}_lower': Lower(field) for field in SEARCH_FIELDS})
+    for word in words:
+        condition = Q()
+        for field in SEARCH_FIELDS:
+            condition |= Q(**{f'{field}_lower__gte': word, f'{field}_lower__lt': word + _PREFIX_END})
+        queryset = queryset.filter(condition)
+    return queryset
@@ -1,6 +1,8 @@
 # users/serializers.py
 from rest_framework import serializers
 from django.contrib.auth import authenticate, get_user_model
+from django.db.models import Q
+from backend.serializers import DynamicFieldsMixin
 from .models import User, Role # Asumiendo que User está en .models
 
 # Obtener el modelo de usuario activo en Django
@@ -11,7 +13,7 @@ class RegisterSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = UserModel
-        # 'role' no se incluye en fields aquí porque se asignará automáticamente en la vista
+        # 'role' no se incluye en fields aquí porque lo asigna la vista al crear el usuario
         fields = ['id', 'username', 'email', 'password', 'first_name', 'last_name', 'phone_number']
         extra_kwargs = {'password': {'write_only': True}}
 
@@ -22,9 +24,9 @@ class RegisterSerializer(serializers.ModelSerializer):
             password=validated_data['password'],
             first_name=validated_data.get('first_name', ''),
             last_name=validated_data.get('last_name', ''),
-            phone_number=validated_data.get('phone_number', None) # Asegúrate de que phone_number sea opcional
+            phone_number=validated_data.get('phone_number', None), # Asegúrate de que phone_number sea opcional
+            role=validated_data.get('role'), # Lo pasa la vista con serializer.save(role=...)
         )
-        # El rol se asignará en la vista, no aquí en el serializer's create method.
         return user
 
 
@@ -41,17 +43,13 @@ class LoginSerializer(serializers.Serializer):
             msg = ('Debe incluir "username_or_email" y "password".')
             raise serializers.ValidationError(msg, code='authorization')
 
-        user = None
-
-        # Intenta encontrar el usuario por email
-        try:
-            user = UserModel.objects.get(email=username_or_email)
-        except UserModel.DoesNotExist:
-            # Si no se encuentra por email, intenta por username
-            try:
-                user = UserModel.objects.get(username=username_or_email)
-            except UserModel.DoesNotExist:
-                pass # El usuario no existe ni por email ni por username
+        # Una sola consulta (ambas columnas son únicas e indexadas); si el valor coincide
+        # con el email de un usuario y el username de otro, gana el email, como antes
+        candidates = list(UserModel.objects.filter(Q(email=username_or_email) | Q(username=username_or_email))[:2])
+        user = next(
+            (candidate for candidate in candidates if candidate.email == username_or_email),
+            candidates[0] if candidates else None,
+        )
 
         if user and user.check_password(password):
             # Si el usuario existe y la contraseña es correcta
@@ -72,8 +70,12 @@ class UserProfileSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
         # Sobreescribir para mostrar el nombre del rol en lugar de su ID/UUID
         representation = super().to_representation(instance)
-        if instance.role:
-            representation['role'] = instance.role.name
+        if instance.role_id:
+            # Desde la caché de roles (backend/lookups.py): sin consulta extra por petición
+            try:
+                representation['role'] = Role.lookups.by_id(instance.role_id).name
+            except Role.DoesNotExist:
+                representation['role'] = instance.role.name # Rol recién creado en otro worker
         else:
             representation['role'] = None # Si no hay rol asignado
         return representation
@@ -108,14 +110,23 @@ class ChangePasswordSerializer(serializers.Serializer):
         data['user'] = user # Añadir el usuario validado para usarlo en la vista
         return data
 
-class UserListSerializer(serializers.ModelSerializer):
-    role = serializers.StringRelatedField() # Muestra el __str__ del Role
+class UserListSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    # Nombre del rol desde la caché de tablas de referencia (backend/lookups.py), sin JOIN
+    role = serializers.SerializerMethodField()
 
     class Meta:
         model = UserModel
         fields = ['id', 'username', 'email', 'first_name', 'last_name', 'phone_number', 'role', 'is_active', 'date_joined']
         read_only_fields = ['id', 'username', 'email', 'first_name', 'last_name', 'phone_number', 'is_active', 'date_joined']
 
+    def get_role(self, obj):
+        if obj.role_id is None:
+            return None
+        try:
+            return Role.lookups.by_id(obj.role_id).name
+        except Role.DoesNotExist:
+            return None
+
 # --- Serializer para Asignación de Rol ---
 class RoleAssignmentSerializer(serializers.Serializer):
     # UUIDField para el ID del rol o CharField para el nombre del rol.
@@ -124,7 +135,7 @@ class RoleAssignmentSerializer(serializers.Serializer):
 
     def validate_role_name(self, value):
         try:
-            Role.objects.get(name=value)
+            Role.lookups.by_name(value)
         except Role.DoesNotExist:
             raise serializers.ValidationError("El rol especificado no existe.")
         return value
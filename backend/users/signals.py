@@ -0,0 +1,21 @@
+# users/signals.py
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_user
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def revoke_cached_user(sender, instance, **kwargs):
+    # Contraseña, desactivación, rol...: los demás workers se enteran al confirmar la transacción
+    transaction.on_commit(lambda: invalidate_user(instance.pk))
+
+
+@receiver(post_delete, sender=Token)
+def revoke_cached_token(sender, instance, **kwargs):
+    # Logout (y borrado en cascada del usuario)
+    transaction.on_commit(lambda: invalidate_user(instance.user_id))
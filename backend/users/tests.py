@@ -1,3 +1,296 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from . import authentication
+from backend.lookups import _tables
+from .authentication import cache_stats
+from .throttling import SlidingWindowRateThrottle
+from .models import Role, User
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    """Una revocación vale de inmediato aunque el token ya esté en caché (users/authentication.py)."""
+
+    def setUp(self):
+        cache.clear()
+        authentication._entries.clear()
+        self.user = User.objects.create_user(username='alice', email='alice@example.com', password='Secret123!x')
+        response = APIClient().post(
+            '/api/login/', {'username_or_email': 'alice', 'password': 'Secret123!x'}, format='json'
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Token ' + response.data['token'])
+        self._warm_up()
+
+    def _warm_up(self):
+        # Primer uso: entrada sin verificar; segundo: verificada; tercero: desde el LRU local
+        for _ in range(2):
+            self.assertEqual(self.client.get('/api/profile/').status_code, 200)
+        hits = cache_stats()['local_hits']
+        self.assertEqual(self.client.get('/api/profile/').status_code, 200)
+        self.assertEqual(cache_stats()['local_hits'], hits + 1)
+
+    def test_logout_revokes_cached_token(self):
+        # La generación se incrementa al confirmar la transacción (users/signals.py)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.post('/api/logout/').status_code, 200)
+        self.assertEqual(self.client.get('/api/profile/').status_code, 401)
+
+    def test_deactivation_revokes_cached_token(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertEqual(self.client.get('/api/profile/').status_code, 401)
+
+    def test_password_change_revokes_cached_user(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password('Other456!x')
+            self.user.save()
+        # El token sigue siendo válido, pero el usuario se vuelve a leer de la base de datos
+        hits = cache_stats()['local_hits']
+        self.assertEqual(self.client.get('/api/profile/').status_code, 200)
+        self.assertEqual(cache_stats()['local_hits'], hits)
+
+
+class UserDirectoryTests(TestCase):
+    """GET /api/admin/users/: búsqueda (users/search.py), filtros y cursor."""
+
+    def setUp(self):
+        self.staff_role = Role.objects.create(name='Administrador')
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='x')
+        self.angela = User.objects.create_user(
+            username='angie', email='angela@example.com', password='x', first_name='Ángela', last_name='Núñez'
+        )
+        self.bruno = User.objects.create_user(
+            username='bruno', email='bruno@example.com', password='x', first_name='Bruno', last_name='Díaz',
+            role=self.staff_role, is_active=False,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def usernames(self, **params):
+        response = self.client.get('/api/admin/users/', params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(item['username'] for item in response.data['results'])
+
+    def test_search_by_prefix_and_email(self):
+        self.assertEqual(self.usernames(search='BRU'), ['bruno'])
+        self.assertEqual(self.usernames(search='bruno díaz'), ['bruno'])
+        self.assertEqual(self.usernames(search='Angela@Example.com'), ['angie'])
+
+    def test_search_non_ascii_capitals(self):
+        self.assertEqual(self.usernames(search='Ángela'), ['angie'])
+        self.assertEqual(self.usernames(search='ÁNGELA núñez'), ['angie'])
+
+    def test_filters_and_paging(self):
+        self.assertEqual(self.usernames(role='Administrador'), ['bruno'])
+        self.assertEqual(self.usernames(is_active='true'), ['admin', 'angie'])
+        response = self.client.get('/api/admin/users/', {'page_size': 2})
+        next_page = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']) + len(next_page.data['results']), 3)
+        self.assertIsNone(next_page.data['next'])
+
+    def test_rejects_bad_filters_and_non_admins(self):
+        self.assertEqual(self.client.get('/api/admin/users/', {'role': 'Nadie'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/admin/users/', {'is_active': 'maybe'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/admin/users/', {'cursor': 'bogus'}).status_code, 404)
+        self.client.force_authenticate(self.angela)
+        self.assertEqual(self.client.get('/api/admin/users/').status_code, 403)
+
+
+class RoleLookupTests(TestCase):
+    """Role.lookups (backend/lookups.py) en la asignación de roles."""
+
+    def setUp(self):
+        cache.clear()
+        _tables.clear()
+        self.role = Role.objects.create(name='Veterinario')
+        self.user = User.objects.create_user(username='vet', email='vet@example.com', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser(username='admin', email='admin@example.com', password='x'))
+
+    def assign(self, role_name):
+        return self.client.post(f'/api/admin/users/{self.user.pk}/assign-role/', {'role_name': role_name}, format='json')
+
+    def role_queries(self, queries):
+        return [query['sql'] for query in queries.captured_queries if 'FROM "users_role"' in query['sql']]
+
+    def test_assign_role_reads_the_cache(self):
+        self.assertEqual(Role.lookups.by_id(str(self.role.pk)), self.role)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.assign('Veterinario')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.role_queries(queries), [])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.role, self.role)
+
+    def test_save_invalidates_and_unknown_role_is_rejected(self):
+        Role.lookups.by_name('Veterinario')
+        self.role.name = 'Peluquero'
+        self.role.save()
+        self.assertEqual(self.assign('Peluquero').status_code, 200)
+        response = self.assign('Veterinario')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['role_name'], ["El rol especificado no existe."])
+        with self.assertRaises(Role.DoesNotExist):
+            Role.lookups.by_id('no-es-un-uuid')
+
+    @override_settings(LOOKUP_CACHE_CHECK_INTERVAL=0)
+    def test_reloads_when_another_worker_bumps_the_version(self):
+        Role.lookups.by_name('Veterinario')
+        # update() no dispara señales: el cambio llega como el de otro worker
+        Role.objects.filter(pk=self.role.pk).update(name='Peluquero')
+        self.assertEqual(Role.lookups.by_name('Veterinario').pk, self.role.pk)
+        Role.lookups._bump_version()
+        self.assertEqual(Role.lookups.by_name('Peluquero').pk, self.role.pk)
+        with self.assertRaises(Role.DoesNotExist):
+            Role.lookups.by_name('Veterinario')
+
+
+class LoginThrottleTests(TestCase):
+    """Límite de intentos de POST /api/login/ por cuenta (users/throttling.py, login_account = 10/min)."""
+
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(username='alice', email='alice@example.com', password='Secret123!x')
+        # Reloj fijo al comienzo de una ventana de un minuto
+        self.now = 60.0 * 1000
+        self.enterContext(mock.patch.object(SlidingWindowRateThrottle, 'timer', lambda throttle: self.now))
+        self.client = APIClient()
+
+    def login(self, username_or_email, password='wrong'):
+        return self.client.post('/api/login/', {'username_or_email': username_or_email, 'password': password},
+                                format='json')
+
+    def test_eleventh_attempt_in_a_minute_is_throttled(self):
+        for _ in range(10):
+            self.assertEqual(self.login('alice').status_code, 400)
+        # Ni la contraseña correcta pasa, ni cambiando mayúsculas del identificador
+        response = self.login('ALICE', 'Secret123!x')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        # El límite es por cuenta: otra cuenta desde la misma IP sigue entrando
+        self.assertEqual(self.login('bob').status_code, 400)
+
+    def test_rejected_attempts_do_not_extend_the_block(self):
+        for _ in range(10):
+            self.login('alice')
+        for _ in range(5):
+            self.assertEqual(self.login('alice').status_code, 429)
+        self.now += 120
+        self.assertEqual(self.login('alice', 'Secret123!x').status_code, 200)
+
+
+class TokenExpiryTests(TestCase):
+    """Vencimiento de tokens (AUTH_TOKEN_TTL) y el comando purge_tokens."""
+
+    def setUp(self):
+        cache.clear()
+        authentication._entries.clear()
+        self.user = User.objects.create_user(username='alice', email='alice@example.com', password='Secret123!x')
+
+    def login(self):
+        response = APIClient().post(
+            '/api/login/', {'username_or_email': 'alice', 'password': 'Secret123!x'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data['token']
+
+    def profile(self, key):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Token ' + key)
+        return client.get('/api/profile/')
+
+    def age(self, *keys):
+        Token.objects.filter(key__in=keys).update(created=timezone.now() - settings.AUTH_TOKEN_TTL - timedelta(seconds=1))
+
+    def test_expired_token_is_rejected_and_login_issues_a_new_one(self):
+        key = self.login()
+        self.age(key)
+        self.assertEqual(self.profile(key).status_code, 401)
+        new_key = self.login()
+        self.assertNotEqual(new_key, key)
+        self.assertEqual(self.profile(new_key).status_code, 200)
+
+    def test_cached_token_expires_too(self):
+        key = self.login()
+        for _ in range(3):
+            self.assertEqual(self.profile(key).status_code, 200)
+        later = timezone.now() + settings.AUTH_TOKEN_TTL
+        with mock.patch('users.authentication.timezone.now', return_value=later):
+            self.assertEqual(self.profile(key).status_code, 401)
+
+    def test_purge_tokens_deletes_only_expired(self):
+        keys = [
+            Token.objects.create(user=User.objects.create_user(username=f'user{index}', email=f'user{index}@example.com')).key
+            for index in range(3)
+        ]
+        self.age(*keys[:2])
+        out = StringIO()
+        call_command('purge_tokens', '--dry-run', stdout=out)
+        self.assertIn('2 tokens vencidos', out.getvalue())
+        call_command('purge_tokens', '--batch-size=1', '--sleep=0', stdout=StringIO())
+        self.assertEqual(list(Token.objects.values_list('key', flat=True)), keys[2:])
+
+    def test_purge_tokens_without_expiry_is_an_error(self):
+        with self.settings(AUTH_TOKEN_TTL=None), self.assertRaises(CommandError):
+            call_command('purge_tokens', stdout=StringIO())
+
+
+class UserImportTests(TestCase):
+    """POST /api/admin/users/import/ (users/importers.py)."""
+
+    def setUp(self):
+        self.client_role = Role.objects.create(name='Cliente Regular')
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def upload(self, content, name='users.csv', **data):
+        return self.client.post('/api/admin/users/import/', {
+            'file': SimpleUploadedFile(name, content.encode('utf-8')), **data,
+        }, format='multipart')
+
+    def test_imports_hashed_rows_and_reports_errors_by_line(self):
+        password_hash = make_password('Secret123!x')
+        response = self.upload(
+            "username,email,role,password_hash,password\n"
+            f"carla,carla@example.com,,{password_hash},\n"
+            "dario,dario@example.com,,,Secret123!x\n"
+            "otro,admin@EXAMPLE.com,,,\n"
+            "elena,elena@example.com,Nadie,,\n"
+            "carla2,carla@example.com,,,\n"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['processed'], response.data['imported'], response.data['failed']), (5, 1, 4))
+        errors = {error['row']: set(error['errors']) for error in response.data['errors']}
+        self.assertEqual(errors, {3: {'password'}, 4: {'email'}, 5: {'role'}, 6: {'email'}})
+
+        carla = User.objects.get(username='carla')
+        self.assertEqual(carla.role, self.client_role)
+        self.assertTrue(carla.check_password('Secret123!x'))
+        self.assertTrue(Token.objects.filter(user=carla).exists())
+
+    def test_jsonl_rows(self):
+        response = self.upload('{"username": "fede", "email": "fede@example.com"}\n{not json}\n', name='users.jsonl')
+        self.assertEqual((response.data['imported'], response.data['failed']), (1, 1))
+        self.assertFalse(User.objects.get(username='fede').has_usable_password())
+
+    def test_rejects_missing_file_bad_format_and_non_admins(self):
+        self.assertEqual(self.client.post('/api/admin/users/import/', {}, format='multipart').status_code, 400)
+        self.assertEqual(self.upload('username,email\n', file_format='xml').status_code, 400)
+        self.client.force_authenticate(User.objects.create_user(username='ana', email='ana@example.com', password='x'))
+        self.assertEqual(self.upload('username,email\n').status_code, 403)
@@ -0,0 +1,106 @@
+# users/throttling.py
+"""
+Límite de intentos de login (POST /api/login/), por IP y por cuenta.
+
+Cada intento cuesta un check_password (PBKDF2, cientos de ms de CPU), así que
+un ataque de credential stuffing puede ocupar todos los workers. Los throttles
+de DRF corren en APIView.initial(), antes de validar el serializer: un intento
+rechazado responde 429 sin buscar al usuario ni calcular ningún hash.
+
+Se usa una ventana deslizante aproximada con dos contadores (la ventana actual
+y la anterior, ponderada por el tiempo que aún se solapa), así que cada intento
+cuesta dos GET (y un INCR si se acepta) en la caché compartida, en lugar de la
+lista de marcas de tiempo de SimpleRateThrottle. Solo cuentan los intentos
+aceptados: si contaran también los rechazados, un atacante que reintenta sin
+pausa mantendría bloqueada la cuenta de la víctima indefinidamente. Si la caché compartida falla (Redis caído),
+se cuenta en memoria del proceso: el límite pasa a ser por worker, pero sigue
+habiendo límite.
+"""
+import hashlib
+import logging
+import threading
+
+from rest_framework.throttling import SimpleRateThrottle
+
+logger = logging.getLogger(__name__)
+
+_local_counts = {} # clave -> (contador, expira_en), solo si la caché compartida falla
+_local_lock = threading.Lock()
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """SimpleRateThrottle (mismas tasas en DEFAULT_THROTTLE_RATES) con ventana deslizante por contadores."""
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.current = self._get(f'{self.key}:{window}')
+        self.previous = self._get(f'{self.key}:{window - 1}')
+        elapsed = (self.now % self.duration) / self.duration
+        if self.previous * (1 - elapsed) + self.current + 1 > self.num_requests:
+            return False # Sin incrementar: el rechazo no alarga el bloqueo
+        # Dos intentos simultáneos pueden pasar los dos con el último hueco; se tolera
+        self.current = self._increment(f'{self.key}:{window}')
+        return True
+
+    def wait(self):
+        offset = self.now % self.duration
+        remaining = self.duration - offset
+        # El próximo intento suma 1 a la ventana actual
+        room = self.num_requests - self.current - 1
+        if room < 0 or not self.previous:
+            return remaining
+        # Esperar a que el peso de la ventana anterior, previous * (1 - transcurrido), baje a `room`
+        needed = (1 - room / self.previous) * self.duration
+        return min(max(needed - offset, 0), remaining)
+
+    def _increment(self, key):
+        try:
+            self.cache.add(key, 0, self.duration * 2)
+            return self.cache.incr(key)
+        except Exception:
+            logger.warning("Caché compartida no disponible para %s; se cuenta en memoria.", self.scope, exc_info=True)
+            return _local_increment(key, self.now + self.duration * 2, self.now)
+
+    def _get(self, key):
+        try:
+            return self.cache.get(key, 0)
+        except Exception:
+            with _local_lock:
+                count, expires_at = _local_counts.get(key, (0, 0))
+            return count if expires_at > self.now else 0
+
+
+def _local_increment(key, expires_at, now):
+    with _local_lock:
+        if len(_local_counts) > 1000:
+            for stale in [k for k, (_, expiry) in _local_counts.items() if expiry <= now]:
+                del _local_counts[stale]
+        count = _local_counts.get(key, (0, expires_at))[0] + 1
+        _local_counts[key] = (count, expires_at)
+    return count
+
+
+class LoginIPThrottle(SlidingWindowRateThrottle):
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginAccountThrottle(SlidingWindowRateThrottle):
+    """Por cuenta atacada (username_or_email del cuerpo), venga de las IPs que venga."""
+    scope = 'login_account'
+
+    def get_cache_key(self, request, view):
+        identifier = request.data.get('username_or_email') if hasattr(request.data, 'get') else None
+        if not isinstance(identifier, str) or not identifier.strip():
+            return None # El serializer rechaza el intento sin calcular ningún hash
+        digest = hashlib.sha256(identifier.strip().lower().encode()).hexdigest()
+        return self.cache_format % {'scope': self.scope, 'ident': digest}
@@ -11,5 +11,7 @@ urlpatterns = [
 
     # Rutas de Administrador
     path('admin/users/', UserListView.as_view(), name='admin-user-list'), # Listar todos los usuarios
+    path('admin/users/import/', UserImportView.as_view(), name='admin-user-import'), # Alta masiva (CSV/JSONL)
     path('admin/users/<uuid:user_id>/assign-role/', AssignRoleView.as_view(), name='admin-assign-role'),
+    path('admin/auth-cache-stats/', AuthCacheStatsView.as_view(), name='admin-auth-cache-stats'),
 ]
\ No newline at end of file
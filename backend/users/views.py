@@ -1,12 +1,21 @@
 # users/views.py
+import os
 from rest_framework import generics, status
 from rest_framework.response import Response
 from rest_framework.authtoken.models import Token
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
+from backend.importers import guess_format, iter_rows
+from backend.pagination import KeysetPagination
 from .serializers import *
 from django.contrib.auth import get_user_model # Importar get_user_model
 from .models import Role
+from .authentication import cache_stats, issue_token
+from .importers import UserImporter
+from .search import search_users
+from .throttling import LoginAccountThrottle, LoginIPThrottle
 from django.shortcuts import get_object_or_404
 
 UserModel = get_user_model() # Obtener el modelo de usuario
@@ -19,21 +28,19 @@ class RegisterView(generics.CreateAPIView):
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.save() # Crea el usuario sin rol aún
 
-        # Asigna el rol "Cliente Regular" al usuario recién creado
+        # El rol "Cliente Regular" se asigna en el mismo INSERT que crea al usuario
         try:
-            cliente_regular_role = Role.objects.get(name='Cliente Regular')
-            user.role = cliente_regular_role
-            user.save() # Guarda el usuario con su nuevo rol
+            cliente_regular_role = Role.lookups.by_name('Cliente Regular')
         except Role.DoesNotExist:
             # Manejar el error si el rol "Cliente Regular" no existe
             return Response(
                 {"detail": "Error: El rol 'Cliente Regular' no está configurado en la base de datos."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+        user = serializer.save(role=cliente_regular_role)
 
-        token, created = Token.objects.get_or_create(user=user)
+        token = Token.objects.create(user=user) # Usuario recién creado: no tiene token previo
         return Response({
             "user": self.get_serializer(user).data, # Usa self.get_serializer para incluir todos los campos del serializer
             "token": token.key
@@ -41,13 +48,15 @@ class RegisterView(generics.CreateAPIView):
 
 class LoginView(APIView):
     permission_classes = (AllowAny,)
+    # Se evalúan antes del serializer: un intento rechazado (429) no calcula ningún hash
+    throttle_classes = (LoginIPThrottle, LoginAccountThrottle)
     serializer_class = LoginSerializer # Útil para la documentación
 
     def post(self, request, *args, **kwargs):
         serializer = LoginSerializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
         user = serializer.user # Accedemos al usuario validado desde el serializer
-        token, created = Token.objects.get_or_create(user=user)
+        token = issue_token(user) # Si el token anterior venció, se emite uno nuevo
         return Response({
             'token': token.key,
             'user_id': user.pk,
@@ -105,11 +114,72 @@ class ChangePasswordView(APIView):
 
         return Response({"detail": "Contraseña actualizada exitosamente."}, status=status.HTTP_200_OK)
 
+class UserListPagination(KeysetPagination):
+    page_size = 50
+    ordering = ('-date_joined', '-id') # Los registrados más recientes primero
+
 class UserListView(generics.ListAPIView):
-    queryset = UserModel.objects.all().select_related('role') # Cargar el rol para evitar N+1 queries
+    """
+    Directorio de usuarios para administradores, paginado por cursor.
+    Filtros: ?search= (username, email, nombre; ver users/search.py),
+    ?role=<nombre del rol> y ?is_active=true|false.
+    """
     serializer_class = UserListSerializer
+    pagination_class = UserListPagination
     permission_classes = (IsAdminUser,) # Solo administradores pueden ver esta lista
 
+    def get_queryset(self):
+        queryset = UserModel.objects.all() # El nombre del rol sale de Role.lookups, sin JOIN ni N+1
+        params = self.request.query_params
+
+        role_name = params.get('role')
+        if role_name:
+            try:
+                queryset = queryset.filter(role_id=Role.lookups.by_name(role_name).pk)
+            except Role.DoesNotExist:
+                raise ValidationError({"role": "El rol especificado no existe."})
+
+        is_active = params.get('is_active')
+        if is_active:
+            if is_active.lower() not in ('true', 'false'):
+                raise ValidationError({"is_active": "Use 'true' o 'false'."})
+            queryset = queryset.filter(is_active=is_active.lower() == 'true')
+
+        return search_users(queryset, params.get('search', ''))
+
+class UserImportView(APIView):
+    """
+    Alta masiva de usuarios (solo administradores). Recibe un archivo 'file' CSV o JSONL con
+    columnas username, email, first_name, last_name, phone_number, role (nombre) y
+    password_hash. Las filas con 'password' en claro se rechazan: hashearlas bloquearía el
+    worker (~0.5 s por fila); para eso está manage.py import_users. Devuelve un reporte
+    con los errores por fila.
+    """
+    permission_classes = (IsAdminUser,)
+    parser_classes = (MultiPartParser,)
+
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"detail": "Debe enviar el archivo en el campo 'file'."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        file_format = request.data.get('file_format') or guess_format(upload.name)
+        try:
+            rows = iter_rows(upload.file, file_format)
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        report = UserImporter().run(rows)
+        return Response(report, status=status.HTTP_200_OK)
+
+class AuthCacheStatsView(APIView):
+    """Aciertos y fallos de la caché de tokens en el proceso que atiende la petición."""
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request, *args, **kwargs):
+        return Response({'pid': os.getpid(), **cache_stats()})
+
 class AssignRoleView(APIView):
     permission_classes = (IsAdminUser,) # Solo administradores pueden asignar roles
     serializer_class = RoleAssignmentSerializer # Para documentación
@@ -124,7 +194,7 @@ class AssignRoleView(APIView):
         role_name = serializer.validated_data['role_name']
 
         try:
-            role = Role.objects.get(name=role_name)
+            role = Role.lookups.by_name(role_name)
             user_to_assign.role = role
             user_to_assign.save()
             return Response({"detail": f"Rol '{role.name}' asignado exitosamente al usuario '{user_to_assign.username}'."},
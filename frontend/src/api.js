@@ -51,7 +51,8 @@ export const authAPI = {
 
 // Users API (Admin)
 export const usersAPI = {
-    getUsers: () => api.get('/admin/users/'),
+    getUsers: (params = {}) => api.get('/admin/users/', { params }), // Paginado por cursor: { next, results }; filtros search, role, is_active
+    getUsersPage: (nextUrl) => api.get(nextUrl),
     assignRole: (userId, roleData) => api.post(`/admin/users/${userId}/assign-role/`, roleData),
 };
 
@@ -76,24 +77,29 @@ export const petsAPI = {
 // Reservations API
 export const reservationsAPI = {
     // Endpoints para Reservation
-    getAllReservations: () => api.get('/reservations/'), // Para administradores
-    getUserReservations: () => api.get('/reservations/'), // Para usuarios (filtrado por el backend)
-    getReservation: (id) => api.get(`/reservations/${id}/`),
+    // 'pet' y 'status' llegan como id salvo que se pida { expand: 'pet,status' }
+    getAllReservations: (params = {}) => api.get('/reservations/', { params }), // Para administradores
+    getUserReservations: (params = {}) => api.get('/reservations/', { params }), // Para usuarios (filtrado por el backend)
+    getReservation: (id, params = {}) => api.get(`/reservations/${id}/`, { params }),
+    getReservationsPage: (nextUrl) => api.get(nextUrl), // Enlace 'next' del listado paginado por cursor: { next, results }
     createReservation: (data) => api.post('/reservations/', data),
     updateReservation: (id, data) => api.put(`/reservations/${id}/`, data), // Puede ser PUT o PATCH
     deleteReservation: (id) => api.delete(`/reservations/${id}/`),
+    bulkUpdateReservationStatus: (ids, status) => api.post('/reservations/bulk-status/', { ids, status }), // status por nombre, p. ej. 'Confirmed'
 
     // Endpoints para ReservationStatus
     getReservationStatuses: () => api.get('/reservation-statuses/'),
 
     // Endpoints para Analíticas
-    getReservationsAnalytics: () => api.get('/reservations/analytics/'), // Ajusta este endpoint a tu URL real
+    getReservationsAnalytics: (params = {}) => api.get('/reservations/analytics/', { params }), // by=pet|user|status|month, from, to
+    getReservationsAnalyticsPage: (nextUrl) => api.get(nextUrl), // Enlace 'next' de las analíticas paginadas por cursor
 };
 
 // Products API
 export const productsAPI = { // Renombrado de storeAPI a productsAPI
     getCategories: () => api.get('/categories/'), // Usando tu endpoint exacto
-    getProducts: () => api.get('/products/'),
+    getProducts: (params = {}) => api.get('/products/', { params }), // Paginado por cursor: { next, results }
+    getProductsPage: (nextUrl) => api.get(nextUrl), // Enlace 'next' del listado paginado por cursor
     getProduct: (id) => api.get(`/products/${id}/`),
     createProduct: (data) => api.post('/products/', data, {
         headers: { 'Content-Type': 'multipart/form-data' } // Importante para la imagen
@@ -12,6 +12,10 @@ const AdminUsersPage = () => {
     const [error, setError] = useState('');
     const [successMessage, setSuccessMessage] = useState('');
     const [pendingChanges, setPendingChanges] = useState({}); // Para almacenar cambios de rol temporales
+    const [nextPage, setNextPage] = useState(null); // Enlace 'next' de la paginación por cursor
+    const [searchInput, setSearchInput] = useState('');
+    // Filtros aplicados en el servidor: la lista completa ya no se descarga
+    const [filters, setFilters] = useState({ search: '', role: '', is_active: '' });
 
     const { user: currentUser, loading: authLoading, isAuthenticated } = useAuth();
     const navigate = useNavigate();
@@ -20,7 +24,7 @@ const AdminUsersPage = () => {
     // Podrías cargarlos dinámicamente desde una API si tienes un endpoint para roles.
     const ROLES = [
         { id: 'Administrador', name: 'Administrador' },
-        { id: 'Cliente', name: 'Cliente' },
+        { id: 'Cliente Regular', name: 'Cliente Regular' },
         // Agrega cualquier otro rol que manejes
     ];
 
@@ -39,8 +43,11 @@ const AdminUsersPage = () => {
             setLoading(true);
             setError('');
             try {
-                const response = await usersAPI.getUsers();
-                setUsers(response.data);
+                // Solo se envían los filtros con valor
+                const params = Object.fromEntries(Object.entries(filters).filter(([, value]) => value));
+                const response = await usersAPI.getUsers(params);
+                setUsers(response.data.results);
+                setNextPage(response.data.next);
             } catch (err) {
                 console.error('Error al cargar usuarios:', err.response?.data || err.message);
                 setError('No se pudieron cargar los usuarios.');
@@ -50,7 +57,28 @@ const AdminUsersPage = () => {
         };
 
         fetchUsers();
-    }, [isAuthenticated, currentUser, authLoading, navigate]);
+    }, [isAuthenticated, currentUser, authLoading, navigate, filters]);
+
+    const handleSearch = (e) => {
+        e.preventDefault();
+        setFilters(prev => ({ ...prev, search: searchInput.trim() }));
+    };
+
+    const handleFilterChange = (e) => {
+        const { name, value } = e.target;
+        setFilters(prev => ({ ...prev, [name]: value }));
+    };
+
+    const loadMore = async () => {
+        try {
+            const response = await usersAPI.getUsersPage(nextPage);
+            setUsers(prevUsers => [...prevUsers, ...response.data.results]);
+            setNextPage(response.data.next);
+        } catch (err) {
+            console.error('Error al cargar más usuarios:', err.response?.data || err.message);
+            setError('No se pudieron cargar más usuarios.');
+        }
+    };
 
     // Manejar cambio en el selector de rol
     const handleRoleChange = (userId, newRoleId) => {
@@ -120,6 +148,27 @@ const AdminUsersPage = () => {
             {successMessage && <p className="success-message">{successMessage}</p>}
             {error && <p className="error-message">{error}</p>}
 
+            <form onSubmit={handleSearch} className="table-filters">
+                <input
+                    type="search"
+                    value={searchInput}
+                    onChange={(e) => setSearchInput(e.target.value)}
+                    placeholder="Buscar por usuario, email o nombre"
+                />
+                <select name="role" value={filters.role} onChange={handleFilterChange}>
+                    <option value="">Todos los roles</option>
+                    {ROLES.map(role => (
+                        <option key={role.id} value={role.id}>{role.name}</option>
+                    ))}
+                </select>
+                <select name="is_active" value={filters.is_active} onChange={handleFilterChange}>
+                    <option value="">Activos e inactivos</option>
+                    <option value="true">Solo activos</option>
+                    <option value="false">Solo inactivos</option>
+                </select>
+                <button type="submit" className="btn btn-primary btn-sm">Buscar</button>
+            </form>
+
             <div className="table-responsive">
                 <table className="data-table">
                     <thead>
@@ -135,7 +184,7 @@ const AdminUsersPage = () => {
                     <tbody>
                         {users.length === 0 ? (
                             <tr>
-                                <td colSpan="6">No hay usuarios registrados.</td>
+                                <td colSpan="6">No hay usuarios que coincidan con la búsqueda.</td>
                             </tr>
                         ) : (
                             users.map((user) => (
@@ -177,6 +226,11 @@ const AdminUsersPage = () => {
                     </tbody>
                 </table>
             </div>
+            {nextPage && (
+                <button onClick={loadMore} className="btn btn-secondary btn-sm">
+                    Cargar más
+                </button>
+            )}
         </div>
     );
 };
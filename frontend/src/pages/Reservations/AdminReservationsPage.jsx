@@ -4,6 +4,18 @@ import { Link, useNavigate } from 'react-router-dom';
 import { useAuth } from '../../contexts/AuthContext'; // Ruta corregida
 import { reservationsAPI } from '../../api'; // Importa la nueva API de reservas
 
+// Fechas locales en formato YYYY-MM-DD (toISOString usaría UTC y podría cambiar el día)
+const formatDate = (date) => {
+    const month = String(date.getMonth() + 1).padStart(2, '0');
+    const day = String(date.getDate()).padStart(2, '0');
+    return `${date.getFullYear()}-${month}-${day}`;
+};
+
+const addDays = (date, days) => new Date(date.getFullYear(), date.getMonth(), date.getDate() + days);
+
+// Lunes de la semana de `date`
+const startOfWeek = (date) => addDays(date, -((date.getDay() + 6) % 7));
+
 const AdminReservationsPage = () => {
     const { isAuthenticated, user, loading: authLoading } = useAuth();
     const navigate = useNavigate();
@@ -11,6 +23,8 @@ const AdminReservationsPage = () => {
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState('');
     const [message, setMessage] = useState(''); // Para mensajes de éxito/error en operaciones
+    const [weekStart, setWeekStart] = useState(() => startOfWeek(new Date()));
+    const [nextPage, setNextPage] = useState(null); // Enlace 'next' de la paginación por cursor
 
     const isAdmin = isAuthenticated && user && user.role === 'Administrador';
 
@@ -19,8 +33,14 @@ const AdminReservationsPage = () => {
         setError('');
         setMessage('');
         try {
-            const response = await reservationsAPI.getAllReservations();
-            setReservations(response.data);
+            // Solo las reservas con algún día en la semana seleccionada (también las que empezaron antes)
+            const response = await reservationsAPI.getAllReservations({
+                expand: 'pet,status',
+                stays_from: formatDate(weekStart),
+                stays_before: formatDate(addDays(weekStart, 7)),
+            });
+            setReservations(response.data.results);
+            setNextPage(response.data.next);
         } catch (err) {
             console.error('Error al cargar reservas para administración:', err.response?.data || err.message);
             const errMsg = err.response?.data?.detail || err.response?.data?.message || 'No se pudieron cargar las reservas.';
@@ -30,6 +50,17 @@ const AdminReservationsPage = () => {
         }
     };
 
+    const loadMore = async () => {
+        try {
+            const response = await reservationsAPI.getReservationsPage(nextPage);
+            setReservations(prevReservations => [...prevReservations, ...response.data.results]);
+            setNextPage(response.data.next);
+        } catch (err) {
+            console.error('Error al cargar más reservas:', err.response?.data || err.message);
+            setError('No se pudieron cargar más reservas.');
+        }
+    };
+
     useEffect(() => {
         if (authLoading) return;
 
@@ -40,28 +71,22 @@ const AdminReservationsPage = () => {
         }
 
         fetchReservations();
-    }, [isAdmin, authLoading, navigate, user]);
+    }, [isAdmin, authLoading, navigate, user, weekStart]);
 
-    const handleUpdateStatus = async (reservationId, newStatusId, currentPetName) => {
+    const handleUpdateStatus = async (reservationId, newStatusName, currentPetName) => {
         if (!isAdmin) {
             alert('No tienes permisos para actualizar el estado de las reservas.');
             return;
         }
 
         try {
-            // Obtener la reserva actual para no perder los campos que no se envían
-            const currentReservationResponse = await reservationsAPI.getReservation(reservationId);
-            const currentReservation = currentReservationResponse.data;
-
-            const dataToUpdate = {
-                pet_id: currentReservation.pet.id, // Requerido por el serializer en PUT
-                start_date: currentReservation.start_date, // Requerido
-                end_date: currentReservation.end_date,     // Requerido
-                observations: currentReservation.observations, // Requerido
-                status_id: newStatusId,
-            };
-
-            await reservationsAPI.updateReservation(reservationId, dataToUpdate);
+            // El endpoint masivo recibe el estado por nombre y valida la transición
+            const response = await reservationsAPI.bulkUpdateReservationStatus([reservationId], newStatusName);
+            const [result] = response.data.results;
+            if (result.result === 'invalid_transition' || result.result === 'overlap') {
+                setError(result.detail);
+                return;
+            }
             setMessage(`Estado de la reserva para ${currentPetName} actualizado con éxito.`);
             fetchReservations(); // Recargar lista
         } catch (err) {
@@ -97,10 +122,6 @@ const AdminReservationsPage = () => {
         return <div style={styles.errorContainer}>{error}</div>;
     }
 
-    if (!reservations.length && !loading) {
-        return <div style={styles.noDataMessage}>No hay reservas para administrar.</div>;
-    }
-
     return (
         <div style={styles.adminContainer}>
             <div style={styles.header}>
@@ -113,6 +134,20 @@ const AdminReservationsPage = () => {
                 </Link>
             </div>
             {message && <p style={styles.successMessage}>{message}</p>}
+            <div style={styles.weekNav}>
+                <button onClick={() => setWeekStart(addDays(weekStart, -7))} className="btn btn-secondary" style={styles.actionBtn}>
+                    ← Semana anterior
+                </button>
+                <span style={styles.weekLabel}>
+                    Semana del {formatDate(weekStart)} al {formatDate(addDays(weekStart, 6))}
+                </span>
+                <button onClick={() => setWeekStart(addDays(weekStart, 7))} className="btn btn-secondary" style={styles.actionBtn}>
+                    Semana siguiente →
+                </button>
+            </div>
+            {!reservations.length && (
+                <div style={styles.noDataMessage}>No hay reservas que empiecen esta semana.</div>
+            )}
             <div style={styles.tableContainer}>
                 <table style={styles.table}>
                     <thead>
@@ -142,7 +177,7 @@ const AdminReservationsPage = () => {
                                     {/* Botones de acción rápida para administradores */}
                                     {reservation.status && reservation.status.name === 'Pending' && (
                                         <button
-                                            onClick={() => handleUpdateStatus(reservation.id, /* ID de estado Aceptado */ 'YOUR_ACCEPTED_STATUS_UUID', reservation.pet.name)}
+                                            onClick={() => handleUpdateStatus(reservation.id, 'Confirmed', reservation.pet.name)}
                                             className="btn btn-approve"
                                             style={styles.actionBtn}
                                         >
@@ -151,7 +186,7 @@ const AdminReservationsPage = () => {
                                     )}
                                     {reservation.status && reservation.status.name !== 'Cancelled' && (
                                         <button
-                                            onClick={() => handleUpdateStatus(reservation.id, /* ID de estado Cancelado */ 'YOUR_CANCELLED_STATUS_UUID', reservation.pet.name)}
+                                            onClick={() => handleUpdateStatus(reservation.id, 'Cancelled', reservation.pet.name)}
                                             className="btn btn-reject"
                                             style={styles.actionBtn}
                                         >
@@ -171,6 +206,11 @@ const AdminReservationsPage = () => {
                     </tbody>
                 </table>
             </div>
+            {nextPage && (
+                <button onClick={loadMore} className="btn btn-secondary" style={styles.loadMoreButton}>
+                    Cargar más
+                </button>
+            )}
         </div>
     );
 };
@@ -308,6 +348,22 @@ const styles = {
         fontSize: '1.1em',
         marginTop: '50px',
     },
+    weekNav: {
+        display: 'flex',
+        justifyContent: 'center',
+        alignItems: 'center',
+        gap: '15px',
+        marginBottom: '20px',
+    },
+    weekLabel: {
+        fontWeight: 'bold',
+        color: 'var(--text-dark)',
+    },
+    loadMoreButton: {
+        display: 'block',
+        margin: '20px auto 0',
+        padding: '10px 20px',
+    },
 };
 
 export default AdminReservationsPage;
\ No newline at end of file
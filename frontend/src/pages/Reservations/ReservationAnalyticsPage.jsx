@@ -13,6 +13,7 @@ const ReservationAnalyticsPage = () => {
     const { isAuthenticated, user, loading: authLoading } = useAuth();
     const navigate = useNavigate();
     const [analyticsData, setAnalyticsData] = useState(null);
+    const [nextPage, setNextPage] = useState(null); // Enlace 'next' de la paginación por cursor
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState('');
 
@@ -31,8 +32,9 @@ const ReservationAnalyticsPage = () => {
             setLoading(true);
             setError('');
             try {
-                const response = await reservationsAPI.getReservationsAnalytics();
-                setAnalyticsData(response.data);
+                const response = await reservationsAPI.getReservationsAnalytics({ by: 'pet' });
+                setAnalyticsData(response.data.results); // Respuesta paginada: { next, results }
+                setNextPage(response.data.next);
             } catch (err) {
                 console.error('Error al cargar analíticas de reservas:', err.response?.data || err.message);
                 const errMsg = err.response?.data?.detail || err.response?.data?.message || 'No se pudieron cargar las analíticas de reservas.';
@@ -45,6 +47,17 @@ const ReservationAnalyticsPage = () => {
         fetchAnalytics();
     }, [isAdmin, authLoading, navigate, user]);
 
+    const loadMore = async () => {
+        try {
+            const response = await reservationsAPI.getReservationsAnalyticsPage(nextPage); // El enlace conserva 'by'
+            setAnalyticsData(prevData => [...prevData, ...response.data.results]);
+            setNextPage(response.data.next);
+        } catch (err) {
+            console.error('Error al cargar más analíticas:', err.response?.data || err.message);
+            setError('No se pudieron cargar más analíticas de reservas.');
+        }
+    };
+
     if (authLoading || loading) {
         return <div style={styles.loadingContainer}>Cargando analíticas de reservas...</div>;
     }
@@ -128,6 +141,11 @@ const ReservationAnalyticsPage = () => {
                     <Pie data={pieChartData} options={options} />
                 </div>
             </div>
+            {nextPage && (
+                <button onClick={loadMore} className="btn btn-secondary" style={styles.loadMoreButton}>
+                    Cargar más
+                </button>
+            )}
         </div>
     );
 };
@@ -207,6 +225,11 @@ const styles = {
         fontSize: '1.1em',
         marginTop: '50px',
     },
+    loadMoreButton: {
+        display: 'block',
+        margin: '20px auto 0',
+        padding: '10px 20px',
+    },
 };
 
 export default ReservationAnalyticsPage;
\ No newline at end of file
@@ -51,7 +51,7 @@ const ReservationForm = () => {
                 }
 
                 if (isEditing) {
-                    const reservationResponse = await reservationsAPI.getReservation(reservationId);
+                    const reservationResponse = await reservationsAPI.getReservation(reservationId, { expand: 'pet,status' });
                     const reservationData = reservationResponse.data;
 
                     if (!isAdmin && reservationData.pet.owner.id !== user.id) {
@@ -11,6 +11,7 @@ const UserReservationsPage = () => {
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState('');
     const [message, setMessage] = useState(''); // Para mensajes de éxito/error en operaciones
+    const [nextPage, setNextPage] = useState(null); // Enlace 'next' de la paginación por cursor
 
     useEffect(() => {
         if (authLoading) return;
@@ -26,8 +27,9 @@ const UserReservationsPage = () => {
             setError('');
             setMessage('');
             try {
-                const response = await reservationsAPI.getUserReservations(); // Obtiene solo las reservas del usuario
-                setReservations(response.data);
+                const response = await reservationsAPI.getUserReservations({ expand: 'pet,status' }); // Obtiene solo las reservas del usuario
+                setReservations(response.data.results);
+                setNextPage(response.data.next);
             } catch (err) {
                 console.error('Error al cargar mis reservas:', err.response?.data || err.message);
                 const errMsg = err.response?.data?.detail || err.response?.data?.message || 'No se pudieron cargar tus reservas.';
@@ -40,6 +42,17 @@ const UserReservationsPage = () => {
         fetchUserReservations();
     }, [isAuthenticated, authLoading, navigate, user]);
 
+    const loadMore = async () => {
+        try {
+            const response = await reservationsAPI.getReservationsPage(nextPage);
+            setReservations(prevReservations => [...prevReservations, ...response.data.results]);
+            setNextPage(response.data.next);
+        } catch (err) {
+            console.error('Error al cargar más reservas:', err.response?.data || err.message);
+            setError('No se pudieron cargar más reservas.');
+        }
+    };
+
     const handleDelete = async (reservationId, petName) => {
         if (!isAuthenticated) {
             alert('Debes iniciar sesión para eliminar reservas.');
@@ -104,6 +117,11 @@ const UserReservationsPage = () => {
                     </div>
                 ))}
             </div>
+            {nextPage && (
+                <button onClick={loadMore} className="btn btn-secondary" style={styles.loadMoreButton}>
+                    Cargar más
+                </button>
+            )}
         </div>
     );
 };
@@ -224,6 +242,11 @@ const styles = {
         fontSize: '1.1em',
         marginTop: '50px',
     },
+    loadMoreButton: {
+        display: 'block',
+        margin: '20px auto 0',
+        padding: '10px 20px',
+    },
 };
 
 export default UserReservationsPage;
\ No newline at end of file
@@ -11,6 +11,7 @@ const AdminProductsPage = () => {
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState('');
     const [deleteMessage, setDeleteMessage] = useState('');
+    const [nextPage, setNextPage] = useState(null); // Enlace 'next' de la paginación por cursor
 
     const fetchProducts = async () => {
         setLoading(true);
@@ -18,7 +19,8 @@ const AdminProductsPage = () => {
         setDeleteMessage('');
         try {
             const response = await productsAPI.getProducts(); // Usa productsAPI.getProducts()
-            setProducts(response.data);
+            setProducts(response.data.results);
+            setNextPage(response.data.next);
         } catch (err) {
             console.error('Error al cargar productos para administración:', err.response?.data || err.message);
             setError('No se pudieron cargar los productos para administración.');
@@ -40,12 +42,24 @@ const AdminProductsPage = () => {
         fetchProducts();
     }, [isAuthenticated, authLoading, navigate]);
 
+    const loadMore = async () => {
+        try {
+            const response = await productsAPI.getProductsPage(nextPage);
+            setProducts(prevProducts => [...prevProducts, ...response.data.results]);
+            setNextPage(response.data.next);
+        } catch (err) {
+            console.error('Error al cargar más productos:', err.response?.data || err.message);
+            setError('No se pudieron cargar más productos.');
+        }
+    };
+
     const handleDelete = async (productId, productName) => {
         if (window.confirm(`¿Estás seguro de que quieres eliminar "${productName}"?`)) {
             try {
                 await productsAPI.deleteProduct(productId); // Usa productsAPI.deleteProduct()
                 setDeleteMessage(`Producto "${productName}" eliminado con éxito.`);
-                fetchProducts(); // Vuelve a cargar la lista de productos después de eliminar
+                // Se quita de la lista sin recargarla, para no perder las páginas ya cargadas
+                setProducts(prevProducts => prevProducts.filter(product => product.id !== productId));
             } catch (err) {
                 console.error('Error al eliminar producto:', err.response?.data || err.message);
                 setError('No se pudo eliminar el producto.');
@@ -105,6 +119,11 @@ const AdminProductsPage = () => {
                     </table>
                 </div>
             )}
+            {nextPage && (
+                <button onClick={loadMore} className="btn btn-secondary" style={styles.loadMoreButton}>
+                    Cargar más
+                </button>
+            )}
         </div>
     );
 };
@@ -229,6 +248,11 @@ const styles = {
         border: '1px solid #c3e6cb',
         textAlign: 'center',
     },
+    loadMoreButton: {
+        display: 'block',
+        margin: '20px auto 0',
+        padding: '10px 20px',
+    },
 };
 
 export default AdminProductsPage;
\ No newline at end of file
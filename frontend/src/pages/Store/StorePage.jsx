@@ -11,6 +11,7 @@ const StorePage = () => {
     const [products, setProducts] = useState([]);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState('');
+    const [nextPage, setNextPage] = useState(null); // Enlace 'next' de la paginación por cursor
 
     // Variable para verificar si el usuario es administrador
     // === CAMBIO CLAVE: Lógica para isAdmin ===
@@ -25,8 +26,9 @@ const StorePage = () => {
             setLoading(true);
             setError('');
             try {
-                const response = await productsAPI.getProducts(); // Usa productsAPI.getProducts()
-                setProducts(response.data);
+                const response = await productsAPI.getProducts({ image_size: 320 }); // Miniatura de 320px para las tarjetas
+                setProducts(response.data.results);
+                setNextPage(response.data.next);
             } catch (err) {
                 console.error('Error al cargar productos:', err.response?.data || err.message);
                 setError('No se pudieron cargar los productos. Inténtalo de nuevo más tarde.');
@@ -38,6 +40,17 @@ const StorePage = () => {
         fetchProducts();
     }, [authLoading, navigate]); // Dependencias: authLoading, navigate
 
+    const loadMore = async () => {
+        try {
+            const response = await productsAPI.getProductsPage(nextPage); // El enlace conserva image_size
+            setProducts(prevProducts => [...prevProducts, ...response.data.results]);
+            setNextPage(response.data.next);
+        } catch (err) {
+            console.error('Error al cargar más productos:', err.response?.data || err.message);
+            setError('No se pudieron cargar más productos.');
+        }
+    };
+
     if (loading) {
         return <div style={styles.loadingContainer}>Cargando productos...</div>;
     }
@@ -78,6 +91,11 @@ const StorePage = () => {
                     ))}
                 </div>
             )}
+            {nextPage && (
+                <button onClick={loadMore} className="btn btn-secondary" style={styles.loadMoreButton}>
+                    Cargar más
+                </button>
+            )}
         </div>
     );
 };
@@ -189,6 +207,11 @@ const styles = {
         color: 'red',
         textAlign: 'center',
     },
+    loadMoreButton: {
+        display: 'block',
+        margin: '20px auto 0',
+        padding: '10px 20px',
+    },
 };
 
 export default StorePage;
\ No newline at end of file